@@ -0,0 +1,46 @@
+"""Add denormalized member/event counters to BookClub
+
+Revision ID: 3b7e21c9d0a4
+Revises: 4cd595c838d3
+Create Date: 2026-10-18 10:12:41.503218
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b7e21c9d0a4'
+down_revision: Union[str, Sequence[str], None] = '4cd595c838d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('bookclub', sa.Column('member_count', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('bookclub', sa.Column('published_event_count', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('bookclub', sa.Column('completed_event_count', sa.Integer(), nullable=False, server_default='0'))
+
+    # 回填既有資料
+    op.execute("""
+        UPDATE bookclub SET
+            member_count = (
+                SELECT COUNT(*) FROM bookclubmember WHERE bookclubmember.book_club_id = bookclub.id
+            ),
+            published_event_count = (
+                SELECT COUNT(*) FROM event WHERE event.club_id = bookclub.id AND event.status = 'PUBLISHED'
+            ),
+            completed_event_count = (
+                SELECT COUNT(*) FROM event WHERE event.club_id = bookclub.id AND event.status = 'COMPLETED'
+            )
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('bookclub', 'completed_event_count')
+    op.drop_column('bookclub', 'published_event_count')
+    op.drop_column('bookclub', 'member_count')
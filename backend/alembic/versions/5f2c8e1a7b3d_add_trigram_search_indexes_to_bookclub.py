@@ -0,0 +1,38 @@
+"""Add pg_trgm search indexes to BookClub name/description
+
+Revision ID: 5f2c8e1a7b3d
+Revises: 3b7e21c9d0a4
+Create Date: 2026-10-18 14:05:27.118630
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5f2c8e1a7b3d'
+down_revision: Union[str, Sequence[str], None] = '3b7e21c9d0a4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # trigram 不依賴斷詞，中文關鍵字的 ILIKE '%kw%' 也能使用 GIN 索引
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        'ix_bookclub_name_trgm', 'bookclub', ['name'],
+        postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}
+    )
+    op.create_index(
+        'ix_bookclub_description_trgm', 'bookclub', ['description'],
+        postgresql_using='gin', postgresql_ops={'description': 'gin_trgm_ops'}
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_bookclub_description_trgm', table_name='bookclub')
+    op.drop_index('ix_bookclub_name_trgm', table_name='bookclub')
@@ -0,0 +1,38 @@
+"""Add extracted club_id column to notification
+
+Revision ID: 8e4d1f6b2c90
+Revises: 5f2c8e1a7b3d
+Create Date: 2026-10-18 16:31:08.442915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e4d1f6b2c90'
+down_revision: Union[str, Sequence[str], None] = '5f2c8e1a7b3d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('notification', sa.Column('club_id', sa.Integer(), nullable=True))
+
+    # 由 content JSON 回填既有通知的 club_id
+    op.execute("""
+        UPDATE notification
+        SET club_id = (content->>'club_id')::integer
+        WHERE content->>'club_id' IS NOT NULL
+    """)
+
+    op.create_index(op.f('ix_notification_club_id'), 'notification', ['club_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_notification_club_id'), table_name='notification')
+    op.drop_column('notification', 'club_id')
@@ -0,0 +1,36 @@
+"""Add unread_notification_count to user
+
+Revision ID: a7c3e9f25d14
+Revises: 8e4d1f6b2c90
+Create Date: 2026-10-18 17:12:54.306177
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c3e9f25d14'
+down_revision: Union[str, Sequence[str], None] = '8e4d1f6b2c90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('user', sa.Column('unread_notification_count', sa.Integer(), nullable=False, server_default='0'))
+
+    # 回填既有資料
+    op.execute("""
+        UPDATE "user" SET unread_notification_count = (
+            SELECT COUNT(*) FROM notification
+            WHERE notification.recipient_id = "user".id AND notification.is_read = false
+        )
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('user', 'unread_notification_count')
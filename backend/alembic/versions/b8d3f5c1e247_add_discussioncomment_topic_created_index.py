@@ -0,0 +1,33 @@
+"""Add (topic_id, created_at, id) index to discussioncomment
+
+Revision ID: b8d3f5c1e247
+Revises: e2b9d4a7f016
+Create Date: 2026-10-18 20:31:45.902316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8d3f5c1e247'
+down_revision: Union[str, Sequence[str], None] = 'e2b9d4a7f016'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_discussioncomment_topic_id_created_at_id',
+        'discussioncomment',
+        ['topic_id', 'created_at', 'id'],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_discussioncomment_topic_id_created_at_id', table_name='discussioncomment')
@@ -0,0 +1,54 @@
+"""Add (recipient_id, is_read, id) index to notification and notification_archive table
+
+Revision ID: c4f8a2d6e913
+Revises: a7c3e9f25d14
+Create Date: 2026-10-18 18:02:19.537102
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4f8a2d6e913'
+down_revision: Union[str, Sequence[str], None] = 'a7c3e9f25d14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_notification_recipient_id_is_read_id',
+        'notification',
+        ['recipient_id', 'is_read', 'id'],
+        unique=False
+    )
+
+    op.create_table(
+        'notification_archive',
+        sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('content', sa.JSON(), nullable=True),
+        sa.Column(
+            'type',
+            postgresql.ENUM('NEW_POST', 'NEW_MEMBER', 'EVENT_CREATED', name='notificationtype', create_type=False),
+            nullable=False
+        ),
+        sa.Column('is_read', sa.Boolean(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('club_id', sa.Integer(), nullable=True),
+        sa.Column('recipient_id', sa.Integer(), nullable=False),
+        sa.Column('archived_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_notification_archive_recipient_id'), 'notification_archive', ['recipient_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_notification_archive_recipient_id'), table_name='notification_archive')
+    op.drop_table('notification_archive')
+    op.drop_index('ix_notification_recipient_id_is_read_id', table_name='notification')
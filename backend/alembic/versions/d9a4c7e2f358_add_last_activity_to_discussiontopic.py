@@ -0,0 +1,54 @@
+"""Add last_activity_at and last_comment_id to discussiontopic
+
+Revision ID: d9a4c7e2f358
+Revises: b8d3f5c1e247
+Create Date: 2026-10-18 21:08:37.114025
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9a4c7e2f358'
+down_revision: Union[str, Sequence[str], None] = 'b8d3f5c1e247'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('discussiontopic', sa.Column('last_activity_at', sa.DateTime(), nullable=False, server_default=sa.func.now()))
+    op.add_column('discussiontopic', sa.Column('last_comment_id', sa.Integer(), nullable=True))
+
+    # 回填既有資料：最新回覆，沒有回覆時以主題建立時間為準
+    op.execute("""
+        UPDATE discussiontopic SET
+            last_comment_id = (
+                SELECT MAX(discussioncomment.id) FROM discussioncomment
+                WHERE discussioncomment.topic_id = discussiontopic.id
+            ),
+            last_activity_at = COALESCE(
+                (
+                    SELECT MAX(discussioncomment.created_at) FROM discussioncomment
+                    WHERE discussioncomment.topic_id = discussiontopic.id
+                ),
+                discussiontopic.created_at
+            )
+    """)
+
+    op.create_index(
+        'ix_discussiontopic_club_id_last_activity_at',
+        'discussiontopic',
+        ['club_id', sa.text('last_activity_at DESC'), sa.text('id DESC')],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_discussiontopic_club_id_last_activity_at', table_name='discussiontopic')
+    op.drop_column('discussiontopic', 'last_comment_id')
+    op.drop_column('discussiontopic', 'last_activity_at')
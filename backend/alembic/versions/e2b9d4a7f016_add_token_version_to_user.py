@@ -0,0 +1,28 @@
+"""Add token_version to user
+
+Revision ID: e2b9d4a7f016
+Revises: c4f8a2d6e913
+Create Date: 2026-10-18 19:02:11.418203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2b9d4a7f016'
+down_revision: Union[str, Sequence[str], None] = 'c4f8a2d6e913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('user', sa.Column('token_version', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('user', 'token_version')
@@ -0,0 +1,49 @@
+"""Add pg_trgm search indexes to DiscussionTopic and DiscussionComment
+
+Revision ID: f3c7a9e1b524
+Revises: d9a4c7e2f358
+Create Date: 2026-10-18 22:41:09.562107
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3c7a9e1b524'
+down_revision: Union[str, Sequence[str], None] = 'd9a4c7e2f358'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        'ix_discussiontopic_title_trgm', 'discussiontopic', ['title'],
+        postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'}
+    )
+    op.create_index(
+        'ix_discussiontopic_content_trgm', 'discussiontopic', ['content'],
+        postgresql_using='gin', postgresql_ops={'content': 'gin_trgm_ops'}
+    )
+    # 回覆表資料量大，以 CONCURRENTLY 建立索引，不阻擋建立期間的新回覆
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_discussioncomment_content_trgm', 'discussioncomment', ['content'],
+            postgresql_using='gin', postgresql_ops={'content': 'gin_trgm_ops'},
+            postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_discussioncomment_content_trgm', table_name='discussioncomment',
+            postgresql_concurrently=True
+        )
+    op.drop_index('ix_discussiontopic_content_trgm', table_name='discussiontopic')
+    op.drop_index('ix_discussiontopic_title_trgm', table_name='discussiontopic')
@@ -1,8 +1,9 @@
 # backend/app/api/endpoints/auth.py
 from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks, Request
 from sqlmodel import Session
+from starlette.concurrency import run_in_threadpool
 from datetime import timedelta
-from app.models.user import UserCreate, RegistrationResponse, UserLogin, Token, TokenWithUser, UserRead
+from app.models.user import UserCreate, RegistrationResponse, UserLogin, Token, TokenWithUser, UserRead, User, StreamTicket
 from app.schemas.email_verification import EmailVerificationRequest, EmailVerificationResponse
 from app.models.password_reset import (
     ForgotPasswordRequest, 
@@ -15,7 +16,11 @@ from app.services.user_service import UserService
 from app.services.email_service import EmailService, email_service
 from app.services.password_reset_service import PasswordResetService
 from app.db.session import get_session
-from app.core.security import create_access_token, ACCESS_TOKEN_EXPIRE_DAYS_REMEMBER
+from app.core.password_hasher import PasswordHasherBusy, password_hasher
+from app.core.security import (
+    create_user_access_token, create_stream_ticket, get_current_user,
+    ACCESS_TOKEN_EXPIRE_DAYS_REMEMBER, STREAM_TICKET_EXPIRE_SECONDS
+)
 from app.core.logging_config import log_auth_event, log_error, log_business_event
 
 router = APIRouter()
@@ -23,19 +28,27 @@ router = APIRouter()
 def get_user_service(session: Session = Depends(get_session)) -> UserService:
     return UserService(session)
 
+def _hasher_busy_error() -> HTTPException:
+    # 密碼雜湊佇列已滿：請用戶端稍後重試，而不是讓請求繼續堆積
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="系統忙碌中，請稍後再試",
+        headers={"Retry-After": "1"},
+    )
+
 @router.get("/", status_code=200)
 def auth_root():
     return {"message": "Auth root"}
 
 @router.post("/register", response_model=RegistrationResponse, status_code=status.HTTP_201_CREATED)
-def register(
+async def register(
     user_data: UserCreate,
     user_service: UserService = Depends(get_user_service),
     session: Session = Depends(get_session), # Keep for email service
     background_tasks: BackgroundTasks = BackgroundTasks()
 ):
     try:
-        existing_user = user_service.get_by_email(user_data.email)
+        existing_user = await run_in_threadpool(user_service.get_by_email, user_data.email)
         if existing_user:
             log_auth_event("Registration Failed - Email exists", email=user_data.email, success=False)
             raise HTTPException(
@@ -43,19 +56,23 @@ def register(
                 detail="A user with this email already exists."
             )
         
-        new_user = user_service.create(user_data)
+        password_hash = await password_hasher.hash(user_data.password)
+        new_user = await run_in_threadpool(user_service.create, user_data, password_hash)
         log_auth_event("User Registered", user_id=new_user.id, email=new_user.email)
         
-        token = EmailService.generate_verification_token(session, new_user)
+        token = await run_in_threadpool(EmailService.generate_verification_token, session, new_user)
         background_tasks.add_task(email_service.send_verification_email, new_user, token)
         
         return RegistrationResponse(message="註冊成功，請至信箱查收驗證信")
     except HTTPException:
         raise
+    except PasswordHasherBusy:
+        raise _hasher_busy_error()
     except Exception as e:
         log_error(e, context="User Registration", user_id=None)
         raise HTTPException(status_code=500, detail="註冊失敗")
 
+
 @router.get("/verify-email", response_model=EmailVerificationResponse, status_code=status.HTTP_200_OK)
 def verify_email(
     token: str,
@@ -94,12 +111,12 @@ def resend_verification_email(
 
 
 @router.post("/login", response_model=TokenWithUser, status_code=status.HTTP_200_OK)
-def login(
+async def login(
     login_data: UserLogin,
     user_service: UserService = Depends(get_user_service)
 ):
     try:
-        user = user_service.authenticate(login_data.email, login_data.password)
+        user = await user_service.authenticate_async(login_data.email, login_data.password)
         
         if not user:
             log_auth_event("Login Failed - Invalid credentials", email=login_data.email, success=False)
@@ -120,9 +137,7 @@ def login(
         else:
             access_token_expires = None
         
-        access_token = create_access_token(
-            data={"sub": user.email}, expires_delta=access_token_expires
-        )
+        access_token = create_user_access_token(user, expires_delta=access_token_expires)
         
         log_auth_event("Login Successful", user_id=user.id, email=user.email)
         
@@ -145,11 +160,23 @@ def login(
         )
     except HTTPException:
         raise
+    except PasswordHasherBusy:
+        raise _hasher_busy_error()
     except Exception as e:
         log_error(e, context="User Login", user_id=None)
         raise HTTPException(status_code=500, detail="登入失敗")
 
 
+@router.post("/stream-ticket", response_model=StreamTicket, status_code=status.HTTP_200_OK)
+def issue_stream_ticket(current_user: User = Depends(get_current_user)):
+    """
+    簽發短效串流票證
+
+    EventSource 與 WebSocket 無法帶 Authorization header，用戶端在建立
+    /notifications/stream 或討論區即時更新連線前先取得票證，再以 ?ticket= 帶入。
+    """
+    return StreamTicket(ticket=create_stream_ticket(current_user), expires_in=STREAM_TICKET_EXPIRE_SECONDS)
+
 @router.post("/forgot-password", response_model=ForgotPasswordResponse, status_code=status.HTTP_200_OK)
 async def forgot_password(
     request_data: ForgotPasswordRequest,
@@ -201,7 +228,7 @@ def verify_reset_token(
 
 
 @router.post("/reset-password", response_model=ResetPasswordResponse, status_code=status.HTTP_200_OK)
-def reset_password(
+async def reset_password(
     reset_data: ResetPasswordRequest,
     session: Session = Depends(get_session)
 ):
@@ -209,12 +236,14 @@ def reset_password(
     使用 token 重置密碼
     """
     try:
-        PasswordResetService.reset_password(
+        await PasswordResetService.reset_password_async(
             session, 
             reset_data.token, 
             reset_data.new_password
         )
         return ResetPasswordResponse(message="密碼重置成功，請使用新密碼登入。")
+    except PasswordHasherBusy:
+        raise _hasher_busy_error()
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -4,6 +4,7 @@ from fastapi import APIRouter, Depends, status, Query, HTTPException, UploadFile
 from sqlmodel import Session
 
 from app.db.session import get_session
+from app.db.async_session import ReadSession, get_read_session
 from app.core.security import get_current_user, get_optional_current_user
 from app.models.user import User
 from app.models.book_club import BookClubCreate
@@ -123,14 +124,17 @@ def get_available_tags(
 
 
 @router.get("", response_model=PaginatedBookClubList)
-def list_book_clubs(
+async def list_book_clubs(
     *,
-    session: Session = Depends(get_session),
+    db: ReadSession = Depends(get_read_session),
     page: int = Query(1, ge=1, description="頁碼（從 1 開始）"),
     page_size: int = Query(20, ge=1, le=100, description="每頁項目數"),
     keyword: Optional[str] = Query(None, description="搜尋關鍵字（搜尋名稱和簡介）"),
     tag_ids: Optional[str] = Query(None, description="標籤 ID 列表（逗號分隔，例如: 1,3,5）"),
     my_clubs: bool = Query(False, description="是否只顯示我的讀書會"),
+    use_cursor: bool = Query(False, description="是否改用游標分頁（忽略 page）"),
+    cursor: Optional[str] = Query(None, description="游標分頁：上一頁回傳的 next_cursor"),
+    include_total: bool = Query(False, description="游標分頁時是否計算總筆數"),
     current_user: Optional[User] = Depends(get_optional_current_user)
 ) -> PaginatedBookClubList:
     tag_ids_list = None
@@ -144,30 +148,35 @@ def list_book_clubs(
     if my_clubs and not current_user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="請先登入")
     
-    clubs, pagination = book_club_service.list_book_clubs(
-        session=session,
-        page=page,
-        page_size=page_size,
-        keyword=keyword,
-        tag_ids=tag_ids_list,
-        user_id=current_user.id if my_clubs and current_user else None,
-        current_user=current_user
-    )
+    def load(session: Session) -> PaginatedBookClubList:
+        clubs, pagination = book_club_service.list_book_clubs(
+            session=session,
+            page=page,
+            page_size=page_size,
+            keyword=keyword,
+            tag_ids=tag_ids_list,
+            user_id=current_user.id if my_clubs and current_user else None,
+            current_user=current_user,
+            use_cursor=use_cursor or cursor is not None,
+            cursor=cursor,
+            include_total=include_total
+        )
+        return PaginatedBookClubList(
+            items=clubs,
+            pagination=pagination
+        )
     
-    return PaginatedBookClubList(
-        items=clubs,
-        pagination=pagination
-    )
+    return await db.run(load)
 
 
 @router.get("/{club_id}", response_model=BookClubReadWithDetails)
-def get_book_club_detail(
+async def get_book_club_detail(
     *,
-    session: Session = Depends(get_session),
+    db: ReadSession = Depends(get_read_session),
     club_id: int,
     current_user: Optional[User] = Depends(get_optional_current_user)
 ) -> BookClubReadWithDetails:
-    return book_club_service.get_book_club_by_id(session, club_id, current_user)
+    return await db.run(book_club_service.get_book_club_by_id, club_id, current_user)
 
 
 # Configure logging
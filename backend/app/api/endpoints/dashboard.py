@@ -1,8 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlmodel import Session
 
-from app.core.security import get_current_user
-from app.db.session import get_session
+from app.core.security import Principal, get_current_principal
+from app.db.async_session import ReadSession, get_primary_read_session
 from app.models.user import User
 from app.schemas.dashboard import DashboardData
 from app.services import dashboard_service
@@ -12,9 +12,10 @@ router = APIRouter()
 
 
 @router.get("/me/dashboard", response_model=DashboardData, response_model_by_alias=True)
-def get_my_dashboard(
+async def get_my_dashboard(
     *,
-    session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_user)
+    db: ReadSession = Depends(get_primary_read_session),
+    current_user: Principal = Depends(get_current_principal)
 ) -> DashboardData:
-    return dashboard_service.get_user_dashboard(session, current_user.id)
\ No newline at end of file
+    # 儀表板結果會被快取，未命中時從主資料庫計算，避免把延遲複本的舊資料快取起來
+    return await db.run(dashboard_service.get_user_dashboard_cached, current_user.id)
\ No newline at end of file
@@ -1,35 +1,80 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+import asyncio
+from typing import AsyncIterator, Iterator, List, Optional, Union
+from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import selectinload
 from sqlmodel import Session, select
+from starlette.concurrency import run_in_threadpool
 
-from app.db.session import get_session
+from app.core.pagination import decode_cursor
+from app.db.session import get_read_only_session, get_session
 from app.models.user import User
 from app.models.discussion import DiscussionTopic, DiscussionComment
 from app.schemas.discussion import (
     DiscussionTopicRead, DiscussionTopicCreate, DiscussionTopicReadWithComments,
-    DiscussionCommentCreate, DiscussionCommentRead
+    DiscussionCommentCreate, DiscussionCommentRead, DiscussionCommentPage, DiscussionTopicPage,
+    DiscussionSearchResults
 )
+from app.schemas.pagination import CursorPaginationMeta
 from app.models.book_club_member import BookClubMember
-from app.core.security import get_current_user
+from app.core.security import get_current_user, get_stream_principal
 
 router = APIRouter()
 
 from app.core.security import get_club_member
 
-@router.get("/{club_id}/discussions", response_model=List[DiscussionTopicRead])
+from app.services import comment_stream, discussion_search_service, discussion_service
+
+# 主題列表每頁預設筆數
+TOPIC_PAGE_SIZE = 20
+
+@router.get("/{club_id}/discussions", response_model=Union[List[DiscussionTopicRead], DiscussionTopicPage])
 def get_discussion_topics(
     *, 
-    db: Session = Depends(get_session),
+    db: Session = Depends(get_read_only_session),
     club_id: int,
+    use_cursor: bool = Query(False, description="是否改用游標分頁（回傳 items 與 pagination）"),
+    cursor: Optional[str] = Query(None, description="上一頁回傳的 next_cursor"),
+    page_size: int = Query(TOPIC_PAGE_SIZE, ge=1, le=100, description="每頁筆數（游標分頁時使用）"),
     current_user: User = Depends(get_current_user),
     member: BookClubMember = Depends(get_club_member)
 ):
-    """獲取讀書會的所有討論主題"""
-    topics = db.exec(select(DiscussionTopic).where(DiscussionTopic.club_id == club_id).options(selectinload(DiscussionTopic.author))).all()
-    return topics
+    """
+    獲取讀書會的討論主題，依最後活動時間由新到舊排序
+
+    未指定 use_cursor / cursor 時回傳全部主題（陣列）；否則以游標分頁回傳。
+    """
+    if not use_cursor and cursor is None:
+        topics, _ = discussion_service.list_topics(session=db, club_id=club_id)
+        return topics
+
+    topics, next_cursor = discussion_service.list_topics(
+        session=db, club_id=club_id, limit=page_size, cursor=cursor
+    )
+    return DiscussionTopicPage(
+        items=[DiscussionTopicRead.model_validate(topic) for topic in topics],
+        pagination=CursorPaginationMeta(page_size=page_size, next_cursor=next_cursor, has_next=next_cursor is not None)
+    )
 
-from app.services import discussion_service
+@router.get("/{club_id}/discussions/search", response_model=DiscussionSearchResults)
+def search_discussions(
+    *,
+    db: Session = Depends(get_read_only_session),
+    club_id: int,
+    q: str = Query(..., min_length=1, max_length=100, description="搜尋關鍵字（比對主題標題、內容與回覆）"),
+    page: int = Query(1, ge=1, description="頁碼"),
+    page_size: int = Query(20, ge=1, le=50, description="每頁筆數"),
+    current_user: User = Depends(get_current_user),
+    member: BookClubMember = Depends(get_club_member)
+):
+    """搜尋讀書會內的討論主題與回覆，依相關度排序"""
+    keyword = q.strip()
+    if not keyword:
+        raise HTTPException(status_code=400, detail="Search keyword must not be empty")
+    items, pagination = discussion_search_service.search_discussions(
+        db, club_id, keyword, page=page, page_size=page_size
+    )
+    return DiscussionSearchResults(items=items, pagination=pagination)
 
 @router.post("/{club_id}/discussions", response_model=DiscussionTopicRead)
 def create_discussion_topic(
@@ -54,22 +99,67 @@ def get_discussion_topic(
     db: Session = Depends(get_session),
     club_id: int,
     topic_id: int,
+    comment_limit: Optional[int] = Query(None, ge=1, le=100, description="只附帶前 N 筆回覆（其餘以 comments_next_cursor 分頁取得）"),
     current_user: User = Depends(get_current_user),
     member: BookClubMember = Depends(get_club_member)
 ):
-    """獲取單一主題及其所有回覆"""
+    """獲取單一主題及其回覆（未指定 comment_limit 時附帶全部回覆）"""
     topic = db.exec(
         select(DiscussionTopic)
         .where(DiscussionTopic.id == topic_id)
-        .options(
-            selectinload(DiscussionTopic.author),
-            selectinload(DiscussionTopic.comments).selectinload(DiscussionComment.owner)
-        )
+        .options(selectinload(DiscussionTopic.author))
     ).first()
     
     if not topic or topic.club_id != club_id:
         raise HTTPException(status_code=404, detail="Topic not found")
-    return topic
+
+    comments, next_cursor = discussion_service.list_comments(
+        session=db, topic_id=topic_id, limit=comment_limit
+    )
+    return DiscussionTopicReadWithComments(
+        **DiscussionTopicRead.model_validate(topic).model_dump(),
+        comments=[DiscussionCommentRead.model_validate(comment) for comment in comments],
+        comments_next_cursor=next_cursor
+    )
+
+@router.get("/{club_id}/discussions/{topic_id}/comments", response_model=DiscussionCommentPage)
+def list_discussion_comments(
+    *,
+    db: Session = Depends(get_read_only_session),
+    club_id: int,
+    topic_id: int,
+    limit: int = Query(discussion_service.COMMENT_PAGE_SIZE, ge=1, le=100, description="每頁筆數"),
+    cursor: Optional[str] = Query(None, description="上一頁回傳的 next_cursor"),
+    format: str = Query("json", pattern="^(json|ndjson)$", description="ndjson：逐行串流游標之後的所有回覆（忽略 limit）"),
+    current_user: User = Depends(get_current_user),
+    member: BookClubMember = Depends(get_club_member)
+):
+    """以游標分頁（由舊到新）取得主題的回覆，或以 NDJSON 串流"""
+    topic = db.get(DiscussionTopic, topic_id)
+    if not topic or topic.club_id != club_id:
+        raise HTTPException(status_code=404, detail="Topic not found")
+
+    if format == "ndjson":
+        if cursor:
+            decode_cursor(cursor)  # 串流開始前先驗證游標，格式錯誤時回傳 400
+        return StreamingResponse(
+            _stream_comments(db.get_bind(), topic_id, cursor),
+            media_type="application/x-ndjson"
+        )
+
+    comments, next_cursor = discussion_service.list_comments(
+        session=db, topic_id=topic_id, limit=limit, cursor=cursor
+    )
+    return DiscussionCommentPage(
+        items=[DiscussionCommentRead.model_validate(comment) for comment in comments],
+        pagination=CursorPaginationMeta(page_size=limit, next_cursor=next_cursor, has_next=next_cursor is not None)
+    )
+
+def _stream_comments(bind, topic_id: int, cursor: Optional[str]) -> Iterator[str]:
+    # 串流期間使用獨立 session，回應結束時才關閉
+    with Session(bind) as session:
+        for comment in discussion_service.iter_comments(session=session, topic_id=topic_id, cursor=cursor):
+            yield DiscussionCommentRead.model_validate(comment).model_dump_json(by_alias=True) + "\n"
 
 @router.post("/{club_id}/discussions/{topic_id}/comments", response_model=DiscussionCommentRead)
 def create_discussion_comment(
@@ -101,3 +191,68 @@ def create_discussion_comment(
     ).first()
     
     return comment
+
+def _authorize_live_updates(db: Session, club_id: int, topic_id: int, ticket: str) -> None:
+    # 瀏覽器的 WebSocket 無法自訂標頭，改由 query string 帶入短效串流票證（不使用 access token，避免寫入日誌）
+    try:
+        principal = get_stream_principal(db, ticket)
+        get_club_member(club_id, current_user=principal, db=db)
+        topic = db.get(DiscussionTopic, topic_id)
+        if not topic or topic.club_id != club_id:
+            raise HTTPException(status_code=404, detail="Topic not found")
+    finally:
+        db.close()
+
+async def _send_events(websocket: WebSocket, events: AsyncIterator[dict]) -> None:
+    async for event in events:
+        await websocket.send_json(event)
+
+async def _wait_for_disconnect(websocket: WebSocket) -> None:
+    while (await websocket.receive())["type"] != "websocket.disconnect":
+        pass
+
+@router.websocket("/{club_id}/discussions/{topic_id}/live")
+async def discussion_live_updates(
+    websocket: WebSocket,
+    club_id: int,
+    topic_id: int,
+    ticket: str = Query(..., description="POST /auth/stream-ticket 取得的串流票證"),
+    since_id: Optional[int] = Query(None, description="先補發此回覆 ID 之後的回覆（重新連線時使用）"),
+    db: Session = Depends(get_session)
+):
+    """
+    以 WebSocket 即時推送主題的新回覆，取代重新載入整個主題
+
+    每則訊息為 {"type": "comment", "comment": {...}}，閒置時送出 {"type": "keep-alive"}。
+    以 ?ticket= 帶入串流票證，票證只在建立連線時驗證，重新連線前需重新取得。
+    驗證失敗時以 1008 關閉，超過連線數上限時以 1013 關閉。
+    """
+    # 先完成握手再以關閉代碼拒絕；握手前關閉在 uvicorn 上只會得到 HTTP 403，用戶端讀不到原因
+    await websocket.accept()
+    try:
+        await run_in_threadpool(_authorize_live_updates, db, club_id, topic_id, ticket)
+    except HTTPException as exc:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=str(exc.detail))
+        return
+    if not comment_stream.connection_limiter.acquire(topic_id):
+        await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER, reason="Too many connections")
+        return
+
+    events = comment_stream.comment_events(db, topic_id, since_id=since_id)
+    try:
+        tasks = {
+            asyncio.create_task(_send_events(websocket, events)),
+            asyncio.create_task(_wait_for_disconnect(websocket)),
+        }
+        # 任一方結束（用戶端斷線或推送失敗）即停止另一方
+        done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        for task in done:
+            error = task.exception()
+            if error is not None and not isinstance(error, WebSocketDisconnect):
+                raise error
+    finally:
+        await events.aclose()
+        comment_stream.connection_limiter.release(topic_id)
@@ -3,6 +3,7 @@ from sqlmodel import Session
 from typing import Optional
 
 from app.db.session import get_session
+from app.db.async_session import ReadSession, get_read_session
 from app.core.security import get_current_user
 from app.models.user import User
 from app.models.event import EventCreate, EventRead, EventUpdate, EventListResponse, EventStatus, EventListItem, EventDetail
@@ -65,14 +66,17 @@ def create_club_event(
     summary="查詢讀書會活動列表",
     description="讀書會成員可以查看該會的活動列表，支援分頁和狀態篩選"
 )
-def get_club_events(
+async def get_club_events(
     club_id: int,
     status: Optional[EventStatus] = Query(None, description="活動狀態篩選"),
     page: int = Query(1, ge=1, description="頁碼（從 1 開始）"),
     page_size: int = Query(20, ge=1, le=100, description="每頁筆數（最大 100）"),
     sort_by: str = Query("event_datetime", description="排序欄位"),
     order: str = Query("asc", pattern="^(asc|desc)$", description="排序方向"),
-    session: Session = Depends(get_session),
+    use_cursor: bool = Query(False, description="是否改用游標分頁（忽略 page）"),
+    cursor: Optional[str] = Query(None, description="游標分頁：上一頁回傳的 nextCursor"),
+    include_total: bool = Query(False, description="游標分頁時是否計算總筆數"),
+    db: ReadSession = Depends(get_read_session),
     current_user: User = Depends(get_current_user)
 ) -> EventListResponse:
     """
@@ -84,6 +88,9 @@ def get_club_events(
     - **page_size**: 每頁筆數（1-100，預設 20）
     - **sort_by**: 排序欄位（event_datetime 或 created_at，預設 event_datetime）
     - **order**: 排序方向（asc 或 desc，預設 asc）
+    - **use_cursor**: 改用游標分頁（預設 false）
+    - **cursor**: 上一頁回傳的 nextCursor（提供時自動使用游標分頁）
+    - **include_total**: 游標分頁時是否回傳 totalItems（預設 false）
     
     **權限要求**: 需要是讀書會成員
     
@@ -92,15 +99,18 @@ def get_club_events(
     - 404: 讀書會不存在
     """
     try:
-        return event_service.list_events(
-            session=session,
+        return await db.run(
+            event_service.list_events,
             current_user=current_user,
             club_id=club_id,
             status_filter=status,
             page=page,
             page_size=page_size,
             sort_by=sort_by,
-            order=order
+            order=order,
+            use_cursor=use_cursor or cursor is not None,
+            cursor=cursor,
+            include_total=include_total
         )
     except HTTPException:
         raise
@@ -112,19 +122,19 @@ def get_club_events(
 
 
 @router.get("/clubs/{club_id}/events/{event_id}", response_model=EventDetail)
-def get_club_event_detail(
+async def get_club_event_detail(
     club_id: int,
     event_id: int,
     current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session)
+    db: ReadSession = Depends(get_read_session)
 ) -> EventDetail:
     """
     取得活動詳細資訊
     
     權限：讀書會成員
     """
-    return event_service.get_event_detail(
-        session=session,
+    return await db.run(
+        event_service.get_event_detail,
         current_user=current_user,
         club_id=club_id,
         event_id=event_id
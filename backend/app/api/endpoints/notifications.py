@@ -1,46 +1,25 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session, select
-from datetime import datetime
-from pydantic import field_serializer
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
+from sqlmodel import Session
 
-from app.models.notification import Notification, NotificationType
+from app.models.notification import Notification
 from app.models.user import User
-from app.models.book_club_member import BookClubMember
-from app.models.event import Event
 from app.db.session import get_session
-from app.core.security import get_current_user
-from pydantic import BaseModel
+from app.db.async_session import ReadSession, get_primary_read_session, get_read_session
+from app.core.security import Principal, get_current_principal, get_current_user, get_stream_ticket_principal
+from app.schemas.notification import NotificationRead, UnreadCountRead
+from app.services import notification_service, notification_stream
 
 router = APIRouter()
 
 
-class NotificationRead(BaseModel):
-    id: int
-    type: NotificationType
-    content: dict
-    is_read: bool
-    created_at: datetime
-    recipient_id: int
-    
-    @field_serializer('created_at')
-    def serialize_created_at(self, dt: datetime, _info):
-        """Serialize datetime to ISO format with Z suffix (UTC)"""
-        if dt.tzinfo is None:
-            # If datetime is naive (no timezone), treat it as UTC
-            return dt.isoformat() + 'Z'
-        return dt.isoformat()
-    
-    class Config:
-        from_attributes = True
-
-
 @router.get("/", response_model=List[NotificationRead])
-def get_notifications(
+async def get_notifications(
     is_read: Optional[bool] = None,
     limit: int = 20,
-    current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session)
+    current_user: Principal = Depends(get_current_principal),
+    db: ReadSession = Depends(get_read_session)
 ):
     """
     獲取當前用戶的通知列表，只顯示用戶有權限查看的通知
@@ -49,65 +28,99 @@ def get_notifications(
         is_read: 篩選已讀/未讀通知（可選）
         limit: 限制返回數量，預設 20
         current_user: 當前登入用戶
-        session: 資料庫 session
+        db: 唯讀資料庫 session
     
     Returns:
         通知列表，按建立時間降序排序，已過濾無權限查看的通知
+    
+    列表可能由唯讀複本提供，剛標記已讀後的幾秒內 is_read 可能仍為舊值
+    （上限為 DB_REPLICA_MAX_LAG_SECONDS）。
+    """
+    def load(session: Session) -> List[NotificationRead]:
+        notifications = notification_service.list_visible_notifications(
+            session, current_user.id, is_read=is_read, limit=limit
+        )
+        return [NotificationRead.model_validate(notification) for notification in notifications]
+
+    return await db.run(load)
+
+
+@router.get("/unread-count", response_model=UnreadCountRead)
+async def get_unread_count(
+    current_user: Principal = Depends(get_current_principal),
+    db: ReadSession = Depends(get_primary_read_session)
+):
+    """
+    獲取當前用戶的未讀通知數（供通知鈴鐺徽章輪詢使用）
+    
+    讀取主資料庫（單一主鍵查詢），標記已讀後徽章立即更新，不受複本延遲影響。
+    
+    Args:
+        current_user: 當前登入用戶
+        db: 主資料庫的唯讀 session
+    
+    Returns:
+        未讀通知數
+    """
+    return UnreadCountRead(
+        unread_count=await db.run(notification_service.get_unread_count, current_user.id)
+    )
+
+
+@router.get("/stream")
+async def stream_notifications(
+    request: Request,
+    since_id: Optional[int] = None,
+    last_event_id: Optional[int] = Header(default=None),
+    current_user: Principal = Depends(get_stream_ticket_principal),
+    session: Session = Depends(get_session)
+):
     """
-    query = select(Notification).where(Notification.recipient_id == current_user.id)
-    
-    if is_read is not None:
-        query = query.where(Notification.is_read == is_read)
-    
-    query = query.order_by(Notification.id.desc()).limit(limit * 2)  # 多取一些以便過濾後還有足夠數量
-    
-    all_notifications = session.exec(query).all()
-    
-    # 過濾通知：檢查用戶是否有權限查看
-    filtered_notifications = []
-    for notification in all_notifications:
-        has_permission = False
-        
-        if notification.type == NotificationType.NEW_MEMBER:
-            # NEW_MEMBER: 檢查用戶是否是該讀書會的 owner 或 admin
-            club_id = notification.content.get("club_id")
-            if club_id:
-                membership = session.exec(
-                    select(BookClubMember).where(
-                        BookClubMember.user_id == current_user.id,
-                        BookClubMember.book_club_id == club_id
-                    )
-                ).first()
-                
-                if membership and membership.role in ["owner", "admin"]:
-                    has_permission = True
-        
-        elif notification.type == NotificationType.EVENT_CREATED:
-            # EVENT_CREATED: 檢查用戶是否是該讀書會成員
-            club_id = notification.content.get("club_id")
-            if club_id:
-                membership = session.exec(
-                    select(BookClubMember).where(
-                        BookClubMember.user_id == current_user.id,
-                        BookClubMember.book_club_id == club_id
-                    )
-                ).first()
-                
-                if membership:
-                    has_permission = True
-        
-        else:
-            # 其他類型的通知預設顯示
-            has_permission = True
-        
-        if has_permission:
-            filtered_notifications.append(notification)
-            
-        # 達到限制數量就停止
-        if len(filtered_notifications) >= limit:
-            break
-    
-    return filtered_notifications
+    以 Server-Sent Events 推送當前用戶的新通知，取代輪詢
+    
+    EventSource 無法帶 Authorization header，以 ?ticket= 傳入 POST /auth/stream-ticket
+    取得的短效票證；票證只在建立連線時驗證，重新連線前需重新取得。
+    
+    Args:
+        request: HTTP 請求（用於偵測斷線）
+        since_id: 從此通知 ID 之後開始推送（可選）
+        last_event_id: EventSource 重新連線時自動帶入的 Last-Event-ID（可選）
+        current_user: 串流票證對應的用戶
+        session: 資料庫 session
+    
+    Returns:
+        text/event-stream 串流，每個事件的 id 為通知 ID、data 為通知內容
+    """
+    events = notification_stream.notification_events(
+        session,
+        current_user.id,
+        since_id=since_id if since_id is not None else last_event_id,
+        is_disconnected=request.is_disconnected
+    )
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.post("/mark-all-read", status_code=status.HTTP_204_NO_CONTENT)
+def mark_all_notifications_as_read(
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session)
+):
+    """
+    將當前用戶的所有未讀通知標記為已讀
+    
+    Args:
+        current_user: 當前登入用戶
+        session: 資料庫 session
+    
+    Returns:
+        204 No Content
+    """
+    notification_service.mark_all_as_read(session, current_user.id)
+    return None
 
 
 @router.post("/{notification_id}/read", status_code=status.HTTP_204_NO_CONTENT)
@@ -139,8 +152,6 @@ def mark_notification_as_read(
     if notification.recipient_id != current_user.id:
         raise HTTPException(status_code=404, detail="通知不存在")
     
-    notification.is_read = True
-    session.add(notification)
-    session.commit()
+    notification_service.mark_as_read(session, current_user.id, notification_id)
     
     return None
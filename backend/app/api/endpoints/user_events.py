@@ -24,14 +24,17 @@ def get_my_club_events(
         None, 
         description="參與狀態篩選 (all/registered/not_registered)"
     ),
-    club_id: Optional[int] = Query(None, description="讀書會 ID 篩選")
+    club_id: Optional[int] = Query(None, description="讀書會 ID 篩選"),
+    use_cursor: bool = Query(False, description="是否改用游標分頁（忽略 page）"),
+    cursor: Optional[str] = Query(None, description="游標分頁：上一頁回傳的 next_cursor"),
+    include_total: bool = Query(False, description="游標分頁時是否計算總筆數")
 ):
     """
     獲取當前使用者參與讀書會的所有活動
     
     - 包含使用者所有讀書會的活動
     - 可依狀態、參與情況、讀書會篩選
-    - 支援分頁
+    - 支援分頁（頁碼或游標分頁）
     """
     events, pagination = get_user_club_events(
         session=session,
@@ -40,7 +43,10 @@ def get_my_club_events(
         page_size=page_size,
         status=status,
         participation=participation,
-        club_id=club_id
+        club_id=club_id,
+        use_cursor=use_cursor or cursor is not None,
+        cursor=cursor,
+        include_total=include_total
     )
     
     return PaginatedUserEventList(
@@ -0,0 +1,127 @@
+"""
+快取後端
+
+提供統一的 get / set / delete 介面，值一律為字串（由呼叫端負責序列化），
+可在 in-process LRU 與 Redis 相容服務之間切換：
+
+- CACHE_BACKEND=memory（預設）：每個 process 各自的 LRU，適合單一 worker
+- CACHE_BACKEND=redis：連線 REDIS_URL，多個 worker 共用同一份快取
+"""
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Iterable, Optional, Tuple
+
+
+class CacheBackend(ABC):
+    """快取後端介面"""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        """取得快取值，不存在或已過期時回傳 None"""
+
+    @abstractmethod
+    def set(self, key: str, value: str, ttl_seconds: float) -> None:
+        """寫入快取值，ttl_seconds 秒後過期"""
+
+    @abstractmethod
+    def delete_many(self, keys: Iterable[str]) -> None:
+        """刪除多個 key（不存在的 key 略過）"""
+
+    def delete(self, key: str) -> None:
+        self.delete_many([key])
+
+    @abstractmethod
+    def clear(self) -> None:
+        """清除所有快取"""
+
+
+class InMemoryLRUCache(CacheBackend):
+    """執行緒安全、具 TTL 的 in-process LRU 快取"""
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str, ttl_seconds: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete_many(self, keys: Iterable[str]) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class RedisCache(CacheBackend):
+    """
+    以 Redis 相容服務（Redis、Valkey、KeyDB 等）作為快取後端
+
+    client 需提供 redis-py 的 get / set(ex=) / delete 介面。
+    """
+
+    def __init__(self, client, prefix: str = "bookclub:"):
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[str]:
+        value = self.client.get(self.prefix + key)
+        if isinstance(value, bytes):
+            return value.decode("utf-8")
+        return value
+
+    def set(self, key: str, value: str, ttl_seconds: float) -> None:
+        self.client.set(self.prefix + key, value, ex=max(1, int(ttl_seconds)))
+
+    def delete_many(self, keys: Iterable[str]) -> None:
+        keys = [self.prefix + key for key in keys]
+        if keys:
+            self.client.delete(*keys)
+
+    def clear(self) -> None:
+        keys = list(self.client.scan_iter(match=self.prefix + "*"))
+        if keys:
+            self.client.delete(*keys)
+
+
+def create_cache_backend(max_entries: int = 10000) -> CacheBackend:
+    """
+    依環境變數建立快取後端
+
+    Raises:
+        RuntimeError: CACHE_BACKEND=redis 但未安裝 redis 套件
+    """
+    backend = os.getenv("CACHE_BACKEND", "memory").lower()
+    if backend == "redis":
+        try:
+            import redis
+        except ImportError as exc:
+            raise RuntimeError("CACHE_BACKEND=redis 需要安裝 redis 套件") from exc
+        client = redis.Redis.from_url(os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+        return RedisCache(client)
+    return InMemoryLRUCache(max_entries=max_entries)
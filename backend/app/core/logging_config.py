@@ -1,11 +1,17 @@
 """
 集中式日誌配置模組
 提供統一的日誌記錄功能
+
+所有 logger 只掛一個 QueueHandler，實際的 stdout 與檔案寫入由背景的
+QueueListener 執行緒處理，避免在請求路徑上做同步 I/O。
 """
+import atexit
+import json
 import logging
+import queue
 import sys
 from pathlib import Path
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from datetime import datetime
 
 # 日誌目錄
@@ -16,11 +22,25 @@ LOG_DIR.mkdir(exist_ok=True)
 LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s"
 DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
 
+# 結構化（JSON）日誌直接輸出訊息本身
+JSON_LOG_FORMAT = "%(message)s"
+
 # 日誌級別配置
 LOG_LEVEL = logging.INFO
 
+# 所有 logger 共用的佇列與背景寫入執行緒
+_log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+_log_listener = QueueListener(_log_queue, respect_handler_level=True)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+
+def _add_listener_handler(handler: logging.Handler) -> None:
+    # QueueListener 沒有公開的新增 handler 方法，handlers 為 tuple
+    _log_listener.handlers = _log_listener.handlers + (handler,)
+
 
-def setup_logger(name: str, log_file: str = None, level=LOG_LEVEL) -> logging.Logger:
+def setup_logger(name: str, log_file: str = None, level=LOG_LEVEL, fmt: str = LOG_FORMAT) -> logging.Logger:
     """
     設置並返回一個配置好的 logger
     
@@ -28,6 +48,7 @@ def setup_logger(name: str, log_file: str = None, level=LOG_LEVEL) -> logging.Lo
         name: logger 名稱
         log_file: 日誌文件名（可選）
         level: 日誌級別
+        fmt: 日誌格式（結構化日誌使用 JSON_LOG_FORMAT）
     
     Returns:
         配置好的 Logger 實例
@@ -40,13 +61,16 @@ def setup_logger(name: str, log_file: str = None, level=LOG_LEVEL) -> logging.Lo
         return logger
     
     # 創建格式化器
-    formatter = logging.Formatter(LOG_FORMAT, DATE_FORMAT)
+    formatter = logging.Formatter(fmt, DATE_FORMAT)
+    # 背景執行緒中的 handler 只處理此 logger 的紀錄
+    only_this_logger = logging.Filter(name)
     
     # 控制台 Handler
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(level)
     console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    console_handler.addFilter(only_this_logger)
+    _add_listener_handler(console_handler)
     
     # 文件 Handler（如果指定了文件名）
     if log_file:
@@ -59,33 +83,25 @@ def setup_logger(name: str, log_file: str = None, level=LOG_LEVEL) -> logging.Lo
         )
         file_handler.setLevel(level)
         file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        file_handler.addFilter(only_this_logger)
+        _add_listener_handler(file_handler)
     
+    logger.addHandler(QueueHandler(_log_queue))
     return logger
 
 
 # 預定義的 logger 實例
 app_logger = setup_logger("app", "app.log")
-api_logger = setup_logger("api", "api.log")
+api_logger = setup_logger("api", "api.log", fmt=JSON_LOG_FORMAT)
 db_logger = setup_logger("database", "database.log")
 auth_logger = setup_logger("auth", "auth.log")
 error_logger = setup_logger("error", "error.log", logging.ERROR)
 
 
-def log_api_request(endpoint: str, method: str, user_id: int = None, club_id: int = None):
-    """記錄 API 請求"""
-    api_logger.info(
-        f"API Request - Method: {method}, Endpoint: {endpoint}, "
-        f"User: {user_id}, Club: {club_id}"
-    )
-
-
-def log_api_response(endpoint: str, status_code: int, duration: float = None):
-    """記錄 API 響應"""
-    api_logger.info(
-        f"API Response - Endpoint: {endpoint}, Status: {status_code}, "
-        f"Duration: {duration:.3f}s" if duration else f"Status: {status_code}"
-    )
+def log_api_access(fields: dict):
+    """記錄一筆 API 存取紀錄（每個請求一行 JSON）"""
+    level = logging.ERROR if fields.get("status", 0) >= 500 else logging.INFO
+    api_logger.log(level, json.dumps(fields, ensure_ascii=False, separators=(",", ":")))
 
 
 def log_database_operation(operation: str, table: str, record_id: int = None, user_id: int = None):
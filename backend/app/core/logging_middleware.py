@@ -1,49 +1,95 @@
 """
 日誌記錄中間件
 自動記錄所有 API 請求和響應
+
+以純 ASGI 實作（不經過 BaseHTTPMiddleware 的額外 task 與串流複製），
+每個請求只輸出一筆 JSON 存取紀錄，實際寫入由 logging_config 的
+QueueListener 在背景執行緒完成：
+
+- 請求 ID：沿用請求的 X-Request-ID，否則自動產生；寫入 request.state.request_id
+  並附加在回應標頭
+- API_LOG_SAMPLE_RATE：一般請求的取樣比例（0~1，預設 1）；錯誤（5xx）與
+  超過 API_LOG_SLOW_REQUEST_MS 的慢請求一律記錄
+- origin_validator：選填的來源檢查，不通過時一律記錄並標記 origin_rejected
 """
+import os
+import random
 import time
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import Response
+import uuid
+from typing import Callable, Optional
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-from app.core.logging_config import log_api_request, log_api_response, log_error
+from app.core.logging_config import log_api_access, log_error
 
+REQUEST_ID_HEADER = "x-request-id"
 
-class LoggingMiddleware(BaseHTTPMiddleware):
+
+class LoggingMiddleware:
     """記錄所有 HTTP 請求和響應的中間件"""
-    
-    async def dispatch(self, request: Request, call_next):
-        # 記錄請求開始時間
-        start_time = time.time()
-        
-        # 提取請求資訊
-        method = request.method
-        endpoint = request.url.path
-        
-        # 嘗試獲取用戶 ID（如果有認證）
-        user_id = None
-        if hasattr(request.state, "user"):
-            user_id = getattr(request.state.user, "id", None)
-        
-        # 記錄請求
-        log_api_request(endpoint, method, user_id=user_id)
-        
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        sample_rate: Optional[float] = None,
+        slow_request_ms: Optional[float] = None,
+        origin_validator: Optional[Callable[[str], bool]] = None,
+    ):
+        self.app = app
+        self.sample_rate = (
+            sample_rate if sample_rate is not None else float(os.getenv("API_LOG_SAMPLE_RATE", "1"))
+        )
+        self.slow_request_ms = (
+            slow_request_ms if slow_request_ms is not None else float(os.getenv("API_LOG_SLOW_REQUEST_MS", "1000"))
+        )
+        self.origin_validator = origin_validator
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        headers = dict(scope.get("headers") or [])
+        request_id = headers.get(REQUEST_ID_HEADER.encode(), b"").decode("latin-1")[:64] or uuid.uuid4().hex
+        scope.setdefault("state", {})["request_id"] = request_id
+        status_code = 500
+
+        async def send_with_request_id(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message)[REQUEST_ID_HEADER] = request_id
+            await send(message)
+
         try:
-            # 處理請求
-            response: Response = await call_next(request)
-            
-            # 計算處理時間
-            duration = time.time() - start_time
-            
-            # 記錄響應
-            log_api_response(endpoint, response.status_code, duration)
-            
-            return response
-            
+            await self.app(scope, receive, send_with_request_id)
         except Exception as e:
-            # 記錄錯誤
-            duration = time.time() - start_time
-            log_error(e, context=f"{method} {endpoint}", user_id=user_id)
-            log_api_response(endpoint, 500, duration)
+            status_code = 500
+            log_error(e, context=f"{scope['method']} {scope['path']} request_id={request_id}")
             raise
+        finally:
+            duration_ms = (time.perf_counter() - start_time) * 1000
+            origin = headers.get(b"origin", b"").decode("latin-1")
+            origin_rejected = bool(origin and self.origin_validator and not self.origin_validator(origin))
+            if (
+                status_code >= 500
+                or origin_rejected
+                or duration_ms >= self.slow_request_ms
+                or random.random() < self.sample_rate
+            ):
+                fields = {
+                    "request_id": request_id,
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "status": status_code,
+                    "duration_ms": round(duration_ms, 2),
+                    "client": scope["client"][0] if scope.get("client") else None,
+                }
+                user = scope["state"].get("user")
+                if user is not None:
+                    fields["user_id"] = getattr(user, "id", None)
+                if origin_rejected:
+                    fields["origin_rejected"] = origin
+                log_api_access(fields)
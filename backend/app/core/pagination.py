@@ -0,0 +1,54 @@
+"""
+Keyset（游標）分頁工具
+
+游標為 base64 編碼的 JSON `[排序值, id]`，對用戶端不透明。以 (排序欄位, id)
+組合條件取代 OFFSET，查詢成本不隨頁數加深而增加。
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, or_
+
+
+def encode_cursor(sort_value: datetime, row_id: int) -> str:
+    """將最後一筆資料的 (排序值, id) 編碼為游標"""
+    payload = json.dumps([sort_value.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    解碼游標
+    
+    Raises:
+        HTTPException: 400 - 游標格式錯誤
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(sort_value), int(row_id)
+    except (ValueError, TypeError, binascii.Error, UnicodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="分頁游標格式錯誤"
+        )
+
+
+def after_cursor(sort_column, id_column, cursor: str, descending: bool):
+    """
+    產生「位於游標之後」的 WHERE 條件
+    
+    Args:
+        sort_column: 主排序欄位
+        id_column: 作為同值排序依據的主鍵欄位
+        cursor: encode_cursor 產生的游標
+        descending: 是否為降冪排序
+    """
+    sort_value, row_id = decode_cursor(cursor)
+    if descending:
+        return or_(sort_column < sort_value, and_(sort_column == sort_value, id_column < row_id))
+    return or_(sort_column > sort_value, and_(sort_column == sort_value, id_column > row_id))
@@ -0,0 +1,136 @@
+"""
+密碼雜湊執行器
+
+bcrypt 每次約需數百毫秒 CPU，直接在請求中執行會占住 worker 執行緒，
+登入尖峰時拖慢同一個 worker 的所有 API。此模組將雜湊工作交給大小固定的
+process pool，並以等待上限提供 backpressure：
+
+- PASSWORD_HASH_WORKERS：process 數（預設 min(4, CPU 數)；設為 0 時改用
+  thread pool，僅建議用於測試或單核環境）
+- PASSWORD_HASH_MAX_PENDING：執行中加排隊的上限，超過時立即拒絕
+  （PasswordHasherBusy），避免請求無限堆積
+
+worker 只 import app.core.passwords（不載入應用程式的其他模組）。
+metrics() 提供進行中數量、拒絕數與排隊/執行時間，由排程工作
+log_password_hasher_metrics 定期寫入日誌（見 app.services.scheduled_jobs）。
+"""
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Dict, Optional
+
+from app.core.logging_config import app_logger
+from app.core.passwords import hash_password, timed_call, verify_password
+
+
+class PasswordHasherBusy(Exception):
+    """等待中的雜湊工作已達上限"""
+
+
+class PasswordHasher:
+    """以有界 process pool 執行 bcrypt 的非同步 API"""
+
+    def __init__(self, max_workers: int, max_pending: int):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+        self._total_wait_seconds = 0.0
+        self._total_run_seconds = 0.0
+        self._max_wait_seconds = 0.0
+
+    def _get_executor(self) -> Optional[Executor]:
+        if self.max_workers <= 0:
+            return None
+        with self._lock:
+            if self._executor is None:
+                # 伺服器為多執行緒，fork 可能複製到其他執行緒持有中的鎖而使子 process 卡死，
+                # 改以 forkserver（不支援的平台用 spawn）建立 worker
+                method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+                context = multiprocessing.get_context(method)
+                if method == "forkserver":
+                    context.set_forkserver_preload(["app.core.passwords"])
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context)
+            return self._executor
+
+    async def _submit(self, func, *args):
+        with self._lock:
+            if self._in_flight >= self.max_pending:
+                self._rejected += 1
+                raise PasswordHasherBusy()
+            self._in_flight += 1
+
+        submitted_at = time.monotonic()
+        try:
+            executor = self._get_executor()
+            if executor is None:
+                started_at, result = await asyncio.to_thread(timed_call, func, *args)
+            else:
+                loop = asyncio.get_running_loop()
+                started_at, result = await loop.run_in_executor(executor, timed_call, func, *args)
+        except BaseException:
+            with self._lock:
+                self._in_flight -= 1
+            raise
+
+        finished_at = time.monotonic()
+        wait_seconds = max(0.0, started_at - submitted_at)
+        with self._lock:
+            self._in_flight -= 1
+            self._completed += 1
+            self._total_wait_seconds += wait_seconds
+            self._total_run_seconds += finished_at - started_at
+            self._max_wait_seconds = max(self._max_wait_seconds, wait_seconds)
+        return result
+
+    async def hash(self, password: str) -> str:
+        """
+        非同步計算密碼雜湊
+
+        Raises:
+            PasswordHasherBusy: 等待中的工作已達上限
+        """
+        return await self._submit(hash_password, password)
+
+    async def verify(self, password: str, password_hash: str) -> bool:
+        """
+        非同步驗證密碼
+
+        Raises:
+            PasswordHasherBusy: 等待中的工作已達上限
+        """
+        return await self._submit(verify_password, password, password_hash)
+
+    def metrics(self) -> Dict[str, float]:
+        """目前的佇列與執行統計"""
+        with self._lock:
+            completed = self._completed or 1
+            return {
+                "workers": self.max_workers,
+                "max_pending": self.max_pending,
+                "in_flight": self._in_flight,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "avg_wait_ms": round(self._total_wait_seconds / completed * 1000, 2),
+                "max_wait_ms": round(self._max_wait_seconds * 1000, 2),
+                "avg_run_ms": round(self._total_run_seconds / completed * 1000, 2),
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+            app_logger.info("Password hasher metrics at shutdown: %s", self.metrics())
+
+
+password_hasher = PasswordHasher(
+    max_workers=int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1)))),
+    max_pending=int(os.getenv("PASSWORD_HASH_MAX_PENDING", "64")),
+)
@@ -0,0 +1,26 @@
+"""
+密碼雜湊（bcrypt）
+
+只依賴 bcrypt：app.core.password_hasher 的 worker process 只 import 此模組，
+不會載入資料庫 engine、日誌 handler 等應用程式元件。
+"""
+import time
+from typing import Tuple
+
+import bcrypt
+
+
+def hash_password(password: str) -> str:
+    password_bytes = password.encode('utf-8')
+    salt = bcrypt.gensalt()
+    hashed = bcrypt.hashpw(password_bytes, salt)
+    return hashed.decode('utf-8')
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    password_bytes = plain_password.encode('utf-8')
+    hashed_bytes = hashed_password.encode('utf-8')
+    return bcrypt.checkpw(password_bytes, hashed_bytes)
+
+def timed_call(func, *args) -> Tuple[float, object]:
+    # 於 worker 中記錄開始時間（CLOCK_MONOTONIC 跨 process 可比較），用來區分排隊與執行時間
+    return time.monotonic(), func(*args)
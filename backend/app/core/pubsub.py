@@ -0,0 +1,246 @@
+"""
+Pub/Sub broker
+
+供即時推播使用：寫入端在 commit 後 publish 到頻道。訊息可能只是喚醒訊號
+（通知 SSE 收到後向資料庫查詢），也可能帶有完整資料（討論回覆 WebSocket
+直接轉送）；不論哪一種，訊息都可能遺失（訂閱者過慢、broker 重新連線），
+此時 broker 標記 Subscription.dropped，訂閱者須以 since-id 向資料庫補齊。
+
+- PUBSUB_BACKEND=memory（預設）：單一 process 內的 broker
+- PUBSUB_BACKEND=postgres：以 PostgreSQL LISTEN/NOTIFY 在多個 uvicorn worker
+  之間共享，每個 process 以一條背景連線 LISTEN 並轉發給本地訂閱者
+"""
+import asyncio
+import json
+import os
+import select
+import threading
+import time
+from typing import Dict, Iterable, Optional, Set
+
+from app.core.logging_config import app_logger
+
+
+# broker 重新連線後送給所有訂閱者的喚醒訊息（訂閱者應向資料庫補齊）
+RESYNC_MESSAGE = {"type": "resync"}
+
+
+class Subscription:
+    """訂閱一組頻道，於建立它的 event loop 中以 asyncio.Queue 接收訊息"""
+
+    def __init__(self, broker: "InProcessBroker", channels: Iterable[str], max_queue: int = 100):
+        self.broker = broker
+        self.channels = set(channels)
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        # 可能漏收訊息（佇列已滿丟棄或 broker 重新連線），訂閱者應向資料庫補齊後自行清除
+        self.dropped = False
+
+    def _resync(self) -> None:
+        # broker 可能漏送了訊息：標記 dropped 並喚醒訂閱者，使其向資料庫補齊
+        self.dropped = True
+        if not self.queue.full():
+            self.queue.put_nowait(RESYNC_MESSAGE)
+
+    def _deliver(self, message: dict) -> None:
+        # 訂閱者過慢時丟棄並標記 dropped：訊息可能帶有資料，訂閱者須向資料庫補齊被丟棄的部分
+        if not self.queue.full():
+            self.queue.put_nowait(message)
+        else:
+            self.dropped = True
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[dict]:
+        """等待下一則訊息，逾時回傳 None"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self) -> None:
+        self.broker.unsubscribe(self)
+
+
+class InProcessBroker:
+    """單一 process 內的 broker，publish 可由任何執行緒呼叫"""
+
+    def __init__(self):
+        self._subscriptions: Dict[str, Set[Subscription]] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, channels: Iterable[str]) -> Subscription:
+        """訂閱頻道（需在 event loop 中呼叫）"""
+        subscription = Subscription(self, channels)
+        with self._lock:
+            for channel in subscription.channels:
+                self._subscriptions.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            for channel in subscription.channels:
+                subscribers = self._subscriptions.get(channel)
+                if subscribers is None:
+                    continue
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscriptions[channel]
+
+    def subscriber_count(self, channel: str) -> int:
+        return len(self._subscriptions.get(channel, ()))
+
+    def publish(self, channel: str, message: dict, compact: Optional[dict] = None) -> None:
+        """
+        發布訊息給本 process 中訂閱該頻道的連線
+
+        Args:
+            channel: 頻道名稱
+            message: 訊息內容
+            compact: 精簡版訊息；訊息超過後端的大小上限時改送此訊息（本 process 內無上限）
+        """
+        self._dispatch(channel, message)
+
+    def _dispatch(self, channel: str, message: dict) -> None:
+        with self._lock:
+            subscribers = list(self._subscriptions.get(channel, ()))
+        for subscription in subscribers:
+            self._call_soon(subscription, subscription._deliver, message)
+
+    def resync_subscribers(self) -> None:
+        """通知所有訂閱者可能有訊息遺失（例如 broker 重新連線），由訂閱者向資料庫補齊"""
+        with self._lock:
+            subscribers = {s for channel_subscribers in self._subscriptions.values() for s in channel_subscribers}
+        for subscription in subscribers:
+            self._call_soon(subscription, subscription._resync)
+
+    def _call_soon(self, subscription: Subscription, callback, *args) -> None:
+        try:
+            subscription.loop.call_soon_threadsafe(callback, *args)
+        except RuntimeError:
+            # event loop 已關閉
+            self.unsubscribe(subscription)
+
+
+class PostgresBroker(InProcessBroker):
+    """
+    以 PostgreSQL LISTEN/NOTIFY 跨 process 共享的 broker
+
+    所有頻道多工在單一 PostgreSQL 頻道上，payload 為 {"channel": ..., "message": ...}。
+    NOTIFY payload 須小於 8000 bytes，以實際送出的字串計算，超過時改送 compact 訊息。
+
+    LISTEN 連線中斷時以指數退避重新連線；LISTEN 生效前（首次連線或斷線期間）
+    發布的訊息收不到，因此每次 LISTEN 成功後都會呼叫 resync_subscribers。
+    """
+
+    MAX_PAYLOAD_BYTES = 7999
+    RECONNECT_MIN_SECONDS = 1.0
+    RECONNECT_MAX_SECONDS = 30.0
+
+    def __init__(self, dsn: str, pg_channel: str = "bookclub_pubsub"):
+        super().__init__()
+        self.dsn = dsn
+        self.pg_channel = pg_channel
+        self._publish_connection = None
+        self._publish_lock = threading.Lock()
+        self._listener: Optional[threading.Thread] = None
+
+    def _connect(self):
+        import psycopg2
+
+        connection = psycopg2.connect(self.dsn)
+        connection.autocommit = True
+        return connection
+
+    def subscribe(self, channels: Iterable[str]) -> Subscription:
+        self._ensure_listener()
+        return super().subscribe(channels)
+
+    def encode(self, channel: str, message: dict, compact: Optional[dict] = None) -> Optional[str]:
+        """產生 NOTIFY payload，訊息過大時改用 compact，仍過大則回傳 None"""
+        for candidate in (message, compact):
+            if candidate is None:
+                continue
+            payload = json.dumps({"channel": channel, "message": candidate}, separators=(",", ":"))
+            if len(payload.encode("utf-8")) <= self.MAX_PAYLOAD_BYTES:
+                return payload
+        return None
+
+    def publish(self, channel: str, message: dict, compact: Optional[dict] = None) -> None:
+        payload = self.encode(channel, message, compact)
+        if payload is None:
+            app_logger.error("Pubsub message for %s exceeds the NOTIFY payload limit, dropping", channel)
+            return
+        with self._publish_lock:
+            try:
+                if self._publish_connection is None or self._publish_connection.closed:
+                    self._publish_connection = self._connect()
+                with self._publish_connection.cursor() as cursor:
+                    cursor.execute("SELECT pg_notify(%s, %s)", (self.pg_channel, payload))
+            except Exception:
+                self._publish_connection = None
+                app_logger.exception("Failed to publish to %s", channel)
+
+    def _ensure_listener(self) -> None:
+        with self._lock:
+            if self._listener is None or not self._listener.is_alive():
+                self._listener = threading.Thread(target=self._listen, name="pubsub-listener", daemon=True)
+                self._listener.start()
+
+    def _listen(self) -> None:
+        delay = self.RECONNECT_MIN_SECONDS
+        while True:
+            connection = None
+            try:
+                connection = self._connect()
+                with connection.cursor() as cursor:
+                    cursor.execute(f'LISTEN "{self.pg_channel}"')
+                delay = self.RECONNECT_MIN_SECONDS
+                self.resync_subscribers()
+                self._poll(connection)
+            except Exception:
+                app_logger.exception("Pubsub listener connection lost, reconnecting in %.1fs", delay)
+            finally:
+                if connection is not None:
+                    try:
+                        connection.close()
+                    except Exception:
+                        pass
+            time.sleep(delay)
+            delay = min(delay * 2, self.RECONNECT_MAX_SECONDS)
+
+    def _poll(self, connection) -> None:
+        """轉發 NOTIFY 給本地訂閱者，直到連線中斷（拋出例外）"""
+        while True:
+            if select.select([connection], [], [], 30) == ([], [], []):
+                continue
+            connection.poll()
+            while connection.notifies:
+                notify = connection.notifies.pop(0)
+                try:
+                    payload = json.loads(notify.payload)
+                    self._dispatch(payload["channel"], payload["message"])
+                except (ValueError, KeyError):
+                    app_logger.warning("Ignoring malformed pubsub payload: %s", notify.payload)
+
+
+_broker: Optional[InProcessBroker] = None
+
+
+def get_broker() -> InProcessBroker:
+    """取得依 PUBSUB_BACKEND 設定建立的 broker（process 內共用）"""
+    global _broker
+    if _broker is None:
+        if os.getenv("PUBSUB_BACKEND", "memory").lower() == "postgres":
+            from sqlalchemy.engine import make_url
+
+            # psycopg2 只接受不含 driver 的 DSN（postgresql+psycopg2:// → postgresql://）
+            url = make_url(os.environ["DATABASE_URL"]).set(drivername="postgresql")
+            _broker = PostgresBroker(url.render_as_string(hide_password=False))
+        else:
+            _broker = InProcessBroker()
+    return _broker
+
+
+def set_broker(broker: InProcessBroker) -> None:
+    """替換 broker（例如測試或自訂後端）"""
+    global _broker
+    _broker = broker
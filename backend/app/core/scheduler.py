@@ -0,0 +1,71 @@
+"""
+In-process 週期性背景工作排程
+
+由 FastAPI lifespan 啟動與停止。每個工作是一個 asyncio task，依固定間隔
+在 thread pool 中執行同步函式（資料庫操作皆為同步 session），同一工作
+以 asyncio.Lock 保證不會重疊執行；跨 process 的單一執行者鎖由工作本身負責
+（見 app.services.scheduled_jobs）。
+"""
+import asyncio
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional
+
+from app.core.logging_config import app_logger
+
+
+@dataclass
+class PeriodicJob:
+    """固定間隔執行的背景工作"""
+    name: str
+    interval_seconds: float
+    func: Callable[[], object]
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    task: Optional[asyncio.Task] = None
+
+    async def run_once(self) -> bool:
+        """
+        執行一次工作
+
+        Returns:
+            bool: 是否有執行（上一輪尚未結束時略過）
+        """
+        if self.lock.locked():
+            app_logger.warning("Job %s is still running, skipping this tick", self.name)
+            return False
+        async with self.lock:
+            try:
+                await asyncio.to_thread(self.func)
+            except Exception:
+                app_logger.exception("Job %s failed", self.name)
+        return True
+
+    async def _loop(self) -> None:
+        while True:
+            await self.run_once()
+            await asyncio.sleep(self.interval_seconds)
+
+
+class Scheduler:
+    """管理多個 PeriodicJob 的生命週期"""
+
+    def __init__(self):
+        self.jobs: Dict[str, PeriodicJob] = {}
+
+    def add_job(self, name: str, interval_seconds: float, func: Callable[[], object]) -> PeriodicJob:
+        job = PeriodicJob(name=name, interval_seconds=interval_seconds, func=func)
+        self.jobs[name] = job
+        return job
+
+    def start(self) -> None:
+        for job in self.jobs.values():
+            if job.task is None:
+                job.task = asyncio.create_task(job._loop(), name=f"job:{job.name}")
+                app_logger.info("Scheduled job %s every %ss", job.name, job.interval_seconds)
+
+    async def stop(self) -> None:
+        tasks = [job.task for job in self.jobs.values() if job.task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for job in self.jobs.values():
+            job.task = None
@@ -0,0 +1,173 @@
+"""
+In-process n-gram 倒排索引
+
+中文內容沒有空白斷詞，一般的 word tokenizer 無法使用，因此以字元 bigram
+建立倒排索引（單一字元查詢則使用 unigram）。若關鍵字是某欄位的子字串，
+該欄位必定包含關鍵字的所有 n-gram，因此索引回傳的候選集合是
+`LIKE '%keyword%'` 結果的超集合，呼叫端再以原條件複查即可得到精確結果。
+
+此索引只作為 SQLite（測試 / 單一 process 開發環境）上 pg_trgm 的替代方案：
+索引存在 process 記憶體中，其他 worker 的寫入不會同步，因此不用於其他資料庫。
+
+候選 id 會以 IN 與 CASE 帶入 SQL，因此 search 可限制只回傳分數最高的前 N 筆
+（MAX_CANDIDATES），避免過短或常見的關鍵字產生帶有數千個參數的查詢；
+超過上限時結果只涵蓋分數最高的候選。
+
+寫入時以 stage_index_change 把變更暫存在 session 上，commit 後才套用到索引，
+rollback 時捨棄，避免索引出現未提交或已撤銷的資料。
+"""
+import heapq
+import os
+import threading
+from typing import Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session as OrmSession
+
+_PENDING_CHANGES = "ngram_index_pending_changes"
+
+# 每次搜尋帶入 SQL 的候選 id 上限
+MAX_CANDIDATES = int(os.getenv("NGRAM_SEARCH_MAX_CANDIDATES", "500"))
+
+
+def _normalize(text: Optional[str]) -> str:
+    return (text or "").lower()
+
+
+def query_grams(keyword: str) -> Set[str]:
+    """取得查詢關鍵字的 n-gram（長度 1 時為 unigram，否則為 bigram）"""
+    text = _normalize(keyword)
+    if len(text) <= 1:
+        return {text} if text else set()
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+def document_grams(text: Optional[str]) -> Set[str]:
+    """取得文件的所有 unigram 與 bigram"""
+    text = _normalize(text)
+    grams = set(text)
+    grams.update(text[i:i + 2] for i in range(len(text) - 1))
+    return grams
+
+
+class NgramIndex:
+    """
+    多欄位 n-gram 倒排索引
+
+    每個欄位各自維護 posting list，搜尋時取所有 n-gram posting 的交集，
+    命中欄位的權重加總即為排序分數。
+    """
+
+    def __init__(self, field_weights: Mapping[str, float]):
+        self.field_weights = dict(field_weights)
+        self._postings: Dict[str, Dict[str, Set[int]]] = {field: {} for field in self.field_weights}
+        self._documents: Dict[int, Dict[str, Set[str]]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def add(self, doc_id: int, fields: Mapping[str, Optional[str]]) -> None:
+        """新增或取代一份文件"""
+        with self._lock:
+            self._remove(doc_id)
+            grams_by_field = {}
+            for field in self.field_weights:
+                grams = document_grams(fields.get(field))
+                grams_by_field[field] = grams
+                postings = self._postings[field]
+                for gram in grams:
+                    postings.setdefault(gram, set()).add(doc_id)
+            self._documents[doc_id] = grams_by_field
+
+    def add_many(self, documents: Iterable[tuple]) -> None:
+        """批次新增 (doc_id, fields) 文件"""
+        for doc_id, fields in documents:
+            self.add(doc_id, fields)
+
+    def remove(self, doc_id: int) -> None:
+        """移除文件（不存在時忽略）"""
+        with self._lock:
+            self._remove(doc_id)
+
+    def _remove(self, doc_id: int) -> None:
+        grams_by_field = self._documents.pop(doc_id, None)
+        if not grams_by_field:
+            return
+        for field, grams in grams_by_field.items():
+            postings = self._postings[field]
+            for gram in grams:
+                doc_ids = postings.get(gram)
+                if doc_ids is None:
+                    continue
+                doc_ids.discard(doc_id)
+                if not doc_ids:
+                    del postings[gram]
+
+    def search(self, keyword: str, limit: Optional[int] = None) -> Dict[int, float]:
+        """
+        搜尋可能包含關鍵字的文件
+
+        Args:
+            keyword: 搜尋關鍵字
+            limit: 只回傳分數最高的前 limit 筆（同分時 id 較大者優先）；None 表示不限制
+
+        Returns:
+            Dict[int, float]: {doc_id: 分數}，分數為命中欄位的權重加總
+        """
+        grams = query_grams(keyword)
+        if not grams:
+            return {}
+
+        scores: Dict[int, float] = {}
+        with self._lock:
+            for field, weight in self.field_weights.items():
+                postings = self._postings[field]
+                # 由最短的 posting list 開始取交集
+                lists = sorted((postings.get(gram, set()) for gram in grams), key=len)
+                matched = set(lists[0])
+                for doc_ids in lists[1:]:
+                    if not matched:
+                        break
+                    matched &= doc_ids
+                for doc_id in matched:
+                    scores[doc_id] = scores.get(doc_id, 0.0) + weight
+        if limit is not None and len(scores) > limit:
+            top = heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], item[0]))
+            scores = dict(top)
+        return scores
+
+
+def stage_index_change(
+    session: OrmSession,
+    index: "NgramIndex",
+    doc_id: int,
+    fields: Optional[Mapping[str, Optional[str]]] = None
+) -> None:
+    """
+    暫存索引變更，於 session commit 後套用
+
+    Args:
+        session: 進行寫入的 session
+        index: 目標索引
+        doc_id: 文件 ID
+        fields: 文件欄位；None 表示移除文件
+    """
+    pending: List[Tuple["NgramIndex", int, Optional[Mapping[str, Optional[str]]]]] = (
+        session.info.setdefault(_PENDING_CHANGES, [])
+    )
+    pending.append((index, doc_id, dict(fields) if fields is not None else None))
+
+
+@event.listens_for(OrmSession, "after_commit")
+def _apply_pending_changes(session) -> None:
+    for index, doc_id, fields in session.info.pop(_PENDING_CHANGES, ()):
+        if fields is None:
+            index.remove(doc_id)
+        else:
+            index.add(doc_id, fields)
+
+
+@event.listens_for(OrmSession, "after_rollback")
+def _discard_pending_changes(session) -> None:
+    session.info.pop(_PENDING_CHANGES, None)
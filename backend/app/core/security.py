@@ -1,14 +1,16 @@
-import bcrypt
 import os
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlmodel import Session, select
+from app.core.passwords import hash_password, verify_password
 from app.db.session import get_session
 from app.models.user import User
 from app.models.book_club_member import BookClubMember
+from app.services import auth_cache
 
 # JWT 設定
 SECRET_KEY = os.getenv("SECRET_KEY", "fallback-secret-key-for-development-only")
@@ -16,16 +18,14 @@ ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
 ACCESS_TOKEN_EXPIRE_DAYS_REMEMBER = 7
 
-def hash_password(password: str) -> str:
-    password_bytes = password.encode('utf-8')
-    salt = bcrypt.gensalt()
-    hashed = bcrypt.hashpw(password_bytes, salt)
-    return hashed.decode('utf-8')
+# 是否在 JWT 中附帶用戶 ID、token 版本與顯示資訊（見 create_user_access_token），
+# 啟用後唯讀端點可透過 get_current_principal 免查詢 user 表
+JWT_EMBED_USER_CLAIMS = os.getenv("JWT_EMBED_USER_CLAIMS", "false").lower() == "true"
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    password_bytes = plain_password.encode('utf-8')
-    hashed_bytes = hashed_password.encode('utf-8')
-    return bcrypt.checkpw(password_bytes, hashed_bytes)
+# 串流票證（SSE / WebSocket 用）：瀏覽器的 EventSource 與 WebSocket 無法帶 Authorization
+# header，改以查詢參數傳遞短效、單一用途的票證，避免長效 access token 出現在 URL 與日誌中
+STREAM_TICKET_PURPOSE = "stream"
+STREAM_TICKET_EXPIRE_SECONDS = int(os.getenv("STREAM_TICKET_EXPIRE_SECONDS", "60"))
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
@@ -39,6 +39,39 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+def create_user_access_token(user: User, expires_delta: Optional[timedelta] = None) -> str:
+    """
+    為已登入用戶簽發 access token
+
+    一律帶入 sub（email）與 ver（token 版本，撤銷檢查用）；JWT_EMBED_USER_CLAIMS
+    啟用時額外帶入 uid、name 與 avatar。
+    """
+    data = {"sub": user.email, "ver": user.token_version}
+    if JWT_EMBED_USER_CLAIMS:
+        data.update({
+            "uid": user.id,
+            "name": user.display_name,
+            "avatar": user.avatar_url,
+        })
+    return create_access_token(data, expires_delta=expires_delta)
+
+def create_stream_ticket(user: User) -> str:
+    """
+    為已登入用戶簽發串流票證
+
+    票證帶有 purpose claim，只能用於串流端點（見 get_stream_principal），
+    一般 API 會拒絕；有效期限為 STREAM_TICKET_EXPIRE_SECONDS 秒，只需涵蓋建立連線的時間。
+    """
+    data = {
+        "sub": user.email,
+        "uid": user.id,
+        "ver": user.token_version,
+        "name": user.display_name,
+        "avatar": user.avatar_url,
+        "purpose": STREAM_TICKET_PURPOSE,
+    }
+    return create_access_token(data, expires_delta=timedelta(seconds=STREAM_TICKET_EXPIRE_SECONDS))
+
 def decode_access_token(token: str) -> Optional[dict]:
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
@@ -46,6 +79,32 @@ def decode_access_token(token: str) -> Optional[dict]:
     except JWTError:
         return None
 
+def _resolve_user(db: Session, email: str) -> Optional[User]:
+    """以 email 取得用戶，優先使用 auth_cache"""
+    user = auth_cache.get_user(db, email)
+    if user is None:
+        user = db.exec(select(User).where(User.email == email)).first()
+        if user:
+            auth_cache.put_user(user)
+    return user
+
+def _is_revoked(payload: dict, user: User) -> bool:
+    # 沒有 ver 的舊格式 token 皆簽發於 token_version 欄位加入前（版本 0），視為版本 0：
+    # 用戶重設密碼或登出所有裝置後版本遞增，這些 token 即一併失效
+    return payload.get("ver", 0) != user.token_version
+
+@dataclass(frozen=True)
+class Principal:
+    """不需查詢資料庫即可取得的目前用戶資訊（供唯讀端點使用）"""
+    id: int
+    email: str
+    display_name: str
+    avatar_url: Optional[str] = None
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(id=user.id, email=user.email, display_name=user.display_name, avatar_url=user.avatar_url)
+
 security_scheme = HTTPBearer()
 optional_security_scheme = HTTPBearer(auto_error=False)
 
@@ -53,11 +112,11 @@ def get_current_user(
     db: Session = Depends(get_session),
     credentials: HTTPAuthorizationCredentials = Depends(security_scheme)
 ) -> User:
-    print("---LOG: Entering get_current_user dependency---")
     token = credentials.credentials
     payload = decode_access_token(token)
     
-    if not payload:
+    # 帶有 purpose 的票證（例如串流票證）只能用於對應端點
+    if not payload or payload.get("purpose"):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired token",
@@ -72,12 +131,84 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    user = db.exec(select(User).where(User.email == email)).first()
+    user = _resolve_user(db, email)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
+    if _is_revoked(payload, user):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     return user
 
 
+def get_current_principal(
+    db: Session = Depends(get_session),
+    credentials: HTTPAuthorizationCredentials = Depends(security_scheme)
+) -> Principal:
+    """
+    取得目前用戶的輕量身分（唯讀端點用）
+
+    token 帶有 uid/ver 時，只比對快取中的 token 版本即可，不需載入 user；
+    其他 token 則退回 get_current_user（同樣檢查 token 版本）。
+    """
+    payload = decode_access_token(credentials.credentials)
+    if (
+        payload and not payload.get("purpose")
+        and payload.get("uid") is not None and "ver" in payload and payload.get("sub")
+    ):
+        if auth_cache.get_token_version(db, payload["uid"]) != payload["ver"]:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Token has been revoked",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        return Principal(
+            id=payload["uid"],
+            email=payload["sub"],
+            display_name=payload.get("name", ""),
+            avatar_url=payload.get("avatar"),
+        )
+    return Principal.from_user(get_current_user(db=db, credentials=credentials))
+
+
+def get_stream_principal(db: Session, ticket: str) -> Principal:
+    """
+    驗證串流票證並取得用戶身分（SSE 與 WebSocket 共用）
+
+    只接受 create_stream_ticket 簽發的票證，並比對 token 版本：
+    用戶登出所有裝置或重設密碼後，尚未過期的票證也一併失效。
+    """
+    payload = decode_access_token(ticket)
+    if (
+        not payload or payload.get("purpose") != STREAM_TICKET_PURPOSE
+        or payload.get("uid") is None or not payload.get("sub")
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired stream ticket",
+        )
+    if auth_cache.get_token_version(db, payload["uid"]) != payload.get("ver"):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked",
+        )
+    return Principal(
+        id=payload["uid"],
+        email=payload["sub"],
+        display_name=payload.get("name", ""),
+        avatar_url=payload.get("avatar"),
+    )
+
+
+def get_stream_ticket_principal(
+    ticket: str = Query(..., description="POST /auth/stream-ticket 取得的串流票證"),
+    db: Session = Depends(get_session)
+) -> Principal:
+    return get_stream_principal(db, ticket)
+
+
 
 def get_optional_current_user(
     db: Session = Depends(get_session),
@@ -89,11 +220,13 @@ def get_optional_current_user(
     token = credentials.credentials
     payload = decode_access_token(token)
     
-    if not payload or not payload.get("sub"):
+    if not payload or not payload.get("sub") or payload.get("purpose"):
         return None
         
     email = payload.get("sub")
-    user = db.exec(select(User).where(User.email == email)).first()
+    user = _resolve_user(db, email)
+    if user and _is_revoked(payload, user):
+        return None
     return user
 
 
@@ -104,23 +237,10 @@ def get_optional_current_user(
 
 def get_club_member(club_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_session)):
     user_id = current_user.id
-
-
-
-    print(f"Checking membership for user_id: {user_id} in club_id: {club_id}")
-
-
-
-    member = db.exec(select(BookClubMember).where(BookClubMember.book_club_id == club_id, BookClubMember.user_id == user_id)).first()
-
-
-
-    if not member:
-
-
-
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not a member of this club")
-
-
-
+    member = auth_cache.get_member(db, user_id, club_id)
+    if member is None:
+        member = db.exec(select(BookClubMember).where(BookClubMember.book_club_id == club_id, BookClubMember.user_id == user_id)).first()
+        if not member:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not a member of this club")
+        auth_cache.put_member(member)
     return member
@@ -0,0 +1,124 @@
+"""
+非同步資料庫存取（唯讀端點用）
+
+同步端點在 Starlette 預設 40 條執行緒的 thread pool 中執行，每個 worker 的
+同時請求數因此受限於執行緒數而非資料庫。設定 DB_ASYNC_READS=true 後，
+讀取量大的端點改用 asyncpg 的 AsyncSession：
+
+- 服務層維持同步寫法，由 AsyncSession.run_sync 以 greenlet 在 event loop 上執行，
+  等待資料庫時不占用執行緒；使用 SQLModel 的 AsyncSession，run_sync 傳入的
+  才是具有 exec() 的 sqlmodel.Session
+- 未啟用（預設，以及測試環境）時退回以 thread pool 執行同一個函式，使用
+  get_read_only_session 提供的同步 session
+
+兩種模式都會依 app.db.replicas 的設定改連唯讀複本。驗證用的依賴（get_current_principal
+等）仍為同步函式，在 thread pool 中執行。
+
+連線池設定與同步引擎相同（見 app.db.engine_config）。啟用時需安裝 asyncpg
+（SQLite 則為 aiosqlite）。
+"""
+import os
+from typing import AsyncIterator, Callable, Dict, Optional, TypeVar
+
+from fastapi import Depends
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from app.db.engine_config import EngineSettings, engine_kwargs
+from app.db.session import DATABASE_URL, get_read_only_session, get_session
+
+ASYNC_READS_ENABLED = os.getenv("DB_ASYNC_READS", "false").lower() == "true"
+
+# 同步 driver 對應的非同步 driver
+ASYNC_DRIVERS = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
+
+T = TypeVar("T")
+
+_async_engines: Dict[str, AsyncEngine] = {}
+
+
+def async_database_url(url: str) -> str:
+    """將同步連線 URL 轉為對應的非同步 driver"""
+    parsed = make_url(url)
+    drivername = ASYNC_DRIVERS.get(parsed.get_backend_name(), parsed.drivername)
+    return parsed.set(drivername=drivername).render_as_string(hide_password=False)
+
+
+def get_async_engine(url: str = DATABASE_URL) -> AsyncEngine:
+    """取得（必要時建立）指定資料庫的非同步引擎，預設為主資料庫"""
+    engine = _async_engines.get(url)
+    if engine is None:
+        settings = EngineSettings.from_env()
+        kwargs = engine_kwargs(url, settings)
+        connect_args = kwargs.pop("connect_args", None)
+        if connect_args:
+            # asyncpg 不支援 libpq 的 options 參數，改以 server_settings 設定
+            kwargs["connect_args"] = {
+                "server_settings": {"statement_timeout": str(settings.statement_timeout_ms)}
+            }
+        engine = _async_engines.setdefault(url, create_async_engine(async_database_url(url), **kwargs))
+    return engine
+
+
+async def get_async_session() -> AsyncIterator[AsyncSession]:
+    """
+    提供 AsyncSession 的依賴注入函式
+
+    Yields:
+        AsyncSession: 非同步資料庫 session（commit 後不使物件過期）
+    """
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        yield session
+
+
+class ReadSession:
+    """以同步服務函式讀取資料，依設定在 AsyncSession 或 thread pool 上執行"""
+
+    def __init__(self, session: Optional[Session] = None, async_session: Optional[AsyncSession] = None):
+        self.session = session
+        self.async_session = async_session
+
+    async def run(self, fn: Callable[..., T], *args, **kwargs) -> T:
+        """
+        執行 fn(session, *args, **kwargs)
+
+        fn 應回傳已序列化的結果（schema 或基本型別），不要回傳 ORM 物件，
+        因為 AsyncSession 在 run_sync 之外無法 lazy load。
+        """
+        if self.async_session is not None:
+            return await self.async_session.run_sync(fn, *args, **kwargs)
+        return await run_in_threadpool(fn, self.session, *args, **kwargs)
+
+
+async def _read_session(session: Session) -> AsyncIterator[ReadSession]:
+    if not ASYNC_READS_ENABLED:
+        yield ReadSession(session=session)
+        return
+    # 沿用同步 session 選定的資料庫（複本或主資料庫）
+    url = session.get_bind().url.render_as_string(hide_password=False)
+    async with AsyncSession(get_async_engine(url), expire_on_commit=False) as async_session:
+        yield ReadSession(async_session=async_session)
+
+
+async def get_read_session(session: Session = Depends(get_read_only_session)) -> AsyncIterator[ReadSession]:
+    """
+    提供唯讀端點使用的 ReadSession
+
+    同步 session 只在實際使用時才取得連線，啟用 DB_ASYNC_READS 時不會占用同步連線池。
+    """
+    async for read_session in _read_session(session):
+        yield read_session
+
+
+async def get_primary_read_session(session: Session = Depends(get_session)) -> AsyncIterator[ReadSession]:
+    """
+    提供一律讀取主資料庫的 ReadSession
+
+    供結果會寫入快取的唯讀端點使用：寫入後快取立即失效，若下一次讀取落在
+    延遲中的複本，會把舊資料重新快取整個 TTL。
+    """
+    async for read_session in _read_session(session):
+        yield read_session
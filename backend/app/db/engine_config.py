@@ -0,0 +1,101 @@
+"""
+資料庫引擎設定
+
+所有設定皆由環境變數讀取，預設值以正式環境為準：
+
+- DB_ECHO：是否記錄每一條 SQL（預設 false；同步寫 stdout 成本很高，只在除錯時開啟）
+- DB_POOL_SIZE / DB_MAX_OVERFLOW：每個 process 的常駐連線數與尖峰時可額外建立的連線數
+- DB_MAX_CONNECTIONS：整個服務可使用的連線上限；設定時依 WEB_CONCURRENCY（worker 數）
+  平均分配給每個 process，取代 DB_POOL_SIZE / DB_MAX_OVERFLOW
+- DB_POOL_TIMEOUT：等待可用連線的秒數
+- DB_POOL_RECYCLE：連線存活秒數，避免被資料庫或負載平衡器中斷的閒置連線
+- DB_POOL_PRE_PING：取出連線前先檢查是否仍可用
+- DB_STATEMENT_TIMEOUT_MS：單一 SQL 的執行時間上限（PostgreSQL，0 表示不限制）
+
+SQLite（測試環境）不使用連線池設定與 statement timeout。
+"""
+import os
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Optional
+
+from sqlalchemy.engine import Engine, make_url
+from sqlmodel import create_engine
+
+from app.core.logging_config import app_logger
+
+DEFAULT_DATABASE_URL = "postgresql://admin:password@db:5432/bookclub_dev"
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    return os.getenv(name, str(default)).lower() in ("1", "true", "yes")
+
+
+@dataclass(frozen=True)
+class EngineSettings:
+    """SQLAlchemy 引擎設定"""
+    echo: bool = False
+    pool_size: int = 10
+    max_overflow: int = 10
+    pool_timeout: float = 30
+    pool_recycle: int = 1800
+    pool_pre_ping: bool = True
+    statement_timeout_ms: int = 30000
+
+    @classmethod
+    def from_env(cls) -> "EngineSettings":
+        pool_size = int(os.getenv("DB_POOL_SIZE", str(cls.pool_size)))
+        max_overflow = int(os.getenv("DB_MAX_OVERFLOW", str(cls.max_overflow)))
+
+        max_connections = os.getenv("DB_MAX_CONNECTIONS")
+        if max_connections:
+            # 連線總數依 worker 數平均分配，其中一半常駐、一半作為尖峰額度
+            workers = max(1, int(os.getenv("WEB_CONCURRENCY", "1")))
+            per_process = max(2, int(max_connections) // workers)
+            pool_size = max(1, per_process // 2)
+            max_overflow = per_process - pool_size
+
+        return cls(
+            echo=_env_bool("DB_ECHO", cls.echo),
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=float(os.getenv("DB_POOL_TIMEOUT", str(cls.pool_timeout))),
+            pool_recycle=int(os.getenv("DB_POOL_RECYCLE", str(cls.pool_recycle))),
+            pool_pre_ping=_env_bool("DB_POOL_PRE_PING", cls.pool_pre_ping),
+            statement_timeout_ms=int(os.getenv("DB_STATEMENT_TIMEOUT_MS", str(cls.statement_timeout_ms))),
+        )
+
+
+def engine_kwargs(url: str, settings: EngineSettings) -> Dict[str, Any]:
+    """依資料庫種類產生 create_engine 參數"""
+    kwargs: Dict[str, Any] = {"echo": settings.echo}
+    backend = make_url(url).get_backend_name()
+    if backend == "sqlite":
+        return kwargs
+
+    kwargs.update(
+        pool_size=settings.pool_size,
+        max_overflow=settings.max_overflow,
+        pool_timeout=settings.pool_timeout,
+        pool_recycle=settings.pool_recycle,
+        pool_pre_ping=settings.pool_pre_ping,
+    )
+    if backend == "postgresql" and settings.statement_timeout_ms > 0:
+        kwargs["connect_args"] = {"options": f"-c statement_timeout={settings.statement_timeout_ms}"}
+    return kwargs
+
+
+def create_db_engine(url: Optional[str] = None, settings: Optional[EngineSettings] = None) -> Engine:
+    """建立資料庫引擎，並記錄實際生效的設定（不含密碼）"""
+    url = url or os.getenv("DATABASE_URL", DEFAULT_DATABASE_URL)
+    settings = settings or EngineSettings.from_env()
+    engine = create_engine(url, **engine_kwargs(url, settings))
+
+    effective = asdict(settings)
+    if make_url(url).get_backend_name() == "sqlite":
+        effective = {"echo": settings.echo}
+    app_logger.info(
+        "Database engine: %s %s",
+        make_url(url).render_as_string(hide_password=True),
+        " ".join(f"{key}={value}" for key, value in effective.items()),
+    )
+    return engine
@@ -0,0 +1,103 @@
+"""
+唯讀複本（read replica）路由
+
+唯讀端點（get_read_session / get_read_only_session）改由複本提供資料，
+寫入一律使用主資料庫（get_session）：
+
+- DATABASE_REPLICA_URLS：以逗號分隔的複本連線 URL，未設定時全部使用主資料庫
+- DB_REPLICA_MAX_LAG_SECONDS：可接受的複寫延遲（秒），超過時略過該複本
+- DB_REPLICA_CHECK_INTERVAL_SECONDS：延遲檢查的快取時間
+
+複本依序輪流使用（round-robin）；延遲過高或無法連線的複本會被略過，
+全部不可用時退回主資料庫。
+"""
+import itertools
+import math
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from app.core.logging_config import app_logger
+from app.db.engine_config import create_db_engine
+
+# 已追上主資料庫時延遲為 0；否則以最後一筆重播交易的時間估算
+POSTGRES_LAG_SQL = text("""
+    SELECT CASE
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+
+def default_lag_probe(engine: Engine) -> float:
+    """查詢複本的複寫延遲（秒）；非 PostgreSQL 視為沒有延遲"""
+    if engine.dialect.name != "postgresql":
+        return 0.0
+    with engine.connect() as connection:
+        return float(connection.execute(POSTGRES_LAG_SQL).scalar() or 0)
+
+
+class ReplicaRouter:
+    """以 round-robin 與延遲檢查選擇唯讀複本"""
+
+    def __init__(
+        self,
+        replicas: List[Engine],
+        max_lag_seconds: float = 5.0,
+        check_interval_seconds: float = 5.0,
+        lag_probe: Callable[[Engine], float] = default_lag_probe,
+    ):
+        self.replicas = replicas
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval_seconds = check_interval_seconds
+        self.lag_probe = lag_probe
+        self._cycle = itertools.cycle(range(len(replicas))) if replicas else None
+        self._lags: Dict[int, tuple] = {}
+        self._lock = threading.Lock()
+
+    def lag(self, index: int) -> float:
+        """取得複本延遲（快取 check_interval_seconds 秒），無法連線時回傳無限大"""
+        now = time.monotonic()
+        cached = self._lags.get(index)
+        if cached is not None and now - cached[0] < self.check_interval_seconds:
+            return cached[1]
+        engine = self.replicas[index]
+        try:
+            lag = self.lag_probe(engine)
+        except Exception:
+            app_logger.warning("Replica %s is unavailable, skipping", engine.url, exc_info=True)
+            lag = math.inf
+        self._lags[index] = (now, lag)
+        return lag
+
+    def choose(self) -> Optional[Engine]:
+        """
+        選擇下一個可用複本
+
+        Returns:
+            Optional[Engine]: 複本引擎；沒有可用複本時回傳 None（改用主資料庫）
+        """
+        if not self.replicas:
+            return None
+        with self._lock:
+            start = next(self._cycle)
+        for offset in range(len(self.replicas)):
+            index = (start + offset) % len(self.replicas)
+            if self.lag(index) <= self.max_lag_seconds:
+                return self.replicas[index]
+        app_logger.warning("No replica within %ss lag, reading from primary", self.max_lag_seconds)
+        return None
+
+
+def create_replica_router() -> ReplicaRouter:
+    """依環境變數建立 ReplicaRouter"""
+    urls = [url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+    return ReplicaRouter(
+        [create_db_engine(url) for url in urls],
+        max_lag_seconds=float(os.getenv("DB_REPLICA_MAX_LAG_SECONDS", "5")),
+        check_interval_seconds=float(os.getenv("DB_REPLICA_CHECK_INTERVAL_SECONDS", "5")),
+    )
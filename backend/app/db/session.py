@@ -1,12 +1,16 @@
 import os
-from sqlmodel import Session, create_engine
+from fastapi import Depends
+from sqlmodel import Session
 from typing import Generator
 
+from app.db.engine_config import DEFAULT_DATABASE_URL, create_db_engine
+from app.db.replicas import create_replica_router
+
 # 從環境變數獲取資料庫 URL
-DATABASE_URL = os.getenv("DATABASE_URL", "postgresql://admin:password@db:5432/bookclub_dev")
+DATABASE_URL = os.getenv("DATABASE_URL", DEFAULT_DATABASE_URL)
 
-# 建立資料庫引擎
-engine = create_engine(DATABASE_URL, echo=True)
+# 建立資料庫引擎（連線池、echo 等設定見 app.db.engine_config）
+engine = create_db_engine(DATABASE_URL)
 
 def get_session() -> Generator[Session, None, None]:
     """
@@ -17,3 +21,21 @@ def get_session() -> Generator[Session, None, None]:
     """
     with Session(engine) as session:
         yield session
+
+
+# 唯讀複本（DATABASE_REPLICA_URLS 未設定時不使用）
+replica_router = create_replica_router()
+
+def get_read_only_session(session: Session = Depends(get_session)) -> Generator[Session, None, None]:
+    """
+    提供唯讀 session 的依賴注入函式：有可用複本時連線至複本，否則沿用主資料庫 session
+    
+    Yields:
+        Session: SQLModel 資料庫 session（不可用於寫入）
+    """
+    replica = replica_router.choose()
+    if replica is None:
+        yield session
+        return
+    with Session(replica) as replica_session:
+        yield replica_session
@@ -1,16 +1,31 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
 from app.api.api import api_router
 from app.models.user import UserProfileRead
 from app.models.interest_tag import InterestTagRead
 from app.core.logging_middleware import LoggingMiddleware
 from app.core.logging_config import app_logger
+from app.core.password_hasher import password_hasher
+from app.services.scheduled_jobs import create_scheduler
 import os
 import re
 
-app = FastAPI(title="Book Club API")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """啟動與停止背景排程工作（可用 ENABLE_SCHEDULER=false 關閉），結束時關閉密碼雜湊 process pool"""
+    scheduler = None
+    if os.getenv("ENABLE_SCHEDULER", "true").lower() == "true":
+        scheduler = create_scheduler()
+        scheduler.start()
+    yield
+    if scheduler:
+        await scheduler.stop()
+    password_hasher.shutdown()
+
+
+app = FastAPI(title="Book Club API", lifespan=lifespan)
 
 # 初始化日誌
 app_logger.info("🚀 Starting Book Club API application...")
@@ -57,24 +72,22 @@ def is_allowed_origin(origin: str) -> bool:
         ]
         for pattern in vercel_patterns:
             if re.match(pattern, origin):
-                print(f"✅ Matched Vercel origin: {origin}")
                 return True
     
     # 開發模式：允許所有 Vercel preview deployments（僅用於測試）
     if os.getenv("ALLOW_ALL_VERCEL", "false").lower() == "true":
         vercel_pattern = r"^https://.*\.vercel\.app$"
         if re.match(vercel_pattern, origin):
-            print(f"⚠️ Allowed Vercel preview (dev mode): {origin}")
             return True
     
-    print(f"❌ Rejected origin: {origin}")
     return False
 
 # 決定是否使用萬用字元（當設定 Vercel 或 dev mode 時）
 use_wildcard = bool(vercel_project_name) or os.getenv("ALLOW_ALL_VERCEL", "false").lower() == "true"
 
 # 添加日誌中間件（在 CORS 之前）
-app.add_middleware(LoggingMiddleware)
+# 使用萬用字元時由日誌中間件檢查來源：不在允許清單的來源會被記錄（請求仍由 CORS middleware 處理）
+app.add_middleware(LoggingMiddleware, origin_validator=is_allowed_origin if use_wildcard else None)
 
 app.add_middleware(
     CORSMiddleware,
@@ -84,19 +97,6 @@ app.add_middleware(
     allow_headers=["*"],     # 允許所有 headers
 )
 
-# 如果使用萬用字元，加入自訂驗證中間件
-if use_wildcard:
-    class CORSValidationMiddleware(BaseHTTPMiddleware):
-        async def dispatch(self, request: Request, call_next):
-            origin = request.headers.get("origin")
-            if origin and not is_allowed_origin(origin):
-                # 記錄被拒絕的來源（但仍允許請求通過，由 CORS middleware 處理）
-                print(f"⚠️ Warning: Unexpected origin: {origin}")
-            response = await call_next(request)
-            return response
-    
-    app.add_middleware(CORSValidationMiddleware)
-
 # API 路由
 app.include_router(api_router, prefix="/api/v1")
 
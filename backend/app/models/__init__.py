@@ -2,12 +2,14 @@ from .user import User, UserBase, UserCreate, UserRead
 from .book_club import BookClub, BookClubVisibility, BookClubCreate, BookClubRead
 from .book_club_member import BookClubMember, MemberRole
 from .discussion import DiscussionTopic, DiscussionComment
-from .notification import Notification, NotificationType
+from .notification import Notification, NotificationArchive, NotificationType
 from .interest_tag import InterestTag, UserInterestTag
 from .club_tag import ClubTag, ClubTagRead, ClubTagCreate, BookClubTagLink
 from .club_join_request import ClubJoinRequest
 from .event import (
     Event, EventParticipant, EventStatus, ParticipantStatus, 
     EventCreate, EventRead, EventUpdate,
-    EventListItem, EventListResponse, PaginationMetadata, OrganizerInfo
-)
\ No newline at end of file
+    EventListItem, EventListResponse, PaginationMetadata, CursorPaginationMetadata, OrganizerInfo
+)
+# 註冊計數欄位維護 hook（需在所有 model 載入後）
+from . import club_counters, notification_counters
@@ -29,6 +29,12 @@ class BookClub(SQLModel, table=True):
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
     
+    # 反正規化計數欄位（由 app.models.club_counters 在同一交易中維護）
+    member_count: int = Field(default=0)
+    # 已發布且尚未轉為 COMPLETED（含時間已過、尚未被排程處理的活動）
+    published_event_count: int = Field(default=0)
+    completed_event_count: int = Field(default=0)
+    
     # Relationships
     owner: "User" = Relationship(back_populates="owned_clubs")
     members: List["BookClubMember"] = Relationship(back_populates="book_club")
@@ -0,0 +1,95 @@
+# backend/app/models/club_counters.py
+"""
+讀書會反正規化計數欄位的維護
+
+BookClub.member_count 與活動計數欄位在 BookClubMember / Event 的 flush 時
+以 `UPDATE bookclub SET x = x + :delta` 原子更新，與原本的寫入處於同一交易，
+因此 join/leave、審核加入、移除成員與活動的新增/修改/刪除都會自動同步。
+批次 UPDATE/DELETE 不會觸發這些 hook，需自行以 apply_counter_deltas 調整，
+或呼叫 app.services.club_counter_service.reconcile_club_counters 校正。
+
+published_event_count 是「已發布且尚未轉為 COMPLETED」的活動數，並不等於即將
+舉行的活動數：活動時間已過、但背景排程（complete_expired_events）尚未處理的
+活動仍計入其中。需要「即將舉行」的讀取端應扣除 status = PUBLISHED 且
+event_datetime 已過的活動（見 dashboard_service.get_user_dashboard）。
+"""
+from typing import Dict, Optional
+
+from sqlalchemy import event, inspect
+
+from .book_club import BookClub
+from .book_club_member import BookClubMember
+from .event import Event, EventStatus
+
+EVENT_COUNTER_COLUMNS = ("published_event_count", "completed_event_count")
+
+
+def event_counter_buckets(status: Optional[EventStatus]) -> Dict[str, int]:
+    """計算單一活動對各活動計數欄位的貢獻（0 或 1）"""
+    return {
+        "published_event_count": int(status == EventStatus.PUBLISHED),
+        "completed_event_count": int(status == EventStatus.COMPLETED),
+    }
+
+
+def apply_counter_deltas(connection, club_id: Optional[int], deltas: Dict[str, int]) -> None:
+    """以單一 UPDATE 對讀書會計數欄位加減"""
+    deltas = {column: delta for column, delta in deltas.items() if delta}
+    if not deltas or club_id is None:
+        return
+    table = BookClub.__table__
+    connection.execute(
+        table.update()
+        .where(table.c.id == club_id)
+        .values({column: table.c[column] + delta for column, delta in deltas.items()})
+    )
+
+
+def _previous_value(target, attribute: str):
+    """取得 flush 前的屬性值（未變更時即為目前值）"""
+    history = inspect(target).attrs[attribute].history
+    if history.deleted:
+        return history.deleted[0]
+    return getattr(target, attribute)
+
+
+def _keep_previous_value(target, value, oldvalue, initiator):
+    return value
+
+
+# 覆寫已過期（例如 commit 後）的屬性時也先載入舊值，after_update 才能取得變更前的狀態
+for _attribute in (Event.status, Event.club_id):
+    event.listen(_attribute, "set", _keep_previous_value, active_history=True)
+
+
+@event.listens_for(BookClubMember, "after_insert")
+def _member_inserted(mapper, connection, target: BookClubMember) -> None:
+    apply_counter_deltas(connection, target.book_club_id, {"member_count": 1})
+
+
+@event.listens_for(BookClubMember, "after_delete")
+def _member_deleted(mapper, connection, target: BookClubMember) -> None:
+    apply_counter_deltas(connection, target.book_club_id, {"member_count": -1})
+
+
+@event.listens_for(Event, "after_insert")
+def _event_inserted(mapper, connection, target: Event) -> None:
+    apply_counter_deltas(connection, target.club_id, event_counter_buckets(target.status))
+
+
+@event.listens_for(Event, "after_delete")
+def _event_deleted(mapper, connection, target: Event) -> None:
+    buckets = event_counter_buckets(target.status)
+    apply_counter_deltas(connection, target.club_id, {column: -value for column, value in buckets.items()})
+
+
+@event.listens_for(Event, "after_update")
+def _event_updated(mapper, connection, target: Event) -> None:
+    old = event_counter_buckets(_previous_value(target, "status"))
+    new = event_counter_buckets(target.status)
+    old_club_id = _previous_value(target, "club_id")
+    if old_club_id != target.club_id:
+        apply_counter_deltas(connection, old_club_id, {column: -value for column, value in old.items()})
+        apply_counter_deltas(connection, target.club_id, new)
+        return
+    apply_counter_deltas(connection, target.club_id, {column: new[column] - old[column] for column in new})
@@ -1,5 +1,6 @@
 from typing import List, Optional
 from datetime import datetime
+from sqlalchemy import Index, text
 from sqlmodel import Field, SQLModel, Relationship
 from .user import User
 
@@ -10,10 +11,22 @@ class DiscussionTopicBase(SQLModel):
 from .book_club import BookClub
 
 class DiscussionTopic(DiscussionTopicBase, table=True):
+    # 主題列表依最後活動時間由新到舊分頁
+    __table_args__ = (
+        Index(
+            "ix_discussiontopic_club_id_last_activity_at",
+            "club_id", text("last_activity_at DESC"), text("id DESC")
+        ),
+    )
+    
     id: Optional[int] = Field(default=None, primary_key=True)
     club_id: int = Field(foreign_key="bookclub.id")
     owner_id: int = Field(foreign_key="user.id")
     comment_count: int = Field(default=0)
+    # 反正規化的最後活動資訊（建立主題或新增回覆時更新，見 discussion_service.create_comment）
+    last_activity_at: datetime = Field(default_factory=datetime.utcnow)
+    # 最新一筆回覆 ID（不設外鍵，避免與 discussioncomment 互相參照）
+    last_comment_id: Optional[int] = Field(default=None)
     
     author: User = Relationship(back_populates="threads")
     comments: List["DiscussionComment"] = Relationship(back_populates="topic")
@@ -23,6 +36,11 @@ class DiscussionCommentBase(SQLModel):
     content: str
 
 class DiscussionComment(DiscussionCommentBase, table=True):
+    # 回覆依 (created_at, id) 游標分頁
+    __table_args__ = (
+        Index("ix_discussioncomment_topic_id_created_at_id", "topic_id", "created_at", "id"),
+    )
+    
     id: Optional[int] = Field(default=None, primary_key=True)
     topic_id: int = Field(foreign_key="discussiontopic.id")
     owner_id: int = Field(foreign_key="user.id")
@@ -1,4 +1,4 @@
-from typing import List, Optional, TYPE_CHECKING, Annotated
+from typing import List, Optional, TYPE_CHECKING, Annotated, Union
 from datetime import datetime, timezone, timedelta
 from sqlmodel import Field as SQLField, SQLModel, Relationship
 from enum import Enum
@@ -205,7 +205,17 @@ class PaginationMetadata(BaseModel):
     total_pages: Annotated[int, Field(serialization_alias="totalPages")]
 
 
+class CursorPaginationMetadata(BaseModel):
+    """游標分頁元資料（totalItems 僅在要求時計算）"""
+    model_config = ConfigDict(populate_by_name=True)
+    
+    page_size: Annotated[int, Field(serialization_alias="pageSize")]
+    next_cursor: Annotated[Optional[str], Field(default=None, serialization_alias="nextCursor")]
+    has_next: Annotated[bool, Field(serialization_alias="hasNext")]
+    total_items: Annotated[Optional[int], Field(default=None, serialization_alias="totalItems")]
+
+
 class EventListResponse(BaseModel):
     """活動列表回應 schema"""
     items: List[EventListItem]
-    pagination: PaginationMetadata
+    pagination: Union[PaginationMetadata, CursorPaginationMetadata]
@@ -1,4 +1,5 @@
 from typing import Optional
+from sqlalchemy import Index, event
 from sqlmodel import Field, SQLModel, Relationship, JSON, Column
 from enum import Enum
 from datetime import datetime
@@ -12,11 +13,46 @@ class NotificationType(str, Enum):
     EVENT_CREATED = "EVENT_CREATED"
 
 class Notification(SQLModel, table=True):
+    # 通知列表一律依 recipient_id（與可選的 is_read）篩選並依 id 倒序排序
+    __table_args__ = (
+        Index("ix_notification_recipient_id_is_read_id", "recipient_id", "is_read", "id"),
+    )
+    
     id: Optional[int] = Field(default=None, primary_key=True)
     content: dict = Field(sa_column=Column(JSON))
     type: NotificationType = Field(max_length=50)
     is_read: bool = Field(default=False)
     created_at: datetime = Field(default_factory=datetime.utcnow)
     
+    # 由 content["club_id"] 抽出的讀書會 ID，供權限過濾 JOIN bookclubmember 使用
+    # （不設外鍵：讀書會刪除後通知仍保留，只是不再可見）
+    club_id: Optional[int] = Field(default=None, index=True)
+    
     recipient_id: int = Field(foreign_key="user.id")
-    recipient: "User" = Relationship(back_populates="notifications")
\ No newline at end of file
+    recipient: "User" = Relationship(back_populates="notifications")
+
+
+class NotificationArchive(SQLModel, table=True):
+    """
+    已封存的通知（由保留期限工作從 notification 批次搬移，保持熱資料表精簡）
+    """
+    __tablename__ = "notification_archive"
+    
+    # 沿用原通知 ID，因此不自動遞增
+    id: int = Field(primary_key=True, sa_column_kwargs={"autoincrement": False})
+    content: dict = Field(sa_column=Column(JSON))
+    type: NotificationType = Field(max_length=50)
+    is_read: bool = Field(default=True)
+    created_at: datetime
+    club_id: Optional[int] = Field(default=None)
+    recipient_id: int = Field(index=True)
+    archived_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+@event.listens_for(Notification, "before_insert")
+def _extract_club_id(mapper, connection, target: Notification) -> None:
+    """未指定 club_id 時由 content 抽出"""
+    if target.club_id is None and isinstance(target.content, dict):
+        club_id = target.content.get("club_id")
+        if club_id is not None:
+            target.club_id = int(club_id)
\ No newline at end of file
@@ -0,0 +1,136 @@
+# backend/app/models/notification_counters.py
+"""
+用戶未讀通知計數（User.unread_notification_count）的維護
+
+Notification 經 ORM 新增、刪除或變更 is_read 時，在同一個 flush 中以
+`UPDATE user SET unread_notification_count = unread_notification_count + :delta`
+原子更新。批次寫入（notify_event_created 的 INSERT ... SELECT、全部標記已讀）
+不會觸發 hook，由 app.services.notification_service 自行調整計數。
+
+計數只包含用戶「看得到」的未讀通知，與通知列表使用同一組可見條件
+（visible_to）：讀書會活動通知需為成員，加入請求通知需為擁有者或管理員。
+退出、被移除或角色變更會改變可見範圍，因此 BookClubMember 的新增、刪除與
+角色變更會以可見條件重新計算該用戶的計數（成員異動不頻繁，且只掃描該用戶
+的未讀通知）。
+
+標記已讀一律以 `WHERE is_read = false` 的 UPDATE 進行，依實際變更的列扣減計數，
+並行的單筆與全部標記已讀不會重複扣減；全部標記已讀只標記可見的通知，單筆
+標記看不到的通知時不扣減。
+"""
+from typing import Optional
+
+from sqlalchemy import and_, case, event, func, inspect, or_, select
+
+from .book_club_member import BookClubMember, MemberRole
+from .notification import Notification, NotificationType
+from .user import User
+
+
+def visible_to(query, user_id: int):
+    """
+    將查詢限制為用戶有權限查看的通知（LEFT JOIN bookclubmember (club_id, user_id)）
+
+    - NEW_MEMBER：用戶需為該讀書會的擁有者或管理員
+    - EVENT_CREATED：用戶需為該讀書會成員
+    - 其他類型：一律可見
+    """
+    return (
+        query
+        .outerjoin(
+            BookClubMember,
+            and_(
+                BookClubMember.book_club_id == Notification.club_id,
+                BookClubMember.user_id == user_id
+            )
+        )
+        .where(
+            Notification.recipient_id == user_id,
+            or_(
+                Notification.type.not_in([NotificationType.NEW_MEMBER, NotificationType.EVENT_CREATED]),
+                and_(
+                    Notification.type == NotificationType.NEW_MEMBER,
+                    BookClubMember.role.in_([MemberRole.OWNER, MemberRole.ADMIN])
+                ),
+                and_(
+                    Notification.type == NotificationType.EVENT_CREATED,
+                    BookClubMember.user_id.is_not(None)
+                )
+            )
+        )
+    )
+
+
+def apply_unread_delta(connection, user_id: Optional[int], delta: int) -> None:
+    """以單一 UPDATE 調整用戶的未讀通知數（減少時不低於 0）"""
+    if not delta or user_id is None:
+        return
+    table = User.__table__
+    value = table.c.unread_notification_count + delta
+    if delta < 0:
+        value = case((value < 0, 0), else_=value)
+    connection.execute(
+        table.update()
+        .where(table.c.id == user_id)
+        .values(unread_notification_count=value)
+    )
+
+
+def recount_unread(connection, user_id: Optional[int]) -> None:
+    """以可見條件重新計算用戶的未讀通知數（單一 UPDATE ... SET = (SELECT count)）"""
+    if user_id is None:
+        return
+    table = User.__table__
+    visible_unread = visible_to(
+        select(func.count(Notification.id)).where(Notification.is_read.is_(False)), user_id
+    ).scalar_subquery()
+    connection.execute(
+        table.update()
+        .where(table.c.id == user_id)
+        .values(unread_notification_count=visible_unread)
+    )
+
+
+def _previous_is_read(target: Notification) -> bool:
+    history = inspect(target).attrs.is_read.history
+    if history.deleted:
+        return bool(history.deleted[0])
+    return bool(target.is_read)
+
+
+def _keep_previous_value(target, value, oldvalue, initiator):
+    return value
+
+
+# 覆寫已過期的 is_read 時也先載入舊值，after_update 才能判斷是否真的由未讀變已讀
+event.listen(Notification.is_read, "set", _keep_previous_value, active_history=True)
+
+
+@event.listens_for(Notification, "after_insert")
+def _notification_inserted(mapper, connection, target: Notification) -> None:
+    if not target.is_read:
+        apply_unread_delta(connection, target.recipient_id, 1)
+
+
+@event.listens_for(Notification, "after_delete")
+def _notification_deleted(mapper, connection, target: Notification) -> None:
+    if not target.is_read:
+        apply_unread_delta(connection, target.recipient_id, -1)
+
+
+@event.listens_for(Notification, "after_update")
+def _notification_updated(mapper, connection, target: Notification) -> None:
+    was_unread = not _previous_is_read(target)
+    is_unread = not target.is_read
+    apply_unread_delta(connection, target.recipient_id, int(is_unread) - int(was_unread))
+
+
+@event.listens_for(BookClubMember, "after_insert")
+@event.listens_for(BookClubMember, "after_delete")
+def _membership_changed(mapper, connection, target: BookClubMember) -> None:
+    recount_unread(connection, target.user_id)
+
+
+@event.listens_for(BookClubMember, "after_update")
+def _membership_updated(mapper, connection, target: BookClubMember) -> None:
+    if inspect(target).attrs.role.history.has_changes():
+        recount_unread(connection, target.user_id)
@@ -40,6 +40,12 @@ class User(UserBase, table=True):
     email_verification_token: Optional[str] = Field(default=None, max_length=255, index=True)
     email_verification_token_expires_at: Optional[datetime] = Field(default=None)
     
+    # 反正規化的未讀通知數（由 app.models.notification_counters 維護）
+    unread_notification_count: int = Field(default=0)
+    
+    # JWT 版本號：重設密碼或停用帳號時遞增，使先前簽發的 token 失效
+    token_version: int = Field(default=0)
+    
     # Relationships
     owned_clubs: List["BookClub"] = Relationship(back_populates="owner")
     memberships: List["BookClubMember"] = Relationship(back_populates="user")
@@ -118,6 +124,11 @@ class Token(SQLModel):
 class TokenWithUser(Token):
     user: UserRead
 
+class StreamTicket(SQLModel):
+    """串流票證回應 schema（SSE / WebSocket 連線用）"""
+    ticket: str
+    expires_in: int
+
 class GoogleLoginRequest(SQLModel):
     """Google OAuth 登入請求"""
     id_token: str
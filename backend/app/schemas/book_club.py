@@ -3,7 +3,7 @@
 讀書會相關的複合型 schemas
 包含需要 join 多個表或包含額外業務邏輯的 schemas
 """
-from typing import List, Optional
+from typing import List, Optional, Union
 from datetime import datetime
 from sqlmodel import SQLModel, Field
 from pydantic import BaseModel
@@ -12,7 +12,7 @@ from app.models.book_club import BookClubVisibility
 from app.models.club_tag import ClubTagRead
 from app.models.user import UserRead
 from app.models.book_club_member import MembershipStatus
-from app.schemas.pagination import PaginationMeta
+from app.schemas.pagination import PaginationMeta, CursorPaginationMeta
 
 
 class BookClubReadWithDetails(SQLModel):
@@ -47,9 +47,9 @@ class BookClubListItem(SQLModel):
 
 
 class PaginatedBookClubList(BaseModel):
-    """分頁讀書會列表"""
+    """分頁讀書會列表（頁碼分頁或游標分頁）"""
     items: List[BookClubReadWithDetails]
-    pagination: PaginationMeta
+    pagination: Union[PaginationMeta, CursorPaginationMeta]
 
 
 class BookClubUpdate(SQLModel):
@@ -3,6 +3,7 @@ from datetime import datetime
 from sqlmodel import SQLModel
 from pydantic import Field
 from app.models.user import UserRead
+from app.schemas.pagination import CursorPaginationMeta, PageOnlyPaginationMeta
 
 # Base properties for a comment
 class DiscussionCommentBase(SQLModel):
@@ -37,6 +38,8 @@ class DiscussionTopicRead(DiscussionTopicBase):
     owner_id: int
     author: Optional[UserRead] = Field(default=None, validation_alias="author", serialization_alias="author")
     comment_count: int
+    last_activity_at: Optional[datetime] = None
+    last_comment_id: Optional[int] = None
     
     class Config:
         populate_by_name = True
@@ -45,3 +48,29 @@ class DiscussionTopicRead(DiscussionTopicBase):
 # Schema for reading a topic with all its comments
 class DiscussionTopicReadWithComments(DiscussionTopicRead):
     comments: List[DiscussionCommentRead] = []
+    # 指定 comment_limit 時，後續回覆的游標（見 GET .../comments）
+    comments_next_cursor: Optional[str] = None
+
+# Schema for a cursor-paginated page of topics
+class DiscussionTopicPage(SQLModel):
+    items: List[DiscussionTopicRead]
+    pagination: CursorPaginationMeta
+
+# Schema for a cursor-paginated page of comments
+class DiscussionCommentPage(SQLModel):
+    items: List[DiscussionCommentRead]
+    pagination: CursorPaginationMeta
+
+# Schema for a single discussion search hit (topic or comment)
+class DiscussionSearchHit(SQLModel):
+    type: str
+    topic_id: int
+    comment_id: Optional[int] = None
+    title: str
+    snippet: str
+    rank: float
+
+# Schema for ranked, paginated discussion search results
+class DiscussionSearchResults(SQLModel):
+    items: List[DiscussionSearchHit]
+    pagination: PageOnlyPaginationMeta
@@ -0,0 +1,29 @@
+from datetime import datetime
+
+from pydantic import BaseModel, field_serializer
+
+from app.models.notification import NotificationType
+
+
+class NotificationRead(BaseModel):
+    id: int
+    type: NotificationType
+    content: dict
+    is_read: bool
+    created_at: datetime
+    recipient_id: int
+    
+    @field_serializer('created_at')
+    def serialize_created_at(self, dt: datetime, _info):
+        """Serialize datetime to ISO format with Z suffix (UTC)"""
+        if dt.tzinfo is None:
+            # If datetime is naive (no timezone), treat it as UTC
+            return dt.isoformat() + 'Z'
+        return dt.isoformat()
+    
+    class Config:
+        from_attributes = True
+
+
+class UnreadCountRead(BaseModel):
+    unread_count: int
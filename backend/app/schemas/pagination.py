@@ -1,4 +1,6 @@
 # backend/app/schemas/pagination.py
+from typing import Optional
+
 from pydantic import BaseModel
 
 
@@ -10,3 +12,19 @@ class PaginationMeta(BaseModel):
     total_pages: int
     has_next: bool
     has_previous: bool
+
+
+class CursorPaginationMeta(BaseModel):
+    """游標分頁資訊（total_items 僅在要求時計算）"""
+    page_size: int
+    next_cursor: Optional[str] = None
+    has_next: bool
+    total_items: Optional[int] = None
+
+
+class PageOnlyPaginationMeta(BaseModel):
+    """頁碼分頁資訊，不計算總筆數（用於計數成本與查詢本身相當的搜尋）"""
+    page: int
+    page_size: int
+    has_next: bool
+    has_previous: bool
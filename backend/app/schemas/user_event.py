@@ -1,8 +1,8 @@
-from typing import Optional, List
+from typing import Optional, List, Union
 from datetime import datetime, timezone, timedelta
 from pydantic import BaseModel, Field, field_serializer
 from app.models.event import EventStatus
-from app.schemas.pagination import PaginationMeta
+from app.schemas.pagination import PaginationMeta, CursorPaginationMeta
 
 # UTC+8 時區
 UTC_PLUS_8 = timezone(timedelta(hours=8))
@@ -43,4 +43,4 @@ class UserEventRead(BaseModel):
 class PaginatedUserEventList(BaseModel):
     """分頁使用者活動列表"""
     items: List[UserEventRead]
-    pagination: PaginationMeta
+    pagination: Union[PaginationMeta, CursorPaginationMeta]
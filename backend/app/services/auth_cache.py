@@ -0,0 +1,211 @@
+# backend/app/services/auth_cache.py
+"""
+已驗證用戶與讀書會成員身分快取
+
+get_current_user 每次請求都要以 JWT 的 email 查詢 user，get_club_member
+再查一次成員資格。此模組以短 TTL 快取兩者的欄位值：
+
+- user:{email} → 驗證與 Principal 需要的 User 欄位（_CACHED_COLUMNS；不含密碼
+  雜湊、驗證 token、登入鎖定等敏感欄位）
+- member:{user_id}:{club_id} → BookClubMember 欄位（只快取「是成員」的結果）
+- token_version:{user_id} → User.token_version（JWT 撤銷檢查用）
+
+命中時以快取值重建物件並以 detached 狀態加入目前的 session，不需查詢，
+之後的修改與 commit 與一般查詢取得的物件相同；未快取的欄位標為過期，
+存取時才從資料庫載入。
+
+User 與 BookClubMember 的 ORM 新增、修改、刪除（個人檔案更新、停用帳號、
+重設密碼、加入/退出讀書會、ClubManagementService 的角色變更與移除成員等）
+由 mapper event 使對應的 key 失效，並在 commit 後再失效一次，避免其他請求
+在 flush 與 commit 之間寫回舊值。
+"""
+import json
+import os
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, Optional, Tuple, Type, TypeVar
+
+import sqlalchemy as sa
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session as OrmSession, make_transient_to_detached, object_session
+from sqlmodel import Session, SQLModel, select
+
+from app.core.cache import CacheBackend, create_cache_backend
+from app.models.book_club_member import BookClubMember
+from app.models.user import User
+
+# 快取存活時間（秒），設為 0 可停用快取
+AUTH_CACHE_TTL_SECONDS = float(os.getenv("AUTH_CACHE_TTL_SECONDS", "30"))
+
+_PENDING_KEYS = "auth_cache_pending_keys"
+
+ModelT = TypeVar("ModelT", bound=SQLModel)
+
+# 各 model 要快取的欄位，未列出的 model 快取全部欄位
+_CACHED_COLUMNS: Dict[type, Tuple[str, ...]] = {
+    User: ("id", "email", "display_name", "avatar_url", "is_active", "email_verified", "token_version"),
+}
+
+_backend: Optional[CacheBackend] = None
+
+
+def get_backend() -> CacheBackend:
+    global _backend
+    if _backend is None:
+        _backend = create_cache_backend()
+    return _backend
+
+
+def set_backend(backend: CacheBackend) -> None:
+    """替換快取後端（例如改用共用的 Redis 相容服務，讓失效跨 worker 生效）"""
+    global _backend
+    _backend = backend
+
+
+def _user_key(email: str) -> str:
+    return f"user:{email}"
+
+
+def _member_key(user_id: int, club_id: int) -> str:
+    return f"member:{user_id}:{club_id}"
+
+
+def _token_version_key(user_id: int) -> str:
+    return f"token_version:{user_id}"
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Cannot cache value of type {type(value).__name__}")
+
+
+def _cached_columns(model: Type[SQLModel]) -> Tuple[str, ...]:
+    columns = _CACHED_COLUMNS.get(model)
+    if columns is None:
+        columns = tuple(column.key for column in model.__table__.columns)
+    return columns
+
+
+def _dump(obj: SQLModel) -> str:
+    return json.dumps({key: getattr(obj, key) for key in _cached_columns(type(obj))}, default=_encode)
+
+
+def _load(session: Session, model: Type[ModelT], cached: str) -> ModelT:
+    values: Dict[str, Any] = json.loads(cached)
+    for column in model.__table__.columns:
+        if column.key not in values:
+            continue
+        value = values[column.key]
+        if value is None:
+            continue
+        if isinstance(column.type, sa.DateTime):
+            values[column.key] = datetime.fromisoformat(value)
+        elif isinstance(column.type, sa.Enum) and column.type.enum_class is not None:
+            values[column.key] = column.type.enum_class(value)
+
+    obj = model(**values)
+    # 視為已從資料庫載入的物件：不產生 INSERT，也不會把快取值當成修改寫回
+    make_transient_to_detached(obj)
+    existing = session.identity_map.get(inspect(obj).key)
+    if existing is not None:
+        return existing
+    session.add(obj)
+    # 未快取的欄位在建構時填入的是預設值，標為過期以便存取時從資料庫載入
+    uncached = [column.key for column in model.__table__.columns if column.key not in values]
+    if uncached:
+        session.expire(obj, uncached)
+    return obj
+
+
+def get_user(session: Session, email: str) -> Optional[User]:
+    """從快取取得 User（附加到 session），未命中回傳 None"""
+    if AUTH_CACHE_TTL_SECONDS <= 0:
+        return None
+    cached = get_backend().get(_user_key(email))
+    if cached is None:
+        return None
+    return _load(session, User, cached)
+
+
+def put_user(user: User) -> None:
+    if AUTH_CACHE_TTL_SECONDS <= 0:
+        return
+    get_backend().set(_user_key(user.email), _dump(user), AUTH_CACHE_TTL_SECONDS)
+
+
+def get_member(session: Session, user_id: int, club_id: int) -> Optional[BookClubMember]:
+    """從快取取得成員資格（附加到 session），未命中回傳 None"""
+    if AUTH_CACHE_TTL_SECONDS <= 0:
+        return None
+    cached = get_backend().get(_member_key(user_id, club_id))
+    if cached is None:
+        return None
+    return _load(session, BookClubMember, cached)
+
+
+def put_member(member: BookClubMember) -> None:
+    if AUTH_CACHE_TTL_SECONDS <= 0:
+        return
+    get_backend().set(_member_key(member.user_id, member.book_club_id), _dump(member), AUTH_CACHE_TTL_SECONDS)
+
+
+def get_token_version(session: Session, user_id: int) -> Optional[int]:
+    """
+    取得用戶目前的 token 版本（撤銷檢查用），用戶不存在時回傳 None
+
+    版本號以主鍵查詢後快取，User 更新時隨其他 key 一併失效。
+    """
+    if AUTH_CACHE_TTL_SECONDS > 0:
+        cached = get_backend().get(_token_version_key(user_id))
+        if cached is not None:
+            return int(cached)
+    version = session.exec(select(User.token_version).where(User.id == user_id)).first()
+    if version is not None and AUTH_CACHE_TTL_SECONDS > 0:
+        get_backend().set(_token_version_key(user_id), str(version), AUTH_CACHE_TTL_SECONDS)
+    return version
+
+
+def clear() -> None:
+    get_backend().clear()
+
+
+def _invalidate(target: SQLModel, *keys: str) -> None:
+    get_backend().delete_many(keys)
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_PENDING_KEYS, set()).update(keys)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _user_changed(mapper, connection, target: User) -> None:
+    state = inspect(target)
+    # 以 state.dict 讀取，避免在 flush 中觸發過期屬性的載入
+    emails = {state.dict.get("email"), *state.attrs.email.history.deleted}
+    _invalidate(
+        target,
+        _token_version_key(state.identity[0]),
+        *(_user_key(email) for email in emails if email),
+    )
+
+
+@event.listens_for(BookClubMember, "after_insert")
+@event.listens_for(BookClubMember, "after_update")
+@event.listens_for(BookClubMember, "after_delete")
+def _member_changed(mapper, connection, target: BookClubMember) -> None:
+    _invalidate(target, _member_key(target.user_id, target.book_club_id))
+
+
+@event.listens_for(OrmSession, "after_commit")
+def _session_committed(session) -> None:
+    keys = session.info.pop(_PENDING_KEYS, None)
+    if keys:
+        get_backend().delete_many(keys)
+
+
+@event.listens_for(OrmSession, "after_rollback")
+def _session_rolled_back(session) -> None:
+    session.info.pop(_PENDING_KEYS, None)
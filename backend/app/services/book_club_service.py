@@ -1,16 +1,18 @@
-from typing import List, Optional
-from sqlmodel import Session, select
+from collections import defaultdict
+from typing import Dict, List, Optional
+from sqlmodel import Session, select, func
 from fastapi import HTTPException, status, UploadFile
 
 from app.models.book_club import BookClub, BookClubCreate, BookClubVisibility
 from app.models.book_club_member import BookClubMember, MemberRole, MembershipStatus
 from app.models.club_tag import ClubTag, BookClubTagLink
-from app.models.user import User
+from app.models.user import User, UserRead
 from app.models.club_join_request import ClubJoinRequest, JoinRequestStatus
 from app.schemas.book_club import BookClubReadWithDetails, BookClubUpdate
 from app.models.club_tag import ClubTagRead
 from app.core.cloudinary_config import upload_image, delete_image, extract_public_id_from_url
-from app.services import notification_service
+from app.core.pagination import after_cursor, encode_cursor
+from app.services import club_search_service, dashboard_cache, notification_service
 
 
 def upload_club_cover_to_cloudinary(upload_file: UploadFile, club_id: int) -> str:
@@ -80,7 +82,7 @@ def update_club_cover(
         
         session.add(book_club)
         session.commit()
-        session.refresh(book_club)
+        dashboard_cache.invalidate_club(session, club_id)
         
         return get_book_club_by_id(session=session, club_id=club_id, current_user=current_user)
     except Exception as e:
@@ -107,7 +109,7 @@ def update_book_club(
 
     session.add(book_club)
     session.commit()
-    session.refresh(book_club)
+    dashboard_cache.invalidate_club(session, club_id)
 
     return get_book_club_by_id(session=session, club_id=club_id, current_user=current_user)
 
@@ -171,6 +173,7 @@ def create_book_club(
     
     session.commit()
     session.refresh(book_club)
+    dashboard_cache.invalidate_user(current_user.id)
     
     # 6. 構建回應資料
     from app.models.user import UserRead
@@ -202,6 +205,150 @@ def get_available_tags(session: Session) -> List[ClubTagRead]:
         for tag in tags
     ]
 
+def _build_book_club_read(
+    club: BookClub,
+    owner: Optional[User],
+    tags: List[ClubTag],
+    member_count: int,
+    membership_status: Optional[MembershipStatus]
+) -> BookClubReadWithDetails:
+    """將讀書會與已載入的關聯資料組裝為 BookClubReadWithDetails"""
+    return BookClubReadWithDetails(
+        id=club.id,
+        name=club.name,
+        description=club.description,
+        visibility=club.visibility,
+        cover_image_url=club.cover_image_url,
+        owner_id=club.owner_id,
+        created_at=club.created_at,
+        updated_at=club.updated_at,
+        owner=UserRead(
+            id=owner.id,
+            email=owner.email,
+            display_name=owner.display_name,
+            avatar_url=owner.avatar_url
+        ) if owner else None,
+        tags=[ClubTagRead(id=tag.id, name=tag.name, is_predefined=tag.is_predefined) for tag in tags],
+        member_count=member_count,
+        membership_status=membership_status
+    )
+
+
+def hydrate_book_clubs(
+    session: Session,
+    book_clubs: List[BookClub],
+    current_user: Optional[User] = None
+) -> List[BookClubReadWithDetails]:
+    """
+    批次載入一頁讀書會的關聯資料並組裝回應
+    
+    擁有者、標籤與當前使用者的成員/申請狀態各以一次集合查詢 (IN 清單)
+    取得，成員數直接讀取 BookClub.member_count，查詢次數固定，不隨讀書會數量增加。
+    
+    Args:
+        session: 資料庫 session
+        book_clubs: 已查詢出的讀書會（保持原排序）
+        current_user: 當前使用者（可選）
+    
+    Returns:
+        與 book_clubs 順序相同的讀書會詳細資訊列表
+    """
+    if not book_clubs:
+        return []
+    
+    club_ids = [club.id for club in book_clubs]
+    owner_ids = {club.owner_id for club in book_clubs}
+    
+    # 1. 擁有者
+    owners: Dict[int, User] = {
+        user.id: user
+        for user in session.exec(select(User).where(User.id.in_(owner_ids))).all()
+    }
+    
+    # 2. 標籤（透過關聯表 JOIN 一次取得）
+    tags_by_club: Dict[int, List[ClubTag]] = defaultdict(list)
+    tag_rows = session.exec(
+        select(BookClubTagLink.book_club_id, ClubTag)
+        .join(ClubTag, ClubTag.id == BookClubTagLink.tag_id)
+        .where(BookClubTagLink.book_club_id.in_(club_ids))
+        .order_by(ClubTag.id)
+    ).all()
+    for book_club_id, tag in tag_rows:
+        tags_by_club[book_club_id].append(tag)
+    
+    # 3. 當前使用者的成員角色與待審核的加入請求
+    roles: Dict[int, MemberRole] = {}
+    pending_club_ids = set()
+    if current_user:
+        roles = dict(session.exec(
+            select(BookClubMember.book_club_id, BookClubMember.role).where(
+                BookClubMember.user_id == current_user.id,
+                BookClubMember.book_club_id.in_(club_ids)
+            )
+        ).all())
+        pending_club_ids = set(session.exec(
+            select(ClubJoinRequest.book_club_id).where(
+                ClubJoinRequest.user_id == current_user.id,
+                ClubJoinRequest.book_club_id.in_(club_ids),
+                ClubJoinRequest.status == JoinRequestStatus.PENDING
+            )
+        ).all())
+    
+    result = []
+    for club in book_clubs:
+        membership_status = None
+        if club.id in roles:
+            # 將 MemberRole 映射到 MembershipStatus
+            membership_status = MembershipStatus(MemberRole(roles[club.id]).value)
+        elif club.id in pending_club_ids:
+            membership_status = MembershipStatus.PENDING_REQUEST
+        
+        result.append(_build_book_club_read(
+            club,
+            owner=owners.get(club.owner_id),
+            tags=tags_by_club.get(club.id, []),
+            member_count=club.member_count,
+            membership_status=membership_status
+        ))
+    
+    return result
+
+
+def _list_book_clubs_by_cursor(
+    session: Session,
+    query,
+    *,
+    page_size: int,
+    cursor: Optional[str],
+    include_total: bool,
+    current_user: Optional[User]
+) -> tuple[List[BookClubReadWithDetails], dict]:
+    """以 (created_at, id) 游標分頁查詢讀書會，多取一筆判斷是否有下一頁"""
+    total_items = None
+    if include_total:
+        total_items = session.exec(select(func.count()).select_from(query.subquery())).one()
+    
+    if cursor:
+        query = query.where(after_cursor(BookClub.created_at, BookClub.id, cursor, descending=True))
+    query = query.order_by(BookClub.created_at.desc(), BookClub.id.desc()).limit(page_size + 1)
+    
+    book_clubs = session.exec(query).all()
+    has_next = len(book_clubs) > page_size
+    book_clubs = book_clubs[:page_size]
+    
+    next_cursor = None
+    if has_next:
+        last = book_clubs[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+    
+    pagination = {
+        "page_size": page_size,
+        "next_cursor": next_cursor,
+        "has_next": has_next,
+        "total_items": total_items
+    }
+    return hydrate_book_clubs(session, book_clubs, current_user=current_user), pagination
+
 def list_book_clubs(
     session: Session,
     page: int = 1,
@@ -209,10 +356,17 @@ def list_book_clubs(
     keyword: Optional[str] = None,
     tag_ids: Optional[List[int]] = None,
     user_id: Optional[int] = None,
-    current_user: Optional[User] = None
+    current_user: Optional[User] = None,
+    use_cursor: bool = False,
+    cursor: Optional[str] = None,
+    include_total: bool = False
 ) -> tuple[List[BookClubReadWithDetails], dict]:
-    from sqlmodel import func, col
+    """
+    列出讀書會（依建立時間由新到舊；頁碼分頁搭配關鍵字時依相關度排序）
     
+    預設使用頁碼分頁；use_cursor=True 時改用 (created_at, id) 游標分頁，
+    不使用 OFFSET，且只有 include_total=True 時才計算總筆數。
+    """
     # 基礎查詢：顯示所有讀書會（不論 visibility）
     query = select(BookClub)
     
@@ -220,90 +374,40 @@ def list_book_clubs(
     if user_id is not None:
         query = query.join(BookClubMember).where(BookClubMember.user_id == user_id)
     
+    # 關鍵字搜尋：走 pg_trgm / n-gram 索引，頁碼分頁時依相關度排序
+    rank = None
     if keyword:
-        search_pattern = f"%{keyword}%"
-        query = query.where(
-            (BookClub.name.like(search_pattern)) |
-            (BookClub.description.like(search_pattern))
-        )
+        keyword_condition, rank = club_search_service.keyword_filter(session, keyword)
+        query = query.where(keyword_condition)
     
     if tag_ids and len(tag_ids) > 0:
-        query = query.join(BookClubTagLink).where(
-            BookClubTagLink.tag_id.in_(tag_ids)
-        ).distinct()
+        # 以子查詢篩選，避免 JOIN 後需要 DISTINCT 去除重複
+        query = query.where(BookClub.id.in_(
+            select(BookClubTagLink.book_club_id).where(BookClubTagLink.tag_id.in_(tag_ids))
+        ))
+    
+    if use_cursor:
+        return _list_book_clubs_by_cursor(
+            session,
+            query,
+            page_size=page_size,
+            cursor=cursor,
+            include_total=include_total,
+            current_user=current_user
+        )
     
     count_query = select(func.count()).select_from(query.subquery())
     total_items = session.exec(count_query).one()
     
     offset = (page - 1) * page_size
-    query = query.offset(offset).limit(page_size).order_by(BookClub.created_at.desc())
+    order_by = [BookClub.created_at.desc(), BookClub.id.desc()]
+    if rank is not None:
+        order_by.insert(0, rank.desc())
+    query = query.offset(offset).limit(page_size).order_by(*order_by)
     
     book_clubs = session.exec(query).all()
     
-    result = []
-    for club in book_clubs:
-        owner = session.get(User, club.owner_id)
-        
-        tag_links = session.exec(
-            select(BookClubTagLink).where(BookClubTagLink.book_club_id == club.id)
-        ).all()
-        tag_ids_for_club = [link.tag_id for link in tag_links]
-        tags = session.exec(
-            select(ClubTag).where(ClubTag.id.in_(tag_ids_for_club))
-        ).all() if tag_ids_for_club else []
-        
-        member_count = session.exec(
-            select(func.count(BookClubMember.user_id)).where(
-                BookClubMember.book_club_id == club.id
-            )
-        ).one()
-        
-        # 計算當前使用者的 membership_status
-        membership_status = None
-        if current_user:
-            member_record = session.exec(
-                select(BookClubMember).where(
-                    BookClubMember.book_club_id == club.id,
-                    BookClubMember.user_id == current_user.id
-                )
-            ).first()
-            
-            if member_record:
-                # 將 MemberRole 映射到 MembershipStatus
-                membership_status = MembershipStatus(member_record.role.value)
-            else:
-                # 檢查是否有待處理的加入請求
-                pending_request = session.exec(
-                    select(ClubJoinRequest).where(
-                        ClubJoinRequest.book_club_id == club.id,
-                        ClubJoinRequest.user_id == current_user.id,
-                        ClubJoinRequest.status == JoinRequestStatus.PENDING
-                    )
-                ).first()
-                if pending_request:
-                    membership_status = MembershipStatus.PENDING_REQUEST
-        
-        from app.models.user import UserRead
-        
-        result.append(BookClubReadWithDetails(
-            id=club.id,
-            name=club.name,
-            description=club.description,
-            visibility=club.visibility,
-            cover_image_url=club.cover_image_url,
-            owner_id=club.owner_id,
-            created_at=club.created_at,
-            updated_at=club.updated_at,
-            owner=UserRead(
-                id=owner.id,
-                email=owner.email,
-                display_name=owner.display_name,
-                avatar_url=owner.avatar_url
-            ) if owner else None,
-            tags=[ClubTagRead(id=tag.id, name=tag.name, is_predefined=tag.is_predefined) for tag in tags],
-            member_count=member_count,
-            membership_status=membership_status
-        ))
+    result = hydrate_book_clubs(session, book_clubs, current_user=current_user)
     
     total_pages = (total_items + page_size - 1) // page_size
     pagination = {
@@ -322,73 +426,80 @@ def get_book_club_by_id(
     club_id: int,
     current_user: Optional[User] = None
 ) -> BookClubReadWithDetails:
-    from sqlmodel import func
+    """
+    取得讀書會詳細資訊
     
-    book_club = session.get(BookClub, club_id)
+    讀書會（含成員數計數欄位）、擁有者與當前使用者的成員/申請狀態以單一查詢
+    (JOIN + 純量子查詢) 取得，標籤另以一次查詢載入，共兩次查詢。
     
-    if not book_club:
+    Args:
+        session: 資料庫 session
+        club_id: 讀書會 ID
+        current_user: 當前使用者（可選）
+    
+    Returns:
+        讀書會詳細資訊
+    
+    Raises:
+        HTTPException: 404 - 讀書會不存在
+    """
+    columns = [BookClub, User]
+    
+    if current_user:
+        role_subq = (
+            select(BookClubMember.role)
+            .where(
+                BookClubMember.book_club_id == club_id,
+                BookClubMember.user_id == current_user.id
+            )
+            .scalar_subquery()
+        )
+        pending_subq = (
+            select(ClubJoinRequest.id)
+            .where(
+                ClubJoinRequest.book_club_id == club_id,
+                ClubJoinRequest.user_id == current_user.id,
+                ClubJoinRequest.status == JoinRequestStatus.PENDING
+            )
+            .exists()
+        )
+        columns += [role_subq.label("member_role"), pending_subq.label("has_pending_request")]
+    
+    row = session.exec(
+        select(*columns)
+        .outerjoin(User, User.id == BookClub.owner_id)
+        .where(BookClub.id == club_id)
+    ).first()
+    
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"讀書會 ID {club_id} 不存在"
         )
     
-    owner = session.get(User, book_club.owner_id)
-    
-    tag_links = session.exec(
-        select(BookClubTagLink).where(BookClubTagLink.book_club_id == club_id)
-    ).all()
-    tag_ids_for_club = [link.tag_id for link in tag_links]
-    tags = session.exec(
-        select(ClubTag).where(ClubTag.id.in_(tag_ids_for_club))
-    ).all() if tag_ids_for_club else []
-    
-    member_count = session.exec(
-        select(func.count(BookClubMember.user_id)).where(
-            BookClubMember.book_club_id == club_id
-        )
-    ).one()
+    book_club, owner = row[0], row[1]
     
     membership_status: Optional[MembershipStatus] = MembershipStatus.NOT_MEMBER
     if current_user:
-        member_record = session.exec(
-            select(BookClubMember).where(
-                BookClubMember.book_club_id == club_id,
-                BookClubMember.user_id == current_user.id
-            )
-        ).first()
-        if member_record:
-            membership_status = MembershipStatus(member_record.role.value)
-        else:
-            # 檢查是否有待處理的加入請求（所有讀書會都需要審核）
-            request_record = session.exec(
-                select(ClubJoinRequest).where(
-                    ClubJoinRequest.book_club_id == club_id,
-                    ClubJoinRequest.user_id == current_user.id,
-                    ClubJoinRequest.status == JoinRequestStatus.PENDING
-                )
-            ).first()
-            if request_record:
-                membership_status = MembershipStatus.PENDING_REQUEST
-
-    from app.models.user import UserRead
+        member_role, has_pending_request = row[2], row[3]
+        if member_role is not None:
+            membership_status = MembershipStatus(MemberRole(member_role).value)
+        elif has_pending_request:
+            # 所有讀書會都需要審核，有待處理請求時顯示為申請中
+            membership_status = MembershipStatus.PENDING_REQUEST
     
-    return BookClubReadWithDetails(
-        id=book_club.id,
-        name=book_club.name,
-        description=book_club.description,
-        visibility=book_club.visibility,
-        cover_image_url=book_club.cover_image_url,
-        owner_id=book_club.owner_id,
-        created_at=book_club.created_at,
-        updated_at=book_club.updated_at,
-        owner=UserRead(
-            id=owner.id,
-            email=owner.email,
-            display_name=owner.display_name,
-            avatar_url=owner.avatar_url
-        ) if owner else None,
-        tags=[ClubTagRead(id=tag.id, name=tag.name, is_predefined=tag.is_predefined) for tag in tags],
-        member_count=member_count,
+    tags = session.exec(
+        select(ClubTag)
+        .join(BookClubTagLink, BookClubTagLink.tag_id == ClubTag.id)
+        .where(BookClubTagLink.book_club_id == club_id)
+        .order_by(ClubTag.id)
+    ).all()
+    
+    return _build_book_club_read(
+        book_club,
+        owner=owner,
+        tags=tags,
+        member_count=book_club.member_count,
         membership_status=membership_status
     )
 
@@ -422,6 +533,7 @@ def join_book_club(session: Session, club_id: int, user_id: int) -> Optional[Clu
         )
         session.add(new_member)
         session.commit()
+        dashboard_cache.invalidate_club(session, club_id)
         print(f"---LOG: User successfully added to public club")
         return None
     
@@ -463,6 +575,8 @@ def leave_book_club(session: Session, club_id: int, user_id: int) -> None:
 
     session.delete(member_record)
     session.commit()
+    dashboard_cache.invalidate_user(user_id)
+    dashboard_cache.invalidate_club(session, club_id)
 
 def request_to_join_book_club(session: Session, club_id: int, user_id: int) -> ClubJoinRequest:
     """
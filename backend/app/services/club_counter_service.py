@@ -0,0 +1,100 @@
+# backend/app/services/club_counter_service.py
+"""
+讀書會計數欄位校正
+
+計數欄位平時由 app.models.club_counters 的 flush hook 維護；批次 SQL、手動修改
+資料或舊資料可能造成偏差，此服務以 GROUP BY 一次計算一批讀書會的實際數值並修正。
+"""
+from typing import Dict, List, Optional, Sequence
+
+from sqlalchemy import case
+from sqlmodel import Session, select, func
+
+from app.models.book_club import BookClub
+from app.models.book_club_member import BookClubMember
+from app.models.event import Event, EventStatus
+
+COUNTER_COLUMNS = ("member_count", "published_event_count", "completed_event_count")
+
+
+def compute_club_counters(session: Session, club_ids: Sequence[int]) -> Dict[int, Dict[str, int]]:
+    """
+    以集合查詢計算指定讀書會的實際計數
+    
+    Args:
+        session: 資料庫 session
+        club_ids: 讀書會 ID 列表
+    
+    Returns:
+        {club_id: {欄位名稱: 實際數值}}
+    """
+    counters = {club_id: {column: 0 for column in COUNTER_COLUMNS} for club_id in club_ids}
+    if not club_ids:
+        return counters
+    
+    member_rows = session.exec(
+        select(BookClubMember.book_club_id, func.count(BookClubMember.user_id))
+        .where(BookClubMember.book_club_id.in_(club_ids))
+        .group_by(BookClubMember.book_club_id)
+    ).all()
+    for club_id, member_count in member_rows:
+        counters[club_id]["member_count"] = member_count
+    
+    event_rows = session.exec(
+        select(
+            Event.club_id,
+            func.sum(case((Event.status == EventStatus.PUBLISHED, 1), else_=0)),
+            func.sum(case((Event.status == EventStatus.COMPLETED, 1), else_=0))
+        )
+        .where(Event.club_id.in_(club_ids))
+        .group_by(Event.club_id)
+    ).all()
+    for club_id, published, completed in event_rows:
+        counters[club_id]["published_event_count"] = int(published or 0)
+        counters[club_id]["completed_event_count"] = int(completed or 0)
+    
+    return counters
+
+
+def reconcile_club_counters(
+    session: Session,
+    club_ids: Optional[Sequence[int]] = None,
+    batch_size: int = 500
+) -> List[int]:
+    """
+    重新計算讀書會計數欄位並修正偏差
+    
+    依 ID 順序分批處理（每批一次 commit），避免長時間鎖定整張表。
+    
+    Args:
+        session: 資料庫 session
+        club_ids: 只校正指定的讀書會（None 表示全部）
+        batch_size: 每批處理的讀書會數量
+    
+    Returns:
+        計數有偏差並已修正的讀書會 ID 列表
+    """
+    drifted: List[int] = []
+    last_id = 0
+    
+    while True:
+        query = select(BookClub).where(BookClub.id > last_id).order_by(BookClub.id).limit(batch_size)
+        if club_ids is not None:
+            query = query.where(BookClub.id.in_(club_ids))
+        clubs = session.exec(query).all()
+        if not clubs:
+            break
+        
+        actual = compute_club_counters(session, [club.id for club in clubs])
+        for club in clubs:
+            expected = actual[club.id]
+            if any(getattr(club, column) != expected[column] for column in COUNTER_COLUMNS):
+                for column, value in expected.items():
+                    setattr(club, column, value)
+                session.add(club)
+                drifted.append(club.id)
+        
+        last_id = clubs[-1].id
+        session.commit()
+    
+    return drifted
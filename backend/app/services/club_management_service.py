@@ -11,6 +11,7 @@ from app.models.user import User
 from app.models.event import Event, EventParticipant
 from app.models.discussion import DiscussionTopic, DiscussionComment
 from app.models.club_tag import BookClubTagLink
+from app.services import dashboard_cache
 
 class ClubManagementService:
     def __init__(self, session: Session):
@@ -53,6 +54,7 @@ class ClubManagementService:
         self.session.add(new_member)
         self.session.add(join_request)
         self.session.commit()
+        dashboard_cache.invalidate_club(self.session, club_id)
 
     def reject_join_request(self, *, request_id: int, club_id: int) -> None:
         join_request = self.session.get(ClubJoinRequest, request_id)
@@ -129,6 +131,8 @@ class ClubManagementService:
 
         self.session.delete(target_membership)
         self.session.commit()
+        dashboard_cache.invalidate_user(target_user_id)
+        dashboard_cache.invalidate_club(self.session, club_id)
 
     def transfer_ownership(self, *, club_id: int, new_owner_id: int, acting_user: User) -> None:
         if acting_user.id == new_owner_id:
@@ -190,6 +194,9 @@ class ClubManagementService:
                 self.session.delete(participant)
             self.session.delete(event)
 
+        # Users whose dashboards change (members and comment authors)
+        affected_user_ids = set()
+
         # Delete related discussion comments first (due to foreign key to discussion topics)
         discussion_topics = self.session.exec(
             select(DiscussionTopic).where(DiscussionTopic.club_id == club_id)
@@ -199,6 +206,7 @@ class ClubManagementService:
                 select(DiscussionComment).where(DiscussionComment.topic_id == topic.id)
             ).all()
             for comment in comments:
+                affected_user_ids.add(comment.owner_id)
                 self.session.delete(comment)
             self.session.delete(topic)
 
@@ -217,8 +225,10 @@ class ClubManagementService:
         # Delete related memberships
         memberships = self.session.exec(select(BookClubMember).where(BookClubMember.book_club_id == club_id)).all()
         for member in memberships:
+            affected_user_ids.add(member.user_id)
             self.session.delete(member)
 
         # Finally delete the book club
         self.session.delete(book_club)
         self.session.commit()
+        dashboard_cache.invalidate_users(affected_user_ids)
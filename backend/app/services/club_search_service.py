@@ -0,0 +1,132 @@
+# backend/app/services/club_search_service.py
+"""
+讀書會關鍵字搜尋
+
+- PostgreSQL：以 pg_trgm 的 GIN 索引（見 alembic 5f2c8e1a7b3d）支援
+  `ILIKE '%keyword%'`，並以 word_similarity 排序。
+- SQLite（測試 / 單一 process 開發環境）：以 in-process bigram 倒排索引取得
+  分數最高的候選 id（上限 app.core.search.MAX_CANDIDATES），再以 ILIKE 複查，
+  避免全表掃描。
+- 其他資料庫：直接以 ILIKE 篩選（in-process 索引無法在多個 worker 間同步，不使用）。
+
+索引以 Engine 為單位，第一次搜尋時由資料庫建立，之後由 BookClub 的
+mapper event 暫存變更，於 commit 後套用（見 app.core.search.stage_index_change）。
+"""
+import threading
+import weakref
+from typing import Optional, Tuple
+
+from sqlalchemy import case, event, false, func, inspect, literal
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import object_session
+from sqlmodel import Session, select
+
+from app.core.search import MAX_CANDIDATES, NgramIndex, stage_index_change
+from app.models.book_club import BookClub
+
+# 讀書會名稱命中的權重高於描述
+FIELD_WEIGHTS = {"name": 2.0, "description": 1.0}
+
+_indexes: "weakref.WeakKeyDictionary[Engine, NgramIndex]" = weakref.WeakKeyDictionary()
+_indexes_lock = threading.Lock()
+
+
+def _uses_trigram(session: Session) -> bool:
+    return session.get_bind().dialect.name == "postgresql"
+
+
+def _uses_ngram_index(session: Session) -> bool:
+    return session.get_bind().dialect.name == "sqlite"
+
+
+def get_club_index(session: Session) -> NgramIndex:
+    """取得（必要時建立）目前資料庫的讀書會 n-gram 索引"""
+    engine = session.get_bind()
+    index = _indexes.get(engine)
+    if index is not None:
+        return index
+
+    with _indexes_lock:
+        index = _indexes.get(engine)
+        if index is None:
+            index = NgramIndex(FIELD_WEIGHTS)
+            rows = session.exec(select(BookClub.id, BookClub.name, BookClub.description)).all()
+            index.add_many((club_id, {"name": name, "description": description}) for club_id, name, description in rows)
+            _indexes[engine] = index
+    return index
+
+
+def keyword_filter(session: Session, keyword: str) -> Tuple:
+    """
+    產生關鍵字搜尋的篩選條件與排序分數
+
+    Args:
+        session: 資料庫 session
+        keyword: 搜尋關鍵字（比對名稱與描述，不分大小寫）
+
+    Returns:
+        Tuple: (WHERE 條件, 分數欄位運算式)，分數越高越相關
+    """
+    pattern = f"%{keyword}%"
+    matches = BookClub.name.ilike(pattern) | BookClub.description.ilike(pattern)
+
+    if _uses_trigram(session):
+        rank = (
+            func.word_similarity(keyword, BookClub.name) * FIELD_WEIGHTS["name"]
+            + func.word_similarity(keyword, func.coalesce(BookClub.description, "")) * FIELD_WEIGHTS["description"]
+        )
+        return matches, rank
+
+    if not _uses_ngram_index(session):
+        rank = (
+            case((BookClub.name.ilike(pattern), FIELD_WEIGHTS["name"]), else_=0.0)
+            + case((BookClub.description.ilike(pattern), FIELD_WEIGHTS["description"]), else_=0.0)
+        )
+        return matches, rank
+
+    scores = get_club_index(session).search(keyword, limit=MAX_CANDIDATES)
+    if not scores:
+        return false(), literal(0.0)
+    # 索引結果為超集合，以 ILIKE 複查候選 id 取得精確結果
+    rank = case(scores, value=BookClub.id, else_=0.0)
+    return BookClub.id.in_(scores.keys()) & matches, rank
+
+
+def _index_for(connection, target: BookClub) -> Optional[NgramIndex]:
+    # 沒有 session 時（例如直接以 Core 寫入）無法在 commit 後套用，略過
+    if object_session(target) is None:
+        return None
+    return _indexes.get(connection.engine)
+
+
+@event.listens_for(BookClub, "after_insert")
+def _club_inserted(mapper, connection, target: BookClub) -> None:
+    index = _index_for(connection, target)
+    if index is not None:
+        stage_index_change(
+            object_session(target), index, target.id,
+            {"name": target.name, "description": target.description}
+        )
+
+
+@event.listens_for(BookClub, "after_update")
+def _club_updated(mapper, connection, target: BookClub) -> None:
+    index = _index_for(connection, target)
+    state = inspect(target)
+    if index is None or not (
+        state.attrs.name.history.has_changes() or state.attrs.description.history.has_changes()
+    ):
+        return
+    # 未修改的欄位可能已過期，直接以同一連線讀取，避免在 flush 中觸發 lazy load
+    table = BookClub.__table__
+    row = connection.execute(
+        select(table.c.name, table.c.description).where(table.c.id == target.id)
+    ).one()
+    stage_index_change(object_session(target), index, target.id, {"name": row.name, "description": row.description})
+
+
+@event.listens_for(BookClub, "after_delete")
+def _club_deleted(mapper, connection, target: BookClub) -> None:
+    index = _index_for(connection, target)
+    if index is not None:
+        stage_index_change(object_session(target), index, target.id)
@@ -0,0 +1,189 @@
+# backend/app/services/comment_stream.py
+"""
+討論主題的即時回覆推播（WebSocket）
+
+每個主題一個 pub/sub 頻道（app.core.pubsub，PUBSUB_BACKEND=postgres 時跨
+worker 共享）。create_comment 在 commit 後把回覆內容直接放進訊息，訂閱者
+收到後原樣轉送，不需再查詢資料庫；只有以下情況才向資料庫補齊：
+
+- 連線時帶入 since_id（重新連線續傳）
+- 回覆內容超過 broker 的 payload 上限，broker 改送只帶 id 的訊息
+- 訂閱者過慢，佇列滿時丟棄過訊息
+- broker 重新連線（PostgresBroker 的 LISTEN 中斷期間可能漏收訊息）
+
+後兩種情況由 broker 標記 Subscription.dropped。
+
+補齊的起點只隨資料庫查詢結果前進：並行 commit 時即時訊息可能不依 id 順序
+送達，若以即時訊息的最大 id 為起點，之後補齊會略過較小、被丟棄的回覆。
+
+連線數限制：
+- COMMENT_STREAM_MAX_CONNECTIONS_PER_TOPIC：單一主題的連線上限（每個 process）
+- COMMENT_STREAM_MAX_CONNECTIONS：整個 process 的連線上限
+"""
+import os
+import threading
+from collections import deque
+from typing import AsyncIterator, Dict, List, Optional
+
+from sqlalchemy.orm import selectinload
+from sqlmodel import Session, func, select
+from starlette.concurrency import run_in_threadpool
+
+from app.core.pubsub import InProcessBroker, get_broker
+from app.models.discussion import DiscussionComment
+from app.schemas.discussion import DiscussionCommentRead
+
+MAX_CONNECTIONS_PER_TOPIC = int(os.getenv("COMMENT_STREAM_MAX_CONNECTIONS_PER_TOPIC", "500"))
+MAX_CONNECTIONS = int(os.getenv("COMMENT_STREAM_MAX_CONNECTIONS", "5000"))
+# 無訊息時送出 keep-alive 的間隔（秒），同時用來偵測已斷線的用戶端
+HEARTBEAT_SECONDS = 25.0
+# 每次補發的最大筆數
+BATCH_SIZE = 100
+# 記住最近送出的回覆 ID，避免補發與即時訊息重複推送
+RECENT_IDS = 1000
+# 連續推送這麼多則即時訊息後，向資料庫補齊一次以推進補齊起點，
+# 使補齊範圍內已送出的回覆都還在 RECENT_IDS 之內
+LIVE_IDS_PER_CATCH_UP = RECENT_IDS // 2
+
+
+def topic_channel(topic_id: int) -> str:
+    """主題回覆的 pub/sub 頻道名稱"""
+    return f"topic:{topic_id}"
+
+
+def comment_payload(comment: DiscussionComment) -> dict:
+    return DiscussionCommentRead.model_validate(comment).model_dump(mode="json", by_alias=True)
+
+
+def publish_comment(comment: DiscussionComment) -> None:
+    """發布新回覆給訂閱該主題的連線（需在 commit 後呼叫）"""
+    message = {"type": "comment", "id": comment.id}
+    # 是否能附帶回覆內容由 broker 依實際 payload 大小決定，過大時只送 ID
+    get_broker().publish(
+        topic_channel(comment.topic_id),
+        {**message, "comment": comment_payload(comment)},
+        compact=message,
+    )
+
+
+class ConnectionLimiter:
+    """限制每個主題與整個 process 的即時連線數"""
+
+    def __init__(self, max_per_topic: int = MAX_CONNECTIONS_PER_TOPIC, max_total: int = MAX_CONNECTIONS):
+        self.max_per_topic = max_per_topic
+        self.max_total = max_total
+        self._counts: Dict[int, int] = {}
+        self._total = 0
+        self._lock = threading.Lock()
+
+    def acquire(self, topic_id: int) -> bool:
+        """佔用一個連線名額，已達上限時回傳 False"""
+        with self._lock:
+            if self._total >= self.max_total or self._counts.get(topic_id, 0) >= self.max_per_topic:
+                return False
+            self._counts[topic_id] = self._counts.get(topic_id, 0) + 1
+            self._total += 1
+            return True
+
+    def release(self, topic_id: int) -> None:
+        with self._lock:
+            remaining = self._counts.get(topic_id, 0) - 1
+            if remaining > 0:
+                self._counts[topic_id] = remaining
+            else:
+                self._counts.pop(topic_id, None)
+            self._total = max(0, self._total - 1)
+
+    def active(self, topic_id: Optional[int] = None) -> int:
+        """目前的連線數（指定 topic_id 時只計算該主題）"""
+        return self._total if topic_id is None else self._counts.get(topic_id, 0)
+
+
+connection_limiter = ConnectionLimiter()
+
+
+def _read(session: Session, query_func, *args):
+    """在 thread pool 中執行查詢，完成後立即釋放連線（連線期間不佔用交易）"""
+    try:
+        return query_func(session, *args)
+    finally:
+        session.close()
+
+
+def _latest_comment_id(session: Session, topic_id: int) -> int:
+    latest_id = session.exec(
+        select(func.max(DiscussionComment.id)).where(DiscussionComment.topic_id == topic_id)
+    ).one()
+    return latest_id or 0
+
+
+def _comments_after(session: Session, topic_id: int, after_id: int) -> List[dict]:
+    comments = session.exec(
+        select(DiscussionComment)
+        .where(DiscussionComment.topic_id == topic_id, DiscussionComment.id > after_id)
+        .options(selectinload(DiscussionComment.owner))
+        .order_by(DiscussionComment.id)
+        .limit(BATCH_SIZE)
+    ).all()
+    return [comment_payload(comment) for comment in comments]
+
+
+async def comment_events(
+    session: Session,
+    topic_id: int,
+    since_id: Optional[int] = None,
+    broker: Optional[InProcessBroker] = None,
+    heartbeat_seconds: float = HEARTBEAT_SECONDS
+) -> AsyncIterator[dict]:
+    """
+    產生主題的即時回覆事件
+
+    Args:
+        session: 資料庫 session（每次查詢後關閉，之後可再次使用）
+        topic_id: 討論主題 ID
+        since_id: 先補發 id 大於此值的回覆；未指定時只推送連線後的新回覆
+        broker: pub/sub broker（預設為 get_broker()）
+        heartbeat_seconds: keep-alive 間隔
+
+    Yields:
+        dict: {"type": "comment", "comment": {...}} 或 {"type": "keep-alive"}
+    """
+    broker = broker or get_broker()
+    # 先訂閱再補發，避免補發與訂閱之間的回覆遺失
+    subscription = broker.subscribe([topic_channel(topic_id)])
+    sent_ids: deque = deque(maxlen=RECENT_IDS)
+    try:
+        # last_id：補齊的起點，只由資料庫查詢結果推進（見模組說明）
+        if since_id is None:
+            last_id = await run_in_threadpool(_read, session, _latest_comment_id, topic_id)
+        else:
+            last_id = since_id
+        pending = since_id is not None
+        live_count = 0
+        while True:
+            while pending:
+                comments = await run_in_threadpool(_read, session, _comments_after, topic_id, last_id)
+                for comment in comments:
+                    last_id = comment["id"]
+                    if comment["id"] not in sent_ids:
+                        sent_ids.append(comment["id"])
+                        yield {"type": "comment", "comment": comment}
+                pending = len(comments) == BATCH_SIZE
+                live_count = 0
+
+            message = await subscription.get(timeout=heartbeat_seconds)
+            if subscription.dropped:
+                subscription.dropped = False
+                pending = True
+            elif message is None:
+                yield {"type": "keep-alive"}
+            elif "comment" not in message:
+                pending = True
+            elif message["id"] not in sent_ids:
+                # 並行 commit 時較小的 id 可能較晚送達，因此以已送出的 ID 判斷是否重複
+                sent_ids.append(message["id"])
+                live_count += 1
+                pending = live_count >= LIVE_IDS_PER_CATCH_UP
+                yield {"type": "comment", "comment": message["comment"]}
+    finally:
+        subscription.close()
@@ -0,0 +1,78 @@
+# backend/app/services/dashboard_cache.py
+"""
+用戶儀表板快取
+
+以用戶 ID 為 key 快取序列化後的 DashboardData，並由會影響儀表板內容的
+寫入操作（加入/退出讀書會、留言、活動異動等）在 commit 後主動失效。
+TTL 確保時間相關的統計（即將舉行的活動、本週活動）不會過舊。
+快取一律由主資料庫的查詢結果填入（見 app.db.async_session.get_primary_read_session），
+避免失效後的下一次讀取落在延遲的複本，把舊資料再快取一個 TTL。
+"""
+import os
+from typing import Iterable, Optional
+
+from sqlmodel import Session, select
+
+from app.core.cache import CacheBackend, create_cache_backend
+from app.models.book_club_member import BookClubMember
+from app.schemas.dashboard import DashboardData
+
+# 快取存活時間（秒），設為 0 可停用快取
+DASHBOARD_CACHE_TTL_SECONDS = float(os.getenv("DASHBOARD_CACHE_TTL_SECONDS", "60"))
+
+_backend: Optional[CacheBackend] = None
+
+
+def get_backend() -> CacheBackend:
+    global _backend
+    if _backend is None:
+        _backend = create_cache_backend()
+    return _backend
+
+
+def set_backend(backend: CacheBackend) -> None:
+    """替換快取後端（例如改用共用的 Redis 相容服務）"""
+    global _backend
+    _backend = backend
+
+
+def _key(user_id: int) -> str:
+    return f"dashboard:{user_id}"
+
+
+def get(user_id: int) -> Optional[DashboardData]:
+    if DASHBOARD_CACHE_TTL_SECONDS <= 0:
+        return None
+    cached = get_backend().get(_key(user_id))
+    if cached is None:
+        return None
+    return DashboardData.model_validate_json(cached)
+
+
+def put(user_id: int, dashboard: DashboardData) -> None:
+    if DASHBOARD_CACHE_TTL_SECONDS <= 0:
+        return
+    get_backend().set(_key(user_id), dashboard.model_dump_json(by_alias=True), DASHBOARD_CACHE_TTL_SECONDS)
+
+
+def invalidate_users(user_ids: Iterable[Optional[int]]) -> None:
+    """使指定用戶的儀表板快取失效"""
+    keys = [_key(user_id) for user_id in set(user_ids) if user_id is not None]
+    if keys:
+        get_backend().delete_many(keys)
+
+
+def invalidate_user(user_id: Optional[int]) -> None:
+    invalidate_users([user_id])
+
+
+def invalidate_club(session: Session, club_id: int) -> None:
+    """使讀書會所有成員的儀表板快取失效（讀書會資訊、成員數或活動異動時）"""
+    member_ids = session.exec(
+        select(BookClubMember.user_id).where(BookClubMember.book_club_id == club_id)
+    ).all()
+    invalidate_users(member_ids)
+
+
+def clear() -> None:
+    get_backend().clear()
@@ -1,3 +1,4 @@
+from sqlalchemy import case
 from sqlmodel import Session, select, func
 from datetime import datetime, timedelta
 from typing import List
@@ -12,11 +13,35 @@ from app.models.book_club import BookClub
 from app.models.book_club_member import BookClubMember
 from app.models.discussion import DiscussionComment
 from app.models.event import Event, EventStatus
+from app.services import dashboard_cache
+
+
+def get_user_dashboard_cached(session: Session, user_id: int) -> DashboardData:
+    """
+    獲取用戶儀表板資料，優先使用快取（見 app.services.dashboard_cache）
+    
+    Args:
+        session: 資料庫 session
+        user_id: 用戶 ID
+        
+    Returns:
+        DashboardData: 儀表板資料
+    """
+    dashboard = dashboard_cache.get(user_id)
+    if dashboard is None:
+        dashboard = get_user_dashboard(session, user_id)
+        dashboard_cache.put(user_id, dashboard)
+    return dashboard
 
 
 def get_user_dashboard(session: Session, user_id: int) -> DashboardData:
     """
-    獲取用戶儀表板資料
+    獲取用戶儀表板資料（唯讀）
+    
+    過期活動轉為 COMPLETED 由背景排程負責（app.services.scheduled_jobs），
+    此處不再寫入資料庫。活動統計讀取讀書會的計數欄位（app.models.club_counters），
+    只另外查詢本週的活動，以及時間已過、排程尚未轉為 COMPLETED 的活動，
+    查詢成本不隨讀書會的活動總數增加。
     
     Args:
         session: 資料庫 session
@@ -25,33 +50,40 @@ def get_user_dashboard(session: Session, user_id: int) -> DashboardData:
     Returns:
         DashboardData: 包含統計、讀書會列表和最近活動的儀表板資料
     """
-    # 計算當前時間
+    # 計算本週的開始時間（週一 00:00:00）
     now = datetime.utcnow()
+    start_of_week = now - timedelta(days=now.weekday())
+    start_of_week = start_of_week.replace(hour=0, minute=0, second=0, microsecond=0)
     
-    # 自動更新過期活動的狀態為 COMPLETED
-    # 查詢所有 PUBLISHED 但時間已過的活動
-    expired_events = session.exec(
-        select(Event)
-        .where(
-            Event.status == EventStatus.PUBLISHED,
-            Event.event_datetime < now
-        )
+    book_clubs = session.exec(
+        select(BookClub)
+        .join(BookClubMember, BookClub.id == BookClubMember.book_club_id)
+        .where(BookClubMember.user_id == user_id)
+        .order_by(BookClub.updated_at.desc())
     ).all()
     
-    # 批量更新為 COMPLETED 狀態
-    for event in expired_events:
-        event.status = EventStatus.COMPLETED
-        event.updated_at = now
-    
-    # 提交更新
-    if expired_events:
-        session.commit()
-    
-    # 獲取用戶加入的讀書會統計
-    clubs_count = session.exec(
-        select(func.count(BookClubMember.book_club_id))
-        .where(BookClubMember.user_id == user_id)
-    ).one()
+    # published_event_count 仍包含時間已過、排程尚未處理的活動，需改算為已完成
+    is_expired = (Event.status == EventStatus.PUBLISHED) & (Event.event_datetime < now)
+    # 本週活動：本週的已發布或已完成活動
+    is_this_week = (
+        Event.status.in_([EventStatus.PUBLISHED, EventStatus.COMPLETED])
+        & (Event.event_datetime >= start_of_week)
+        & (Event.event_datetime < start_of_week + timedelta(days=7))
+    )
+    event_stats = {}
+    if book_clubs:
+        event_stats = {
+            club_id: (expired or 0, weekly or 0)
+            for club_id, expired, weekly in session.exec(
+                select(
+                    Event.club_id,
+                    func.sum(case((is_expired, 1), else_=0)),
+                    func.sum(case((is_this_week, 1), else_=0))
+                )
+                .where(Event.club_id.in_([club.id for club in book_clubs]), is_expired | is_this_week)
+                .group_by(Event.club_id)
+            ).all()
+        }
     
     # 獲取用戶的總留言數（在所有討論話題下的留言）
     discussions_count = session.exec(
@@ -59,81 +91,22 @@ def get_user_dashboard(session: Session, user_id: int) -> DashboardData:
         .where(DiscussionComment.owner_id == user_id)
     ).one()
     
-    # 獲取本週活動數（用戶參加的讀書會的本週活動）
-    # 計算本週的開始時間（週一 00:00:00）
-    now = datetime.utcnow()
-    start_of_week = now - timedelta(days=now.weekday())
-    start_of_week = start_of_week.replace(hour=0, minute=0, second=0, microsecond=0)
-    
-    # 查詢本週活動：用戶加入的讀書會中，本週的已發布或已完成活動
-    weekly_events = session.exec(
-        select(func.count(Event.id))
-        .join(BookClubMember, Event.club_id == BookClubMember.book_club_id)
-        .where(
-            BookClubMember.user_id == user_id,
-            Event.event_datetime >= start_of_week,
-            Event.event_datetime < start_of_week + timedelta(days=7),
-            Event.status.in_([EventStatus.PUBLISHED, EventStatus.COMPLETED])
-        )
-    ).one()
-    
     # 創建統計數據
     stats = DashboardStats(
-        clubs_count=clubs_count,
+        clubs_count=len(book_clubs),
         books_read=0,  # TODO: 當書籍模型實現後填充
         discussions_count=discussions_count,
-        weekly_events=weekly_events
+        weekly_events=sum(weekly for _, weekly in event_stats.values())
     )
     
-    # 獲取用戶的讀書會列表
-    user_clubs_query = (
-        select(BookClub, BookClubMember)
-        .join(BookClubMember, BookClub.id == BookClubMember.book_club_id)
-        .where(BookClubMember.user_id == user_id)
-        .order_by(BookClub.updated_at.desc())
-    )
-    
-    results = session.exec(user_clubs_query).all()
-    
     clubs: List[DashboardClub] = []
-    for book_club, membership in results:
-        # 計算成員數量
-        member_count = session.exec(
-            select(func.count(BookClubMember.user_id))
-            .where(BookClubMember.book_club_id == book_club.id)
-        ).one()
-        
-        # 計算活動統計
-        # 總活動數（已發布或已完成的活動）
-        total_events = session.exec(
-            select(func.count(Event.id))
-            .where(
-                Event.club_id == book_club.id,
-                Event.status.in_([EventStatus.PUBLISHED, EventStatus.COMPLETED])
-            )
-        ).one()
-        
-        # 已完成的活動數（狀態為 COMPLETED 或活動時間在過去的 PUBLISHED）
-        completed_events = session.exec(
-            select(func.count(Event.id))
-            .where(
-                Event.club_id == book_club.id,
-                (
-                    (Event.status == EventStatus.COMPLETED) |
-                    ((Event.status == EventStatus.PUBLISHED) & (Event.event_datetime < now))
-                )
-            )
-        ).one()
-        
-        # 未來的活動數（PUBLISHED 且時間在未來）
-        upcoming_events = session.exec(
-            select(func.count(Event.id))
-            .where(
-                Event.club_id == book_club.id,
-                Event.status == EventStatus.PUBLISHED,
-                Event.event_datetime >= now
-            )
-        ).one()
+    for book_club in book_clubs:
+        # 成員數與活動數讀取讀書會的計數欄位
+        member_count = book_club.member_count
+        expired_events, _ = event_stats.get(book_club.id, (0, 0))
+        completed_events = book_club.completed_event_count + expired_events
+        upcoming_events = book_club.published_event_count - expired_events
+        total_events = upcoming_events + completed_events
         
         # 計算進度百分比
         progress_percentage = 0.0
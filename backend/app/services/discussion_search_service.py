@@ -0,0 +1,275 @@
+# backend/app/services/discussion_search_service.py
+"""
+讀書會內的討論搜尋（主題標題、內容與回覆內容）
+
+- PostgreSQL：以 pg_trgm 的 GIN 索引（見 alembic f3c7a9e1b524）支援
+  `ILIKE '%keyword%'`，並以 word_similarity 排序。回覆沒有 club_id，
+  先由回覆內容的 trigram 索引取得候選，再與該讀書會的主題 join。
+  少於 3 個字的關鍵字取不出 trigram，無法使用索引；此時只搜尋該讀書會最近
+  活動的 SHORT_KEYWORD_TOPIC_LIMIT 個主題及其回覆（以 club_id /
+  last_activity_at 索引與回覆的 topic_id 索引取得），避免整表掃描。
+- SQLite（測試 / 單一 process 開發環境）：主題與回覆各一個 in-process bigram
+  倒排索引取得分數最高的候選 id（各自上限 app.core.search.MAX_CANDIDATES），
+  再以 ILIKE 與讀書會條件複查。
+- 其他資料庫：直接以 ILIKE 比對。
+
+中文內容沒有空白斷詞，因此採 trigram / bigram 而不是 tsvector。
+
+bigram 索引以 Engine 為單位，第一次搜尋時由資料庫建立，之後由 DiscussionTopic
+與 DiscussionComment 的 mapper event 暫存變更，於 commit 後套用
+（見 app.core.search.stage_index_change）。
+
+結果不計算總筆數（需再執行一次完整搜尋），分頁只回報是否有下一頁。
+"""
+import os
+import threading
+import weakref
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import case, event, false, func, inspect, literal, null, union_all
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import object_session
+from sqlmodel import Session, SQLModel, select
+
+from app.core.search import MAX_CANDIDATES, NgramIndex, stage_index_change
+from app.models.discussion import DiscussionComment, DiscussionTopic
+
+# 主題標題命中的權重高於內容與回覆
+TOPIC_FIELD_WEIGHTS = {"title": 2.0, "content": 1.0}
+COMMENT_FIELD_WEIGHTS = {"content": 1.0}
+# 搜尋結果摘要在關鍵字前後保留的字數
+SNIPPET_RADIUS = 40
+# pg_trgm 可使用索引的最短關鍵字長度
+TRIGRAM_MIN_KEYWORD_LENGTH = 3
+# 關鍵字過短時，PostgreSQL 上只搜尋最近活動的主題數
+SHORT_KEYWORD_TOPIC_LIMIT = int(os.getenv("DISCUSSION_SEARCH_SHORT_KEYWORD_TOPICS", "500"))
+
+_topic_indexes: "weakref.WeakKeyDictionary[Engine, NgramIndex]" = weakref.WeakKeyDictionary()
+_comment_indexes: "weakref.WeakKeyDictionary[Engine, NgramIndex]" = weakref.WeakKeyDictionary()
+_indexes_lock = threading.Lock()
+
+
+def _uses_trigram(session: Session) -> bool:
+    return session.get_bind().dialect.name == "postgresql"
+
+
+def _uses_ngram_index(session: Session) -> bool:
+    return session.get_bind().dialect.name == "sqlite"
+
+
+def _get_index(session: Session, indexes, field_weights: Dict[str, float], statement) -> NgramIndex:
+    engine = session.get_bind()
+    index = indexes.get(engine)
+    if index is not None:
+        return index
+
+    with _indexes_lock:
+        index = indexes.get(engine)
+        if index is None:
+            index = NgramIndex(field_weights)
+            fields = list(field_weights)
+            rows = session.exec(statement.execution_options(yield_per=1000))
+            index.add_many((row[0], dict(zip(fields, row[1:]))) for row in rows)
+            indexes[engine] = index
+    return index
+
+
+def get_topic_index(session: Session) -> NgramIndex:
+    """取得（必要時建立）目前資料庫的討論主題 n-gram 索引"""
+    return _get_index(
+        session, _topic_indexes, TOPIC_FIELD_WEIGHTS,
+        select(DiscussionTopic.id, DiscussionTopic.title, DiscussionTopic.content)
+    )
+
+
+def get_comment_index(session: Session) -> NgramIndex:
+    """取得（必要時建立）目前資料庫的回覆 n-gram 索引"""
+    return _get_index(
+        session, _comment_indexes, COMMENT_FIELD_WEIGHTS,
+        select(DiscussionComment.id, DiscussionComment.content)
+    )
+
+
+def _topic_filter(session: Session, keyword: str) -> Tuple:
+    pattern = f"%{keyword}%"
+    matches = DiscussionTopic.title.ilike(pattern) | DiscussionTopic.content.ilike(pattern)
+
+    if _uses_trigram(session):
+        rank = (
+            func.word_similarity(keyword, DiscussionTopic.title) * TOPIC_FIELD_WEIGHTS["title"]
+            + func.word_similarity(keyword, DiscussionTopic.content) * TOPIC_FIELD_WEIGHTS["content"]
+        )
+        return matches, rank
+    if not _uses_ngram_index(session):
+        rank = (
+            case((DiscussionTopic.title.ilike(pattern), TOPIC_FIELD_WEIGHTS["title"]), else_=0.0)
+            + case((DiscussionTopic.content.ilike(pattern), TOPIC_FIELD_WEIGHTS["content"]), else_=0.0)
+        )
+        return matches, rank
+
+    scores = get_topic_index(session).search(keyword, limit=MAX_CANDIDATES)
+    if not scores:
+        return false(), literal(0.0)
+    # 索引結果為超集合，以 ILIKE 複查候選 id 取得精確結果
+    return DiscussionTopic.id.in_(scores.keys()) & matches, case(scores, value=DiscussionTopic.id, else_=0.0)
+
+
+def _comment_filter(session: Session, keyword: str) -> Tuple:
+    matches = DiscussionComment.content.ilike(f"%{keyword}%")
+
+    if _uses_trigram(session):
+        rank = func.word_similarity(keyword, DiscussionComment.content) * COMMENT_FIELD_WEIGHTS["content"]
+        return matches, rank
+    if not _uses_ngram_index(session):
+        return matches, literal(COMMENT_FIELD_WEIGHTS["content"])
+
+    scores = get_comment_index(session).search(keyword, limit=MAX_CANDIDATES)
+    if not scores:
+        return false(), literal(0.0)
+    return DiscussionComment.id.in_(scores.keys()) & matches, case(scores, value=DiscussionComment.id, else_=0.0)
+
+
+def make_snippet(content: str, keyword: str, radius: int = SNIPPET_RADIUS) -> str:
+    """擷取關鍵字前後 radius 個字的摘要（找不到時取開頭）"""
+    position = content.lower().find(keyword.lower())
+    start = max(0, position - radius) if position >= 0 else 0
+    end = min(len(content), (position if position >= 0 else 0) + len(keyword) + radius)
+    snippet = content[start:end]
+    if start > 0:
+        snippet = "…" + snippet
+    if end < len(content):
+        snippet += "…"
+    return snippet
+
+
+def search_discussions(
+    session: Session,
+    club_id: int,
+    keyword: str,
+    page: int = 1,
+    page_size: int = 20
+) -> Tuple[List[dict], dict]:
+    """
+    搜尋讀書會內的討論主題與回覆，依相關度排序
+
+    Args:
+        session: 資料庫 session
+        club_id: 讀書會 ID
+        keyword: 搜尋關鍵字（不分大小寫）
+        page: 頁碼
+        page_size: 每頁筆數
+
+    Returns:
+        Tuple: (搜尋結果列表, 分頁資訊)；每筆結果包含 type（topic / comment）、
+        topic_id、comment_id、title、snippet 與 rank，分頁資訊不含總筆數
+    """
+    topic_condition, topic_rank = _topic_filter(session, keyword)
+    comment_condition, comment_rank = _comment_filter(session, keyword)
+    if _uses_trigram(session) and len(keyword) < TRIGRAM_MIN_KEYWORD_LENGTH:
+        recent_topic_ids = (
+            select(DiscussionTopic.id)
+            .where(DiscussionTopic.club_id == club_id)
+            .order_by(DiscussionTopic.last_activity_at.desc(), DiscussionTopic.id.desc())
+            .limit(SHORT_KEYWORD_TOPIC_LIMIT)
+        )
+        topic_condition = topic_condition & DiscussionTopic.id.in_(recent_topic_ids)
+        comment_condition = comment_condition & DiscussionComment.topic_id.in_(recent_topic_ids)
+
+    topics = select(
+        literal("topic").label("type"),
+        DiscussionTopic.id.label("topic_id"),
+        null().label("comment_id"),
+        DiscussionTopic.title.label("title"),
+        DiscussionTopic.content.label("content"),
+        topic_rank.label("rank"),
+    ).where(DiscussionTopic.club_id == club_id, topic_condition)
+    comments = select(
+        literal("comment").label("type"),
+        DiscussionComment.topic_id.label("topic_id"),
+        DiscussionComment.id.label("comment_id"),
+        DiscussionTopic.title.label("title"),
+        DiscussionComment.content.label("content"),
+        comment_rank.label("rank"),
+    ).join(DiscussionTopic, DiscussionComment.topic_id == DiscussionTopic.id).where(
+        DiscussionTopic.club_id == club_id, comment_condition
+    )
+    results = union_all(topics, comments).subquery()
+
+    # 多取一筆判斷是否有下一頁
+    rows = session.execute(
+        select(results)
+        .order_by(
+            # 同分時新主題在前，同一主題內主題本身在前、回覆由舊到新
+            results.c.rank.desc(),
+            results.c.topic_id.desc(),
+            func.coalesce(results.c.comment_id, 0)
+        )
+        .offset((page - 1) * page_size)
+        .limit(page_size + 1)
+    ).all()
+    has_next = len(rows) > page_size
+
+    items = [
+        {
+            "type": row.type,
+            "topic_id": row.topic_id,
+            "comment_id": row.comment_id,
+            "title": row.title,
+            "snippet": make_snippet(row.content, keyword),
+            "rank": float(row.rank),
+        }
+        for row in rows[:page_size]
+    ]
+    pagination = {
+        "page": page,
+        "page_size": page_size,
+        "has_next": has_next,
+        "has_previous": page > 1
+    }
+    return items, pagination
+
+
+def _index_for(indexes, connection, target: SQLModel) -> Optional[NgramIndex]:
+    # 沒有 session 時（例如直接以 Core 寫入）無法在 commit 後套用，略過
+    if object_session(target) is None:
+        return None
+    return indexes.get(connection.engine)
+
+
+@event.listens_for(DiscussionTopic, "after_insert")
+@event.listens_for(DiscussionTopic, "after_update")
+def _topic_saved(mapper, connection, target: DiscussionTopic) -> None:
+    index = _index_for(_topic_indexes, connection, target)
+    state = inspect(target)
+    if index is None or not (
+        state.attrs.title.history.has_changes() or state.attrs.content.history.has_changes()
+    ):
+        return
+    # 未修改的欄位可能已過期，直接以同一連線讀取，避免在 flush 中觸發 lazy load
+    table = DiscussionTopic.__table__
+    row = connection.execute(
+        select(table.c.title, table.c.content).where(table.c.id == target.id)
+    ).one()
+    stage_index_change(object_session(target), index, target.id, {"title": row.title, "content": row.content})
+
+
+@event.listens_for(DiscussionTopic, "after_delete")
+def _topic_deleted(mapper, connection, target: DiscussionTopic) -> None:
+    index = _index_for(_topic_indexes, connection, target)
+    if index is not None:
+        stage_index_change(object_session(target), index, target.id)
+
+
+@event.listens_for(DiscussionComment, "after_insert")
+@event.listens_for(DiscussionComment, "after_update")
+def _comment_saved(mapper, connection, target: DiscussionComment) -> None:
+    index = _index_for(_comment_indexes, connection, target)
+    if index is not None and inspect(target).attrs.content.history.has_changes():
+        stage_index_change(object_session(target), index, target.id, {"content": target.content})
+
+
+@event.listens_for(DiscussionComment, "after_delete")
+def _comment_deleted(mapper, connection, target: DiscussionComment) -> None:
+    index = _index_for(_comment_indexes, connection, target)
+    if index is not None:
+        stage_index_change(object_session(target), index, target.id)
@@ -1,15 +1,58 @@
 # backend/app/services/discussion_service.py
-from typing import List
-from sqlmodel import Session, select
+from typing import Iterator, List, Optional, Sequence, Tuple
+from sqlalchemy import case, or_, update
+from sqlalchemy.orm import selectinload
+from sqlmodel import Session, func, select
 
+from app.core.pagination import after_cursor, encode_cursor
 from app.models.discussion import DiscussionTopic, DiscussionComment
 from app.schemas.discussion import DiscussionTopicCreate, DiscussionCommentCreate
+from app.services import comment_stream, dashboard_cache
 
 def get_topics_by_club(*, session: Session, club_id: int) -> List[DiscussionTopic]:
-    statement = select(DiscussionTopic).where(DiscussionTopic.club_id == club_id)
+    statement = select(DiscussionTopic).where(DiscussionTopic.club_id == club_id).order_by(DiscussionTopic.id)
     topics = session.exec(statement).all()
     return topics
 
+
+def list_topics(
+    *,
+    session: Session,
+    club_id: int,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None
+) -> Tuple[List[DiscussionTopic], Optional[str]]:
+    """
+    依最後活動時間（由新到舊）取得讀書會的討論主題，使用 ix_discussiontopic_club_id_last_activity_at
+
+    Args:
+        session: 資料庫 session
+        club_id: 讀書會 ID
+        limit: 每頁筆數，None 表示全部
+        cursor: 上一頁回傳的 next_cursor
+
+    Returns:
+        Tuple: (主題列表，含 author；下一頁游標，沒有下一頁時為 None)
+    """
+    statement = (
+        select(DiscussionTopic)
+        .where(DiscussionTopic.club_id == club_id)
+        .options(selectinload(DiscussionTopic.author))
+        .order_by(DiscussionTopic.last_activity_at.desc(), DiscussionTopic.id.desc())
+    )
+    if cursor:
+        statement = statement.where(
+            after_cursor(DiscussionTopic.last_activity_at, DiscussionTopic.id, cursor, descending=True)
+        )
+    if limit is None:
+        return list(session.exec(statement).all()), None
+
+    topics = list(session.exec(statement.limit(limit + 1)).all())
+    if len(topics) <= limit:
+        return topics, None
+    topics = topics[:limit]
+    return topics, encode_cursor(topics[-1].last_activity_at, topics[-1].id)
+
 def create_topic(*, session: Session, club_id: int, owner_id: int, topic_in: DiscussionTopicCreate) -> DiscussionTopic:
     topic = DiscussionTopic.from_orm(topic_in, update={
         "club_id": club_id,
@@ -31,9 +74,148 @@ def create_comment(*, session: Session, topic_id: int, owner_id: int, comment_in
         "owner_id": owner_id
     })
     
-    topic.comment_count += 1
-    session.add(topic)
     session.add(comment)
+    session.flush()
+
+    # 以單一 UPDATE 在資料庫端累加回覆數，並行回覆不會遺失計數，row lock 只持有到 commit；
+    # 最後活動資訊只往前推進，較舊的回覆不會覆蓋較新的
+    is_newer = or_(DiscussionTopic.last_comment_id.is_(None), DiscussionTopic.last_comment_id < comment.id)
+    session.exec(
+        update(DiscussionTopic)
+        .where(DiscussionTopic.id == topic_id)
+        .values(
+            comment_count=DiscussionTopic.comment_count + 1,
+            last_activity_at=case((is_newer, comment.created_at), else_=DiscussionTopic.last_activity_at),
+            last_comment_id=case((is_newer, comment.id), else_=DiscussionTopic.last_comment_id)
+        )
+        .execution_options(synchronize_session=False)
+    )
     session.commit()
     session.refresh(comment)
+    dashboard_cache.invalidate_user(owner_id)
+    comment_stream.publish_comment(comment)
     return comment
+
+
+def reconcile_comment_counts(
+    session: Session,
+    topic_ids: Optional[Sequence[int]] = None,
+    batch_size: int = 500
+) -> List[int]:
+    """
+    以 COUNT(discussioncomment) 校正主題的 comment_count
+
+    依 ID 順序分批處理（每批一次 commit），避免長時間鎖定整張表；每批以單一
+    UPDATE 寫入子查詢的計數，並行新增的回覆不會被重複計算。
+
+    Args:
+        session: 資料庫 session
+        topic_ids: 只校正指定的主題（None 表示全部）
+        batch_size: 每批處理的主題數量
+
+    Returns:
+        計數有偏差並已修正的主題 ID 列表
+    """
+    drifted: List[int] = []
+    last_id = 0
+    actual = (
+        select(func.count(DiscussionComment.id))
+        .where(DiscussionComment.topic_id == DiscussionTopic.id)
+        .correlate(DiscussionTopic)
+        .scalar_subquery()
+    )
+
+    while True:
+        # 鎖定本批主題：並行的 create_comment 須等校正 commit 後才能累加，
+        # 已累加但尚未 commit 的則由校正等待其 commit 後再計數
+        query = (
+            select(DiscussionTopic.id)
+            .where(DiscussionTopic.id > last_id)
+            .order_by(DiscussionTopic.id)
+            .limit(batch_size)
+            .with_for_update()
+        )
+        if topic_ids is not None:
+            query = query.where(DiscussionTopic.id.in_(topic_ids))
+        batch = session.exec(query).all()
+        if not batch:
+            break
+
+        # 計數與寫入在同一個 UPDATE 中完成，不以先前讀到的 comment_count 計算差值
+        result = session.execute(
+            update(DiscussionTopic)
+            .where(DiscussionTopic.id.in_(batch), DiscussionTopic.comment_count != actual)
+            .values(comment_count=actual)
+            .returning(DiscussionTopic.id)
+            .execution_options(synchronize_session=False)
+        )
+        drifted.extend(sorted(result.scalars().all()))
+
+        last_id = batch[-1]
+        session.commit()
+
+    return drifted
+
+
+# 回覆每頁預設筆數
+COMMENT_PAGE_SIZE = 50
+
+
+def _comments_statement(topic_id: int, cursor: Optional[str]):
+    """依 (created_at, id) 排序的回覆查詢，使用 ix_discussioncomment_topic_id_created_at_id"""
+    statement = (
+        select(DiscussionComment)
+        .where(DiscussionComment.topic_id == topic_id)
+        .options(selectinload(DiscussionComment.owner))
+        .order_by(DiscussionComment.created_at, DiscussionComment.id)
+    )
+    if cursor:
+        statement = statement.where(
+            after_cursor(DiscussionComment.created_at, DiscussionComment.id, cursor, descending=False)
+        )
+    return statement
+
+
+def list_comments(
+    *,
+    session: Session,
+    topic_id: int,
+    limit: Optional[int] = COMMENT_PAGE_SIZE,
+    cursor: Optional[str] = None
+) -> Tuple[List[DiscussionComment], Optional[str]]:
+    """
+    以游標分頁取得主題的回覆（由舊到新）
+
+    Args:
+        session: 資料庫 session
+        topic_id: 討論主題 ID
+        limit: 每頁筆數，None 表示全部
+        cursor: 上一頁回傳的 next_cursor
+
+    Returns:
+        Tuple: (回覆列表，含 owner；下一頁游標，沒有下一頁時為 None)
+    """
+    statement = _comments_statement(topic_id, cursor)
+    if limit is None:
+        return list(session.exec(statement).all()), None
+
+    comments = list(session.exec(statement.limit(limit + 1)).all())
+    if len(comments) <= limit:
+        return comments, None
+    comments = comments[:limit]
+    return comments, encode_cursor(comments[-1].created_at, comments[-1].id)
+
+
+def iter_comments(
+    *,
+    session: Session,
+    topic_id: int,
+    cursor: Optional[str] = None,
+    batch_size: int = 500
+) -> Iterator[DiscussionComment]:
+    """
+    逐筆產生主題的回覆（由舊到新），每次只從資料庫游標讀取 batch_size 筆，
+    不會一次把整個討論串載入記憶體
+    """
+    statement = _comments_statement(topic_id, cursor).execution_options(yield_per=batch_size)
+    yield from session.exec(statement)
@@ -1,7 +1,8 @@
+from collections import Counter
 from typing import Optional, Tuple
 from datetime import datetime, timezone
 from sqlmodel import Session, select, func, col
-from sqlalchemy import func as sql_func
+from sqlalchemy import func as sql_func, update
 from fastapi import HTTPException, status
 import re
 import math
@@ -9,10 +10,13 @@ import math
 from app.models.event import (
     Event, EventCreate, EventRead, EventUpdate, EventStatus, 
     EventParticipant, ParticipantStatus,
-    EventListItem, EventListResponse, PaginationMetadata, OrganizerInfo
+    EventListItem, EventListResponse, PaginationMetadata, CursorPaginationMetadata, OrganizerInfo
 )
 from app.models.book_club_member import BookClubMember
 from app.models.user import User
+from app.models.club_counters import apply_counter_deltas
+from app.core.pagination import after_cursor, encode_cursor
+from app.services import dashboard_cache
 
 
 def validate_event_datetime(event_datetime: datetime) -> None:
@@ -123,6 +127,7 @@ def create_event(
     session.add(event)
     session.commit()
     session.refresh(event)
+    dashboard_cache.invalidate_club(session, club_id)
     
     # 若 status = 'published'，觸發通知
     if event.status == EventStatus.PUBLISHED:
@@ -154,7 +159,10 @@ def list_events(
     page: int = 1,
     page_size: int = 20,
     sort_by: str = "event_datetime",
-    order: str = "asc"
+    order: str = "asc",
+    use_cursor: bool = False,
+    cursor: Optional[str] = None,
+    include_total: bool = False
 ) -> EventListResponse:
     """
     查詢讀書會活動列表
@@ -168,6 +176,9 @@ def list_events(
         page_size: 每頁筆數（最大 100）
         sort_by: 排序欄位
         order: 排序方向（asc/desc）
+        use_cursor: 改用 (排序欄位, id) 游標分頁，不使用 OFFSET
+        cursor: 游標分頁時上一頁回傳的 next_cursor
+        include_total: 游標分頁時是否計算總筆數
         
     Returns:
         EventListResponse: 活動列表 + 分頁資訊
@@ -222,35 +233,41 @@ def list_events(
     else:
         query = query.where(Event.status == EventStatus.PUBLISHED)
     
-    # 計算總數
-    count_query = select(func.count()).select_from(Event).where(Event.club_id == club_id)
-    if status_filter:
-        count_query = count_query.where(Event.status == status_filter)
-    else:
-        count_query = count_query.where(Event.status == EventStatus.PUBLISHED)
-    
-    total_items = session.exec(count_query).one()
-    total_pages = math.ceil(total_items / page_size) if total_items > 0 else 0
-    
-    # 排序
-    if sort_by == "event_datetime":
-        if order == "desc":
-            query = query.order_by(col(Event.event_datetime).desc())
-        else:
-            query = query.order_by(col(Event.event_datetime).asc())
-    elif sort_by == "created_at":
-        if order == "desc":
-            query = query.order_by(col(Event.created_at).desc())
+    # 計算總數（游標分頁時僅在要求時計算）
+    total_items = None
+    if not use_cursor or include_total:
+        count_query = select(func.count()).select_from(Event).where(Event.club_id == club_id)
+        if status_filter:
+            count_query = count_query.where(Event.status == status_filter)
         else:
-            query = query.order_by(col(Event.created_at).asc())
+            count_query = count_query.where(Event.status == EventStatus.PUBLISHED)
+        total_items = session.exec(count_query).one()
+    
+    # 排序（以 id 作為同值時的排序依據，確保分頁穩定）
+    sort_column = col(Event.created_at) if sort_by == "created_at" else col(Event.event_datetime)
+    descending = order == "desc"
+    if descending:
+        query = query.order_by(sort_column.desc(), col(Event.id).desc())
+    else:
+        query = query.order_by(sort_column.asc(), col(Event.id).asc())
     
     # 分頁
-    offset = (page - 1) * page_size
-    query = query.offset(offset).limit(page_size)
+    if use_cursor:
+        if cursor:
+            query = query.where(after_cursor(sort_column, col(Event.id), cursor, descending=descending))
+        query = query.limit(page_size + 1)
+    else:
+        offset = (page - 1) * page_size
+        query = query.offset(offset).limit(page_size)
     
     # ✨ 執行主查詢（只需 1 次查詢取得活動、發起人、參與人數）
     results = session.exec(query).all()
     
+    has_next = False
+    if use_cursor:
+        has_next = len(results) > page_size
+        results = results[:page_size]
+    
     # Step 3: 一次查詢取得當前用戶對所有活動的參與狀態
     event_ids = [result[0].id for result in results]
     user_participations = {}
@@ -289,6 +306,23 @@ def list_events(
             created_at=event.created_at
         ))
     
+    if use_cursor:
+        next_cursor = None
+        if has_next:
+            last_event = results[-1][0]
+            last_value = last_event.created_at if sort_by == "created_at" else last_event.event_datetime
+            next_cursor = encode_cursor(last_value, last_event.id)
+        return EventListResponse(
+            items=items,
+            pagination=CursorPaginationMetadata(
+                page_size=page_size,
+                next_cursor=next_cursor,
+                has_next=has_next,
+                total_items=total_items
+            )
+        )
+    
+    total_pages = math.ceil(total_items / page_size) if total_items > 0 else 0
     return EventListResponse(
         items=items,
         pagination=PaginationMetadata(
@@ -662,6 +696,7 @@ def update_event(
     session.add(event)
     session.commit()
     session.refresh(event)
+    dashboard_cache.invalidate_club(session, club_id)
     
     # 計算報名人數
     participant_count = session.exec(
@@ -765,3 +800,43 @@ def delete_event(
     # 刪除活動
     session.delete(event)
     session.commit()
+    dashboard_cache.invalidate_club(session, club_id)
+
+
+def complete_expired_events(session: Session, now: Optional[datetime] = None) -> int:
+    """
+    將時間已過的 PUBLISHED 活動批次轉為 COMPLETED
+    
+    以單一 UPDATE ... RETURNING 完成，不逐筆載入活動；批次 UPDATE 不會觸發
+    計數 hook，因此依回傳的 club_id 一併調整讀書會的活動計數欄位。
+    由背景排程（app.services.scheduled_jobs）定期呼叫。
+    
+    Args:
+        session: 資料庫 session
+        now: 判斷過期的時間點（預設為目前 UTC 時間）
+        
+    Returns:
+        int: 更新的活動數
+    """
+    now = now or datetime.utcnow()
+    
+    club_ids = session.execute(
+        update(Event)
+        .where(
+            Event.status == EventStatus.PUBLISHED,
+            Event.event_datetime < now
+        )
+        .values(status=EventStatus.COMPLETED, updated_at=now)
+        .returning(Event.club_id)
+        .execution_options(synchronize_session=False)
+    ).scalars().all()
+    
+    connection = session.connection()
+    for club_id, count in Counter(club_ids).items():
+        apply_counter_deltas(connection, club_id, {
+            "published_event_count": -count,
+            "completed_event_count": count
+        })
+    
+    session.commit()
+    return len(club_ids)
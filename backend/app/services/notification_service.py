@@ -1,10 +1,30 @@
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy import delete, insert, literal, update
 from sqlmodel import Session, select
-from app.models.notification import Notification, NotificationType
+from app.models.notification import Notification, NotificationArchive, NotificationType
+from app.models.notification_counters import apply_unread_delta, visible_to
 from app.models.event import Event
 from app.models.book_club_member import BookClubMember, MemberRole
 from app.models.club_join_request import ClubJoinRequest
 from app.models.book_club import BookClub
 from app.models.user import User
+from app.core.pubsub import get_broker
+
+
+# 活動通知 fan-out 後調整未讀數時，每個 UPDATE 帶入的收件人 ID 上限
+UNREAD_UPDATE_BATCH_SIZE = 1000
+
+
+def user_channel(user_id: int) -> str:
+    """個別用戶的即時通知頻道"""
+    return f"notifications:user:{user_id}"
+
+
+def club_channel(club_id: int) -> str:
+    """讀書會層級的即時通知頻道（fan-out 給全體成員的通知只發布一次）"""
+    return f"notifications:club:{club_id}"
 
 
 def notify_new_join_request(session: Session, club_id: int, request: ClubJoinRequest) -> None:
@@ -39,6 +59,7 @@ def notify_new_join_request(session: Session, club_id: int, request: ClubJoinReq
     for member in admins_and_owners:
         notification = Notification(
             recipient_id=member.user_id,
+            club_id=book_club.id,
             type=NotificationType.NEW_MEMBER,
             content={
                 "user_id": applicant.id,
@@ -50,39 +71,250 @@ def notify_new_join_request(session: Session, club_id: int, request: ClubJoinReq
         )
         session.add(notification)
     
+    recipient_ids = [member.user_id for member in admins_and_owners]
     session.commit()
+    
+    # commit 後通知連線中的收件人（SSE 串流）
+    for recipient_id in recipient_ids:
+        get_broker().publish(user_channel(recipient_id), {"type": NotificationType.NEW_MEMBER.value})
 
 
-def notify_event_created(session: Session, event: Event) -> None:
+def notify_event_created(session: Session, event: Event) -> int:
     """
     發送活動建立通知給讀書會所有成員
     
+    以單一 `INSERT INTO notification ... SELECT ... FROM bookclubmember ... RETURNING`
+    在資料庫內完成 fan-out，不載入成員物件，也不逐筆經過 ORM flush；
+    未讀數只為 RETURNING 回傳的收件人遞增。
+    
     Args:
         session: 資料庫 session
         event: 建立的活動
+        
+    Returns:
+        int: 建立的通知數
     """
-    # 查詢讀書會所有成員
-    members = session.exec(
-        select(BookClubMember)
-        .where(BookClubMember.book_club_id == event.club_id)
-    ).all()
+    table = Notification.__table__
+    content = {
+        "event_id": event.id,
+        "event_title": event.title,
+        "event_datetime": event.event_datetime.isoformat(),
+        "organizer_id": event.organizer_id,
+        "club_id": event.club_id
+    }
     
     # 為每個成員建立通知（排除活動發起人自己）
-    for member in members:
-        if member.user_id == event.organizer_id:
-            continue
-            
-        notification = Notification(
-            recipient_id=member.user_id,
-            type=NotificationType.EVENT_CREATED,
-            content={
-                "event_id": event.id,
-                "event_title": event.title,
-                "event_datetime": event.event_datetime.isoformat(),
-                "organizer_id": event.organizer_id,
-                "club_id": event.club_id
-            }
+    recipients = (
+        select(
+            BookClubMember.user_id,
+            literal(event.club_id, type_=table.c.club_id.type),
+            literal(NotificationType.EVENT_CREATED, type_=table.c.type.type),
+            literal(content, type_=table.c.content.type),
+            literal(False, type_=table.c.is_read.type),
+            literal(datetime.utcnow(), type_=table.c.created_at.type)
         )
-        session.add(notification)
+        .where(
+            BookClubMember.book_club_id == event.club_id,
+            BookClubMember.user_id != event.organizer_id
+        )
+    )
+    recipient_ids = session.execute(
+        insert(table).from_select(
+            ["recipient_id", "club_id", "type", "content", "is_read", "created_at"],
+            recipients
+        ).returning(table.c.recipient_id)
+    ).scalars().all()
     
+    # 批次 INSERT 不會觸發計數 hook。以 RETURNING 取得實際建立通知的收件人再調整未讀數，
+    # 不重新查詢成員：兩個語句之間加入或退出的成員會使兩組收件人不一致
+    user_table = User.__table__
+    for start in range(0, len(recipient_ids), UNREAD_UPDATE_BATCH_SIZE):
+        session.execute(
+            update(user_table)
+            .where(user_table.c.id.in_(recipient_ids[start:start + UNREAD_UPDATE_BATCH_SIZE]))
+            .values(unread_notification_count=user_table.c.unread_notification_count + 1)
+        )
     session.commit()
+    get_broker().publish(club_channel(event.club_id), {"type": NotificationType.EVENT_CREATED.value})
+    return len(recipient_ids)
+
+
+def list_visible_notifications(
+    session: Session,
+    user_id: int,
+    is_read: Optional[bool] = None,
+    limit: int = 20,
+    after_id: Optional[int] = None
+) -> List[Notification]:
+    """
+    列出用戶有權限查看的通知（依 id 由新到舊；指定 after_id 時改為取
+    id 大於 after_id 的通知，由舊到新）
+    
+    權限檢查以 LEFT JOIN bookclubmember (club_id, user_id) 在同一查詢中完成
+    （app.models.notification_counters.visible_to，與未讀計數共用同一組條件），
+    因此一定回傳最多 limit 筆「可見」的通知：
+    - NEW_MEMBER：用戶需為該讀書會的擁有者或管理員
+    - EVENT_CREATED：用戶需為該讀書會成員
+    - 其他類型：一律可見
+    
+    Args:
+        session: 資料庫 session
+        user_id: 用戶 ID
+        is_read: 篩選已讀/未讀通知（可選）
+        limit: 回傳數量上限
+        after_id: 只取 id 大於此值的通知（SSE 串流補發使用）
+        
+    Returns:
+        List[Notification]: 通知列表
+    """
+    query = visible_to(select(Notification), user_id)
+    
+    if is_read is not None:
+        query = query.where(Notification.is_read == is_read)
+    
+    if after_id is not None:
+        query = query.where(Notification.id > after_id).order_by(Notification.id.asc())
+    else:
+        query = query.order_by(Notification.id.desc())
+    return session.exec(query.limit(limit)).all()
+
+
+def get_unread_count(session: Session, user_id: int) -> int:
+    """
+    取得用戶可見的未讀通知數（讀取反正規化計數欄位，單一主鍵查詢；
+    計數的維護見 app.models.notification_counters）
+    
+    Args:
+        session: 資料庫 session
+        user_id: 用戶 ID
+        
+    Returns:
+        int: 未讀通知數
+    """
+    count = session.exec(
+        select(User.unread_notification_count).where(User.id == user_id)
+    ).first()
+    return count or 0
+
+
+def _mark_read(session: Session, user_id: int, *conditions) -> int:
+    # 只更新仍為未讀的列，依 RETURNING 的實際筆數扣減，
+    # 與其他標記已讀的請求並行時同一筆通知只會扣減一次
+    marked = session.execute(
+        update(Notification)
+        .where(Notification.recipient_id == user_id, Notification.is_read.is_(False), *conditions)
+        .values(is_read=True)
+        .returning(Notification.id)
+        .execution_options(synchronize_session=False)
+    ).scalars().all()
+    if marked:
+        apply_unread_delta(session.connection(), user_id, -len(marked))
+    session.commit()
+    return len(marked)
+
+
+def mark_as_read(session: Session, user_id: int, notification_id: int) -> bool:
+    """
+    將單一通知標記為已讀
+    
+    Args:
+        session: 資料庫 session
+        user_id: 用戶 ID（通知的收件人）
+        notification_id: 通知 ID
+        
+    Returns:
+        bool: 是否由未讀變為已讀（已讀時為 False）
+    """
+    # 未讀計數只包含可見的通知，看不到的通知改為已讀時不扣減計數
+    visible_ids = visible_to(select(Notification.id), user_id).where(Notification.id == notification_id)
+    if session.exec(visible_ids).first() is None:
+        marked = session.execute(
+            update(Notification)
+            .where(
+                Notification.id == notification_id,
+                Notification.recipient_id == user_id,
+                Notification.is_read.is_(False)
+            )
+            .values(is_read=True)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        session.commit()
+        return marked > 0
+    return _mark_read(session, user_id, Notification.id == notification_id) > 0
+
+
+def mark_all_as_read(session: Session, user_id: int) -> int:
+    """
+    將用戶所有未讀通知標記為已讀
+    
+    以單一 UPDATE 完成，並依實際更新筆數調整未讀計數。只標記可見的通知：
+    看不到的通知不在未讀計數中，重新可見（例如再次加入讀書會）時仍為未讀。
+    
+    Args:
+        session: 資料庫 session
+        user_id: 用戶 ID
+        
+    Returns:
+        int: 標記為已讀的通知數
+    """
+    return _mark_read(session, user_id, Notification.id.in_(visible_to(select(Notification.id), user_id)))
+
+
+def archive_read_notifications(
+    session: Session,
+    older_than_days: int = 90,
+    batch_size: int = 1000,
+    now: Optional[datetime] = None
+) -> int:
+    """
+    將超過保留期限的已讀通知搬移到 notification_archive
+    
+    依 id 分批處理，每批為一個獨立交易（INSERT ... SELECT 後 DELETE），
+    避免長時間鎖住 notification 表。未讀通知不會被封存，因此不影響未讀計數。
+    
+    Args:
+        session: 資料庫 session
+        older_than_days: 保留天數，建立時間早於此期限的已讀通知會被封存
+        batch_size: 每批處理的筆數
+        now: 計算期限的時間點（預設為目前 UTC 時間）
+        
+    Returns:
+        int: 封存的通知數
+    """
+    now = now or datetime.utcnow()
+    cutoff = now - timedelta(days=older_than_days)
+    columns = ["id", "content", "type", "is_read", "created_at", "club_id", "recipient_id"]
+    table = Notification.__table__
+    
+    archived = 0
+    last_id = 0
+    while True:
+        ids = session.exec(
+            select(Notification.id)
+            .where(
+                Notification.id > last_id,
+                Notification.is_read.is_(True),
+                Notification.created_at < cutoff
+            )
+            .order_by(Notification.id)
+            .limit(batch_size)
+        ).all()
+        if not ids:
+            break
+        
+        session.execute(
+            insert(NotificationArchive.__table__).from_select(
+                columns + ["archived_at"],
+                select(*[table.c[column] for column in columns], literal(now, type_=table.c.created_at.type))
+                .where(table.c.id.in_(ids))
+            )
+        )
+        session.execute(delete(table).where(table.c.id.in_(ids)))
+        session.commit()
+        
+        archived += len(ids)
+        last_id = ids[-1]
+        if len(ids) < batch_size:
+            break
+    
+    return archived
@@ -0,0 +1,149 @@
+# backend/app/services/notification_stream.py
+"""
+通知的 Server-Sent Events 串流
+
+連線時訂閱用戶自己的頻道與所屬讀書會的頻道；收到喚醒訊號後以
+id > 上次送出的 id 查詢新的可見通知並推送，因此訊號遺失或重新連線
+（since_id / Last-Event-ID）都不會漏掉通知。沒有新通知時只送 keep-alive
+註解，不查詢資料庫。
+
+加入或退出讀書會（BookClubMember 新增、刪除）commit 後，會在用戶頻道發布
+membership_changed，串流收到後重新讀取所屬讀書會並重新訂閱頻道。
+"""
+import json
+from typing import AsyncIterator, Awaitable, Callable, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session as OrmSession, object_session
+from sqlmodel import Session, func, select
+from starlette.concurrency import run_in_threadpool
+
+from app.core.pubsub import InProcessBroker, get_broker
+from app.models.book_club_member import BookClubMember
+from app.models.notification import Notification
+from app.schemas.notification import NotificationRead
+from app.services import notification_service
+
+# 無訊息時送出 keep-alive 的間隔（秒），避免代理伺服器關閉閒置連線
+HEARTBEAT_SECONDS = 15.0
+# 每次補發的最大筆數
+BATCH_SIZE = 100
+# 讀書會成員變更訊息（用戶頻道）
+MEMBERSHIP_CHANGED = "membership_changed"
+
+_PENDING_MEMBERSHIP_CHANGES = "notification_stream_membership_changes"
+
+
+def _read(session: Session, query_func, *args):
+    """在 thread pool 中執行查詢，完成後立即釋放連線（串流期間不佔用交易）"""
+    try:
+        return query_func(session, *args)
+    finally:
+        session.close()
+
+
+def _member_club_ids(session: Session, user_id: int) -> List[int]:
+    return session.exec(
+        select(BookClubMember.book_club_id).where(BookClubMember.user_id == user_id)
+    ).all()
+
+
+def _stream_setup(session: Session, user_id: int) -> tuple:
+    latest_id = session.exec(
+        select(func.max(Notification.id)).where(Notification.recipient_id == user_id)
+    ).one()
+    return _member_club_ids(session, user_id), latest_id or 0
+
+
+def _channels(user_id: int, club_ids: List[int]) -> List[str]:
+    return [notification_service.user_channel(user_id)] + [
+        notification_service.club_channel(club_id) for club_id in club_ids
+    ]
+
+
+def _new_notifications(session: Session, user_id: int, after_id: int) -> List[dict]:
+    notifications = notification_service.list_visible_notifications(
+        session, user_id, limit=BATCH_SIZE, after_id=after_id
+    )
+    return [NotificationRead.model_validate(n).model_dump(mode="json") for n in notifications]
+
+
+def format_event(notification: dict) -> str:
+    """將通知格式化為 SSE 事件（id 供用戶端以 Last-Event-ID 續傳）"""
+    data = json.dumps(notification, ensure_ascii=False, separators=(",", ":"))
+    return f"id: {notification['id']}\nevent: notification\ndata: {data}\n\n"
+
+
+async def notification_events(
+    session: Session,
+    user_id: int,
+    since_id: Optional[int] = None,
+    broker: Optional[InProcessBroker] = None,
+    is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None,
+    heartbeat_seconds: float = HEARTBEAT_SECONDS
+) -> AsyncIterator[str]:
+    """
+    產生通知 SSE 事件
+
+    Args:
+        session: 資料庫 session（每次查詢後關閉，之後可再次使用）
+        user_id: 用戶 ID
+        since_id: 只推送 id 大於此值的通知；未指定時只推送連線後的新通知
+        broker: pub/sub broker（預設為 get_broker()）
+        is_disconnected: 檢查用戶端是否已斷線
+        heartbeat_seconds: keep-alive 間隔
+
+    Yields:
+        str: SSE 格式的字串
+    """
+    broker = broker or get_broker()
+    club_ids, latest_id = await run_in_threadpool(_read, session, _stream_setup, user_id)
+
+    # 先訂閱再補發，避免補發與訂閱之間的通知遺失
+    subscription = broker.subscribe(_channels(user_id, club_ids))
+    last_id = latest_id if since_id is None else since_id
+    try:
+        yield f"retry: {int(heartbeat_seconds * 1000)}\n\n"
+        pending = since_id is not None
+        while True:
+            while pending:
+                notifications = await run_in_threadpool(_read, session, _new_notifications, user_id, last_id)
+                for notification in notifications:
+                    last_id = notification["id"]
+                    yield format_event(notification)
+                pending = len(notifications) == BATCH_SIZE
+
+            message = await subscription.get(timeout=heartbeat_seconds)
+            if is_disconnected is not None and await is_disconnected():
+                break
+            if message is None:
+                yield ": keep-alive\n\n"
+                continue
+            if message.get("type") == MEMBERSHIP_CHANGED:
+                # 改訂閱目前所屬的讀書會；重新訂閱期間的訊息由下方的補發查詢涵蓋
+                club_ids = await run_in_threadpool(_read, session, _member_club_ids, user_id)
+                subscription.close()
+                subscription = broker.subscribe(_channels(user_id, club_ids))
+            pending = True
+    finally:
+        subscription.close()
+
+
+@event.listens_for(BookClubMember, "after_insert")
+@event.listens_for(BookClubMember, "after_delete")
+def _membership_changed(mapper, connection, target: BookClubMember) -> None:
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_PENDING_MEMBERSHIP_CHANGES, set()).add(target.user_id)
+
+
+@event.listens_for(OrmSession, "after_commit")
+def _publish_membership_changes(session) -> None:
+    user_ids = session.info.pop(_PENDING_MEMBERSHIP_CHANGES, None)
+    for user_id in user_ids or ():
+        get_broker().publish(notification_service.user_channel(user_id), {"type": MEMBERSHIP_CHANGED})
+
+
+@event.listens_for(OrmSession, "after_rollback")
+def _discard_membership_changes(session) -> None:
+    session.info.pop(_PENDING_MEMBERSHIP_CHANGES, None)
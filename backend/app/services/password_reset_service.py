@@ -1,12 +1,14 @@
 import secrets
 from datetime import datetime, timedelta, timezone
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from sqlmodel import Session, select
 from fastapi import HTTPException, status
+from starlette.concurrency import run_in_threadpool
 
 from app.models.user import User
 from app.models.password_reset import PasswordResetToken
 from app.core.security import hash_password, verify_password
+from app.core.password_hasher import password_hasher
 
 
 class PasswordResetService:
@@ -128,6 +130,44 @@ class PasswordResetService:
         Raises:
             HTTPException: Token 無效或密碼不符合要求
         """
+        user, reset_token = PasswordResetService._load_reset_target(session, token, new_password)
+        PasswordResetService._ensure_password_changed(verify_password(new_password, user.password_hash))
+        return PasswordResetService._apply_new_password(
+            session, user, reset_token, hash_password(new_password)
+        )
+
+    @staticmethod
+    async def reset_password_async(
+        session: Session,
+        token: str,
+        new_password: str
+    ) -> User:
+        """
+        與 reset_password 相同，但 bcrypt 驗證與雜湊交給 password_hasher 的
+        process pool，資料庫操作則在 thread pool 執行
+
+        Raises:
+            HTTPException: Token 無效或密碼不符合要求
+            PasswordHasherBusy: 雜湊工作佇列已滿
+        """
+        user, reset_token = await run_in_threadpool(
+            PasswordResetService._load_reset_target, session, token, new_password
+        )
+        PasswordResetService._ensure_password_changed(
+            await password_hasher.verify(new_password, user.password_hash)
+        )
+        password_hash = await password_hasher.hash(new_password)
+        return await run_in_threadpool(
+            PasswordResetService._apply_new_password, session, user, reset_token, password_hash
+        )
+
+    @staticmethod
+    def _load_reset_target(
+        session: Session,
+        token: str,
+        new_password: str
+    ) -> Tuple[User, PasswordResetToken]:
+        """驗證 Token 與新密碼格式，回傳 (用戶, Token)"""
         # 驗證 Token
         verification_result = PasswordResetService.verify_reset_token(session, token)
         if not verification_result["valid"]:
@@ -152,17 +192,29 @@ class PasswordResetService:
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="密碼長度至少 8 個字元"
             )
-        
+        return user, reset_token
+
+    @staticmethod
+    def _ensure_password_changed(same_as_old: bool) -> None:
         # 檢查新密碼是否與舊密碼相同
-        if verify_password(new_password, user.password_hash):
+        if same_as_old:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="新密碼不能與舊密碼相同"
             )
-        
+
+    @staticmethod
+    def _apply_new_password(
+        session: Session,
+        user: User,
+        reset_token: PasswordResetToken,
+        password_hash: str
+    ) -> User:
         # 更新密碼
-        user.password_hash = hash_password(new_password)
+        user.password_hash = password_hash
         user.updated_at = datetime.utcnow()
+        # 使重設前簽發的 token 失效
+        user.token_version += 1
         
         # 標記 Token 為已使用
         reset_token.used = True
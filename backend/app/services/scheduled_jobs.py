@@ -0,0 +1,147 @@
+# backend/app/services/scheduled_jobs.py
+"""
+背景排程工作
+
+每個工作自行開啟 session，並在 PostgreSQL 上以 advisory lock 確保多個
+worker process 同時只有一個執行者；其他資料庫直接執行。
+"""
+import os
+import zlib
+from contextlib import contextmanager
+from typing import Iterator
+
+from sqlalchemy import text
+from sqlmodel import Session
+
+from app.core.logging_config import app_logger
+from app.core.password_hasher import password_hasher
+from app.core.scheduler import Scheduler
+from app.db.session import engine
+from app.services import discussion_service, event_service, notification_service
+
+# 過期活動掃描間隔（秒）
+EXPIRED_EVENT_SWEEP_INTERVAL_SECONDS = float(os.getenv("EXPIRED_EVENT_SWEEP_INTERVAL_SECONDS", "60"))
+# 通知封存工作的執行間隔（秒）與已讀通知保留天數
+NOTIFICATION_RETENTION_INTERVAL_SECONDS = float(os.getenv("NOTIFICATION_RETENTION_INTERVAL_SECONDS", "3600"))
+NOTIFICATION_RETENTION_DAYS = int(os.getenv("NOTIFICATION_RETENTION_DAYS", "90"))
+# 討論主題回覆數校正間隔（秒）
+COMMENT_COUNT_RECONCILE_INTERVAL_SECONDS = float(os.getenv("COMMENT_COUNT_RECONCILE_INTERVAL_SECONDS", "3600"))
+# 密碼雜湊執行器統計寫入日誌的間隔（秒）
+PASSWORD_HASH_METRICS_INTERVAL_SECONDS = float(os.getenv("PASSWORD_HASH_METRICS_INTERVAL_SECONDS", "300"))
+
+
+def _lock_key(job_name: str) -> int:
+    return zlib.crc32(job_name.encode("utf-8"))
+
+
+def try_acquire_job_lock(session: Session, job_name: str) -> bool:
+    """
+    嘗試取得工作的單一執行者鎖（交易結束時自動釋放）
+    
+    Returns:
+        bool: 是否取得鎖；非 PostgreSQL 時一律為 True
+    """
+    if session.get_bind().dialect.name != "postgresql":
+        return True
+    return bool(session.execute(
+        text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": _lock_key(job_name)}
+    ).scalar())
+
+
+@contextmanager
+def held_job_lock(session: Session, job_name: str) -> Iterator[bool]:
+    """
+    跨多個交易持有的單一執行者鎖（分批 commit 的工作使用）
+    
+    以獨立連線取得 session 層級 advisory lock，工作結束後釋放。
+    
+    Yields:
+        bool: 是否取得鎖；非 PostgreSQL 時一律為 True
+    """
+    bind = session.get_bind()
+    if bind.dialect.name != "postgresql":
+        yield True
+        return
+    key = _lock_key(job_name)
+    with bind.connect() as connection:
+        acquired = bool(connection.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": key}).scalar())
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": key})
+
+
+def complete_expired_events_job(session: Session) -> int:
+    """將過期的已發布活動轉為 COMPLETED（其他 worker 執行中時略過）"""
+    if not try_acquire_job_lock(session, "complete_expired_events"):
+        return 0
+    updated = event_service.complete_expired_events(session)
+    if updated:
+        app_logger.info(f"Completed {updated} expired events")
+    return updated
+
+
+def archive_notifications_job(session: Session) -> int:
+    """封存超過保留期限的已讀通知（其他 worker 執行中時略過）"""
+    with held_job_lock(session, "archive_notifications") as acquired:
+        if not acquired:
+            return 0
+        archived = notification_service.archive_read_notifications(
+            session, older_than_days=NOTIFICATION_RETENTION_DAYS
+        )
+    if archived:
+        app_logger.info(f"Archived {archived} read notifications")
+    return archived
+
+
+def reconcile_comment_counts_job(session: Session) -> int:
+    """校正討論主題的 comment_count（其他 worker 執行中時略過）"""
+    with held_job_lock(session, "reconcile_comment_counts") as acquired:
+        if not acquired:
+            return 0
+        drifted = discussion_service.reconcile_comment_counts(session)
+    if drifted:
+        app_logger.warning(f"Reconciled comment_count for {len(drifted)} topics: {drifted[:20]}")
+    return len(drifted)
+
+
+def log_password_hasher_metrics_job() -> dict:
+    """將本 process 的密碼雜湊執行器統計寫入日誌（每個 process 各自執行，不需要鎖）"""
+    metrics = password_hasher.metrics()
+    if metrics["completed"] or metrics["rejected"] or metrics["in_flight"]:
+        app_logger.info(f"Password hasher metrics: {metrics}")
+    return metrics
+
+
+def _with_session(job):
+    def run() -> None:
+        with Session(engine) as session:
+            job(session)
+    return run
+
+
+def create_scheduler() -> Scheduler:
+    """建立包含所有背景工作的排程器"""
+    scheduler = Scheduler()
+    scheduler.add_job(
+        "complete_expired_events",
+        EXPIRED_EVENT_SWEEP_INTERVAL_SECONDS,
+        _with_session(complete_expired_events_job)
+    )
+    scheduler.add_job(
+        "archive_notifications",
+        NOTIFICATION_RETENTION_INTERVAL_SECONDS,
+        _with_session(archive_notifications_job)
+    )
+    scheduler.add_job(
+        "reconcile_comment_counts",
+        COMMENT_COUNT_RECONCILE_INTERVAL_SECONDS,
+        _with_session(reconcile_comment_counts_job)
+    )
+    scheduler.add_job(
+        "log_password_hasher_metrics",
+        PASSWORD_HASH_METRICS_INTERVAL_SECONDS,
+        log_password_hasher_metrics_job
+    )
+    return scheduler
@@ -1,4 +1,4 @@
-from typing import List, Optional, Tuple
+from typing import List, Optional, Tuple, Union
 from sqlmodel import Session, select, func
 from datetime import datetime
 
@@ -6,7 +6,8 @@ from app.models.event import Event, EventStatus, EventParticipant
 from app.models.book_club import BookClub
 from app.models.book_club_member import BookClubMember
 from app.schemas.user_event import UserEventRead
-from app.schemas.pagination import PaginationMeta
+from app.schemas.pagination import PaginationMeta, CursorPaginationMeta
+from app.core.pagination import after_cursor, encode_cursor
 
 
 def get_user_club_events(
@@ -16,8 +17,11 @@ def get_user_club_events(
     page_size: int = 20,
     status: Optional[EventStatus] = None,
     participation: Optional[str] = None,
-    club_id: Optional[int] = None
-) -> Tuple[List[UserEventRead], PaginationMeta]:
+    club_id: Optional[int] = None,
+    use_cursor: bool = False,
+    cursor: Optional[str] = None,
+    include_total: bool = False
+) -> Tuple[List[UserEventRead], Union[PaginationMeta, CursorPaginationMeta]]:
     """
     獲取使用者參與讀書會的所有活動
     
@@ -29,6 +33,9 @@ def get_user_club_events(
         status: 活動狀態篩選 (published/completed/cancelled)
         participation: 參與狀態篩選 (all/registered/not_registered)
         club_id: 讀書會 ID 篩選
+        use_cursor: 改用 (event_datetime, id) 游標分頁，不使用 OFFSET
+        cursor: 游標分頁時上一頁回傳的 next_cursor
+        include_total: 游標分頁時是否計算總筆數
     
     Returns:
         (活動列表, 分頁資訊)
@@ -60,27 +67,39 @@ def get_user_club_events(
     if club_id:
         query = query.where(Event.club_id == club_id)
     
-    # 4. 按活動時間排序（未來活動優先，然後是最近結束的）
-    query = query.order_by(Event.event_datetime.asc())
+    # 4. 按活動時間排序（未來活動優先，然後是最近結束的；同時間以 id 排序）
+    query = query.order_by(Event.event_datetime.asc(), Event.id.asc())
     
-    # 5. 計算總數（用於分頁）
-    count_query = select(func.count()).select_from(
-        select(Event.id)
-        .where(Event.club_id.in_(user_club_ids_query))
-    )
-    if status:
-        count_query = count_query.where(Event.status == status)
-    if club_id:
-        count_query = count_query.where(Event.club_id == club_id)
-    
-    total_items = session.exec(count_query).one()
+    # 5. 計算總數（用於分頁；游標分頁時僅在要求時計算）
+    total_items = None
+    if not use_cursor or include_total:
+        count_query = select(func.count()).select_from(
+            select(Event.id)
+            .where(Event.club_id.in_(user_club_ids_query))
+        )
+        if status:
+            count_query = count_query.where(Event.status == status)
+        if club_id:
+            count_query = count_query.where(Event.club_id == club_id)
+        
+        total_items = session.exec(count_query).one()
     
     # 6. 分頁
-    offset = (page - 1) * page_size
-    query = query.offset(offset).limit(page_size)
+    if use_cursor:
+        if cursor:
+            query = query.where(after_cursor(Event.event_datetime, Event.id, cursor, descending=False))
+        query = query.limit(page_size + 1)
+    else:
+        offset = (page - 1) * page_size
+        query = query.offset(offset).limit(page_size)
     
     results = session.exec(query).all()
     
+    has_next = False
+    if use_cursor:
+        has_next = len(results) > page_size
+        results = results[:page_size]
+    
     # 7. 查詢使用者參與狀態
     event_ids = [result[0].id for result in results]
     user_participations = {}
@@ -123,6 +142,18 @@ def get_user_club_events(
         ))
     
     # 9. 建立分頁資訊
+    if use_cursor:
+        next_cursor = None
+        if has_next:
+            last_event = results[-1][0]
+            next_cursor = encode_cursor(last_event.event_datetime, last_event.id)
+        return events, CursorPaginationMeta(
+            page_size=page_size,
+            next_cursor=next_cursor,
+            has_next=has_next,
+            total_items=total_items
+        )
+    
     total_pages = (total_items + page_size - 1) // page_size
     pagination = PaginationMeta(
         page=page,
@@ -4,11 +4,13 @@ from typing import Optional
 from datetime import datetime, timedelta
 import time
 from fastapi import UploadFile
+from starlette.concurrency import run_in_threadpool
 from PIL import Image
 
 from app.models.user import User, UserCreate
 from app.models.interest_tag import InterestTag
 from app.core.security import hash_password, verify_password
+from app.core.password_hasher import password_hasher
 from app.core.cloudinary_config import upload_image, delete_image, extract_public_id_from_url
 
 # Account protection settings
@@ -20,8 +22,10 @@ class UserService:
     def __init__(self, session: Session):
         self.session = session
 
-    def create(self, user_data: UserCreate) -> User:
-        password_hash = hash_password(user_data.password)
+    def create(self, user_data: UserCreate, password_hash: Optional[str] = None) -> User:
+        """建立使用者；password_hash 可由呼叫端預先以 password_hasher 計算"""
+        if password_hash is None:
+            password_hash = hash_password(user_data.password)
         db_user = User(
             email=user_data.email,
             display_name=user_data.display_name,
@@ -43,6 +47,28 @@ class UserService:
         return user
 
     def authenticate(self, email: str, password: str) -> Optional[User]:
+        user = self._begin_login(email)
+        if not user:
+            return None
+        return self._finish_login(user, verify_password(password, user.password_hash))
+
+    async def authenticate_async(self, email: str, password: str) -> Optional[User]:
+        """
+        與 authenticate 相同，但 bcrypt 驗證交給 password_hasher 的 process pool，
+        資料庫操作則在 thread pool 執行，不阻塞 event loop
+
+        Raises:
+            ValueError: 帳號已鎖定或尚未完成 Email 驗證
+            PasswordHasherBusy: 雜湊工作佇列已滿
+        """
+        user = await run_in_threadpool(self._begin_login, email)
+        if not user:
+            return None
+        password_ok = await password_hasher.verify(password, user.password_hash)
+        return await run_in_threadpool(self._finish_login, user, password_ok)
+
+    def _begin_login(self, email: str) -> Optional[User]:
+        """檢查帳號鎖定狀態，回傳可進行密碼驗證的使用者"""
         user = self.get_by_email(email)
         if not user:
             return None
@@ -60,9 +86,11 @@ class UserService:
         
         if not user.password_hash:
             return None
-        
-        # Verify password
-        if not verify_password(password, user.password_hash):
+        return user
+
+    def _finish_login(self, user: User, password_ok: bool) -> Optional[User]:
+        """依密碼驗證結果更新失敗次數與鎖定狀態"""
+        if not password_ok:
             # Increment failed attempts counter
             user.failed_login_attempts += 1
             if user.failed_login_attempts >= MAX_FAILED_ATTEMPTS:
@@ -211,5 +239,7 @@ class UserService:
 
     def deactivate_account(self, user: User) -> None:
         user.is_active = False
+        # 使已簽發的 token 失效
+        user.token_version += 1
         self.session.add(user)
         self.session.commit()
\ No newline at end of file
@@ -0,0 +1,27 @@
+"""
+讀書會計數欄位校正腳本
+執行方式: docker-compose exec web python reconcile_club_counters.py [club_id ...]
+
+重新計算每個讀書會的成員數與活動數，修正與實際資料不一致的計數欄位。
+未指定 club_id 時校正全部讀書會。
+"""
+import sys
+
+from sqlmodel import Session
+from app.db.session import engine
+from app.services.club_counter_service import reconcile_club_counters
+
+
+def main(argv: list[str]) -> None:
+    club_ids = [int(arg) for arg in argv] or None
+    with Session(engine) as session:
+        print("🔄 開始校正讀書會計數欄位...")
+        drifted = reconcile_club_counters(session, club_ids=club_ids)
+        if drifted:
+            print(f"⚠️ 修正了 {len(drifted)} 個讀書會: {drifted}")
+        else:
+            print("✅ 所有計數欄位皆正確")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -3,13 +3,15 @@ import pytest
 from typing import Generator, Any
 
 from fastapi.testclient import TestClient
+from sqlalchemy import event
 from sqlmodel import Session, SQLModel, create_engine
 from sqlmodel.pool import StaticPool
 
 from app.main import app
 from app.db.session import get_session
-from app.core.security import get_current_user, create_access_token
+from app.core.security import Principal, get_current_principal, get_current_user, create_access_token
 from app.models.user import User
+from app.services import auth_cache, dashboard_cache
 
 
 @pytest.fixture(name="session")
@@ -24,6 +26,43 @@ def session_fixture() -> Generator[Session, Any, None]:
     SQLModel.metadata.drop_all(engine)
 
 
+@pytest.fixture(autouse=True)
+def clear_process_caches() -> Generator[None, Any, None]:
+    """Keep the process-wide dashboard and auth caches from leaking between tests."""
+    dashboard_cache.clear()
+    auth_cache.clear()
+    yield
+    dashboard_cache.clear()
+    auth_cache.clear()
+
+
+class QueryCounter:
+    """Context manager that records every SQL statement sent to an engine."""
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements: list[str] = []
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def __enter__(self) -> "QueryCounter":
+        event.listen(self.engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        event.remove(self.engine, "before_cursor_execute", self._record)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+
+@pytest.fixture(name="query_counter")
+def query_counter_fixture(session: Session):
+    """Return a factory producing QueryCounter instances bound to the test engine."""
+    return lambda: QueryCounter(session.get_bind())
+
+
 @pytest.fixture(name="client")
 def client_fixture(session: Session) -> Generator[TestClient, Any, None]:
     """Create a TestClient that uses the in-memory database without auth."""
@@ -49,6 +88,7 @@ def authenticated_client_fixture(
 
     app.dependency_overrides[get_session] = get_session_override
     app.dependency_overrides[get_current_user] = get_current_user_override
+    app.dependency_overrides[get_current_principal] = lambda: Principal.from_user(test_user_for_auth)
     client = TestClient(app)
     yield client
     app.dependency_overrides.clear()
@@ -1,9 +1,16 @@
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import WebSocketDisconnect, status
 from fastapi.testclient import TestClient
-from sqlmodel import Session
+from sqlmodel import Session, select
 
 from app.models.user import User
 from app.models.book_club import BookClub
 from app.models.book_club_member import BookClubMember, MemberRole
+from app.models.discussion import DiscussionComment, DiscussionTopic
+from app.services import comment_stream
 
 
 def test_create_discussion_topic(authenticated_client: TestClient, session: Session, test_user_for_auth: User, auth_headers: dict):
@@ -100,4 +107,161 @@ def test_create_discussion_comment(authenticated_client: TestClient, session: Se
     assert response.status_code == 200
     data = response.json()
     assert data["content"] == "Test Comment"
-    assert data["owner_id"] == test_user_for_auth.id
\ No newline at end of file
+    assert data["owner_id"] == test_user_for_auth.id
+
+def _topic_with_comments(session: Session, user: User, count: int) -> tuple:
+    club = BookClub(name="Busy Club", description="Lots of replies", owner_id=user.id)
+    session.add(club)
+    session.commit()
+    session.add(BookClubMember(book_club_id=club.id, user_id=user.id, role=MemberRole.MEMBER))
+    topic = DiscussionTopic(title="Busy Topic", content="...", club_id=club.id, owner_id=user.id)
+    session.add(topic)
+    session.commit()
+    base = datetime(2026, 1, 1)
+    for i in range(count):
+        # 每兩筆共用同一個 created_at，驗證以 id 作為同值排序依據
+        session.add(DiscussionComment(
+            content=f"reply {i}", topic_id=topic.id, owner_id=user.id,
+            created_at=base + timedelta(minutes=i // 2)
+        ))
+    session.commit()
+    return club, topic
+
+
+def test_list_discussion_comments_with_cursor(authenticated_client: TestClient, session: Session, test_user_for_auth: User, auth_headers: dict):
+    club, topic = _topic_with_comments(session, test_user_for_auth, 5)
+    url = f"/api/v1/clubs/{club.id}/discussions/{topic.id}/comments"
+
+    contents, cursor = [], None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        data = authenticated_client.get(url, headers=auth_headers, params=params).json()
+        contents += [item["content"] for item in data["items"]]
+        assert data["items"][0]["author"]["id"] == test_user_for_auth.id
+        cursor = data["pagination"]["next_cursor"]
+        if not data["pagination"]["has_next"]:
+            break
+
+    assert contents == [f"reply {i}" for i in range(5)]
+    assert authenticated_client.get(url, headers=auth_headers, params={"cursor": "bad"}).status_code == 400
+
+
+def test_discussion_comments_ndjson_stream(authenticated_client: TestClient, session: Session, test_user_for_auth: User, auth_headers: dict):
+    club, topic = _topic_with_comments(session, test_user_for_auth, 5)
+    url = f"/api/v1/clubs/{club.id}/discussions/{topic.id}/comments"
+    first_page = authenticated_client.get(url, headers=auth_headers, params={"limit": 2}).json()
+
+    response = authenticated_client.get(
+        url, headers=auth_headers,
+        params={"format": "ndjson", "cursor": first_page["pagination"]["next_cursor"]}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["content"] for line in lines] == ["reply 2", "reply 3", "reply 4"]
+
+
+def test_get_discussion_topic_with_comment_limit(authenticated_client: TestClient, session: Session, test_user_for_auth: User, auth_headers: dict):
+    club, topic = _topic_with_comments(session, test_user_for_auth, 3)
+    url = f"/api/v1/clubs/{club.id}/discussions/{topic.id}"
+
+    limited = authenticated_client.get(url, headers=auth_headers, params={"comment_limit": 2}).json()
+    assert [c["content"] for c in limited["comments"]] == ["reply 0", "reply 1"]
+    assert limited["comments_next_cursor"] is not None
+
+    full = authenticated_client.get(url, headers=auth_headers).json()
+    assert len(full["comments"]) == 3
+    assert full["comments_next_cursor"] is None
+
+
+def test_list_discussion_topics_by_last_activity(authenticated_client: TestClient, session: Session, test_user_for_auth: User, auth_headers: dict):
+    club = BookClub(name="Active Club", description="Ordering", owner_id=test_user_for_auth.id)
+    session.add(club)
+    session.commit()
+    session.add(BookClubMember(book_club_id=club.id, user_id=test_user_for_auth.id, role=MemberRole.MEMBER))
+    base = datetime(2026, 1, 1)
+    for i in range(5):
+        session.add(DiscussionTopic(
+            title=f"Topic {i}", content="...", club_id=club.id, owner_id=test_user_for_auth.id,
+            last_activity_at=base + timedelta(minutes=i)
+        ))
+    session.commit()
+    url = f"/api/v1/clubs/{club.id}/discussions"
+
+    # 回覆後主題移到最前面
+    oldest = session.exec(select(DiscussionTopic).where(DiscussionTopic.title == "Topic 0")).one()
+    response = authenticated_client.post(f"{url}/{oldest.id}/comments", headers=auth_headers, json={"content": "bump"})
+    assert response.status_code == 200
+
+    titles = [topic["title"] for topic in authenticated_client.get(url, headers=auth_headers).json()]
+    assert titles == ["Topic 0", "Topic 4", "Topic 3", "Topic 2", "Topic 1"]
+
+    paged, cursor = [], None
+    while True:
+        params = {"use_cursor": True, "page_size": 2, **({"cursor": cursor} if cursor else {})}
+        data = authenticated_client.get(url, headers=auth_headers, params=params).json()
+        paged += [topic["title"] for topic in data["items"]]
+        cursor = data["pagination"]["next_cursor"]
+        if not data["pagination"]["has_next"]:
+            break
+    assert paged == titles
+    assert authenticated_client.get(url, headers=auth_headers, params={"cursor": "bad"}).status_code == 400
+
+
+def _stream_ticket(client: TestClient, auth_headers: dict) -> str:
+    response = client.post("/api/v1/auth/stream-ticket", headers=auth_headers)
+    assert response.status_code == 200
+    return response.json()["ticket"]
+
+
+def test_discussion_live_updates_websocket(authenticated_client: TestClient, session: Session, test_user_for_auth: User, auth_headers: dict):
+    club, topic = _topic_with_comments(session, test_user_for_auth, 1)
+    ticket = _stream_ticket(authenticated_client, auth_headers)
+    url = f"/api/v1/clubs/{club.id}/discussions/{topic.id}"
+
+    with authenticated_client.websocket_connect(f"{url}/live?ticket={ticket}&since_id=0") as websocket:
+        # 先收到補發的既有回覆，代表已完成訂閱
+        assert websocket.receive_json()["comment"]["content"] == "reply 0"
+
+        response = authenticated_client.post(f"{url}/comments", headers=auth_headers, json={"content": "live reply"})
+        assert response.status_code == 200
+
+        pushed = websocket.receive_json()
+        assert pushed["type"] == "comment"
+        assert pushed["comment"]["id"] == response.json()["id"]
+        assert pushed["comment"]["author"]["id"] == test_user_for_auth.id
+
+
+def test_discussion_live_updates_rejects_invalid_ticket_and_excess_connections(authenticated_client: TestClient, session: Session, test_user_for_auth: User, auth_headers: dict, monkeypatch):
+    club, topic = _topic_with_comments(session, test_user_for_auth, 0)
+    url = f"/api/v1/clubs/{club.id}/discussions/{topic.id}/live"
+    ticket = _stream_ticket(authenticated_client, auth_headers)
+
+    # 握手完成後才以關閉代碼拒絕，用戶端可讀到原因；access token 不能當作串流票證
+    access_token = auth_headers["Authorization"].split(" ", 1)[1]
+    for invalid in ("invalid", access_token):
+        with authenticated_client.websocket_connect(f"{url}?ticket={invalid}") as websocket:
+            with pytest.raises(WebSocketDisconnect) as exc_info:
+                websocket.receive_json()
+        assert exc_info.value.code == status.WS_1008_POLICY_VIOLATION
+
+    monkeypatch.setattr(comment_stream, "connection_limiter", comment_stream.ConnectionLimiter(max_per_topic=1))
+    with authenticated_client.websocket_connect(f"{url}?ticket={ticket}"):
+        with authenticated_client.websocket_connect(f"{url}?ticket={ticket}") as rejected:
+            with pytest.raises(WebSocketDisconnect) as exc_info:
+                rejected.receive_json()
+        assert exc_info.value.code == status.WS_1013_TRY_AGAIN_LATER
+    assert comment_stream.connection_limiter.active() == 0
+
+
+def test_search_discussions(authenticated_client: TestClient, session: Session, test_user_for_auth: User, auth_headers: dict):
+    club, topic = _topic_with_comments(session, test_user_for_auth, 3)
+    url = f"/api/v1/clubs/{club.id}/discussions/search"
+
+    response = authenticated_client.get(url, headers=auth_headers, params={"q": "reply 1"})
+    assert response.status_code == 200
+    data = response.json()
+    assert [(item["type"], item["topic_id"], item["snippet"]) for item in data["items"]] == [("comment", topic.id, "reply 1")]
+    assert data["pagination"]["has_next"] is False
+
+    assert authenticated_client.get(url, headers=auth_headers, params={"q": "  "}).status_code == 400
@@ -392,6 +392,54 @@ class TestListEventsAPI:
         assert len(data["items"]) == 10
         assert data["pagination"]["page"] == 2
     
+    def test_list_events_cursor_pagination(
+        self, session: Session, authenticated_client: TestClient, test_club_with_events: BookClub, test_user_for_auth: User
+    ):
+        """測試游標分頁可走訪所有活動且不重複"""
+        from app.models.event import Event
+        
+        for i in range(12):
+            session.add(Event(
+                club_id=test_club_with_events.id,
+                title=f"游標測試活動 {i}",
+                description="測試",
+                event_datetime=datetime.utcnow() + timedelta(days=30 + i // 2),
+                meeting_url="https://meet.google.com/test",
+                organizer_id=test_user_for_auth.id,
+                status=EventStatus.PUBLISHED
+            ))
+        session.commit()
+        
+        seen_ids = []
+        cursor = None
+        while True:
+            url = f"/api/v1/clubs/{test_club_with_events.id}/events?use_cursor=true&page_size=5"
+            if cursor:
+                url += f"&cursor={cursor}"
+            response = authenticated_client.get(url)
+            assert response.status_code == 200
+            data = response.json()
+            assert "totalItems" not in data["pagination"] or data["pagination"]["totalItems"] is None
+            seen_ids.extend(item["id"] for item in data["items"])
+            cursor = data["pagination"]["nextCursor"]
+            if not data["pagination"]["hasNext"]:
+                assert cursor is None
+                break
+        
+        # 2 個原有 published 活動 + 12 個新活動
+        assert len(seen_ids) == 14
+        assert len(set(seen_ids)) == 14
+    
+    def test_list_events_invalid_cursor(
+        self, authenticated_client: TestClient, test_club_with_events: BookClub
+    ):
+        """測試無效游標回傳 400"""
+        response = authenticated_client.get(
+            f"/api/v1/clubs/{test_club_with_events.id}/events?cursor=not-a-cursor"
+        )
+        
+        assert response.status_code == 400
+    
     def test_list_events_sorting(
         self, authenticated_client: TestClient, test_club_with_events: BookClub
     ):
@@ -85,6 +85,33 @@ def test_get_clubs_list_with_pagination(client: TestClient, session: Session):
     assert data["pagination"]["has_previous"] is False
 
 
+def test_get_clubs_list_with_cursor(client: TestClient, session: Session):
+    """測試游標分頁回應"""
+    user = User(email="test@example.com", password_hash="hash", display_name="Test User")
+    session.add(user)
+    session.commit()
+    
+    for i in range(5):
+        session.add(BookClub(name=f"Club {i}", visibility="public", owner_id=user.id))
+    session.commit()
+    
+    response = client.get("/api/v1/clubs?use_cursor=true&page_size=3")
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data["items"]) == 3
+    assert data["pagination"]["has_next"] is True
+    assert data["pagination"]["total_items"] is None
+    assert "page" not in data["pagination"]
+    
+    response = client.get(f"/api/v1/clubs?page_size=3&cursor={data['pagination']['next_cursor']}")
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data["items"]) == 2
+    assert data["pagination"]["has_next"] is False
+    assert data["pagination"]["next_cursor"] is None
+
 def test_get_clubs_list_with_search(client: TestClient, session: Session):
     """測試搜尋參數"""
     user = User(email="test@example.com", password_hash="hash", display_name="Test User")
@@ -0,0 +1,63 @@
+# tests/unit/test_async_session.py
+import asyncio
+import threading
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session, SQLModel, create_engine
+
+from app.core.security import Principal, get_current_principal
+from app.db import async_session
+from app.db.async_session import ReadSession, async_database_url
+from app.db.session import get_session
+from app.main import app
+from app.models.user import User
+
+
+def test_async_database_url_switches_driver():
+    assert async_database_url("postgresql://user:secret@db:5432/bookclub") == (
+        "postgresql+asyncpg://user:secret@db:5432/bookclub"
+    )
+    assert async_database_url("postgresql+psycopg2://db/bookclub") == "postgresql+asyncpg://db/bookclub"
+    assert async_database_url("sqlite://") == "sqlite+aiosqlite://"
+
+
+def test_read_session_falls_back_to_threadpool(session: Session):
+    read_session = ReadSession(session=session)
+    loop_thread = []
+
+    def load(received: Session, value: int, *, offset: int) -> tuple:
+        return received, value + offset, threading.current_thread()
+
+    async def scenario():
+        loop_thread.append(threading.current_thread())
+        return await read_session.run(load, 1, offset=2)
+
+    received, value, worker_thread = asyncio.run(scenario())
+    assert received is session
+    assert value == 3
+    assert worker_thread is not loop_thread[0]
+
+
+def test_endpoint_reads_through_async_session(tmp_path, monkeypatch):
+    # 非同步引擎需連到同一個資料庫，因此改用檔案型 SQLite（aiosqlite）
+    url = f"sqlite:///{tmp_path / 'async_reads.db'}"
+    engine = create_engine(url)
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        user = User(email="async@example.com", display_name="Async", unread_notification_count=3)
+        session.add(user)
+        session.commit()
+        session.refresh(user)
+
+        monkeypatch.setattr(async_session, "ASYNC_READS_ENABLED", True)
+        app.dependency_overrides[get_session] = lambda: session
+        app.dependency_overrides[get_current_principal] = lambda: Principal.from_user(user)
+        try:
+            response = TestClient(app).get("/api/v1/notifications/unread-count")
+        finally:
+            app.dependency_overrides.clear()
+            asyncio.run(async_session._async_engines.pop(url).dispose())
+
+    assert response.status_code == 200
+    assert response.json() == {"unread_count": 3}
+    engine.dispose()
@@ -0,0 +1,181 @@
+# tests/unit/test_auth_cache.py
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlmodel import Session
+
+from app.core import security
+from app.core.security import (
+    create_access_token,
+    create_user_access_token,
+    get_club_member,
+    get_current_principal,
+    get_current_user,
+)
+from app.models.book_club import BookClub
+from app.models.book_club_member import BookClubMember, MemberRole
+from app.models.user import User
+from app.services import auth_cache
+from app.services.user_service import UserService
+
+
+def _credentials(user: User) -> HTTPAuthorizationCredentials:
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=create_access_token({"sub": user.email}))
+
+
+@pytest.fixture(name="request_session")
+def request_session_fixture(session: Session):
+    # 每個請求各自的 session，避免 identity map 掩蓋快取效果。
+    # 保留參照到測試結束才關閉：這些 session 與測試 session 共用同一條連線（StaticPool），
+    # 若在測試中途被回收，歸還連線時的 rollback 會撤銷其他 session 尚未 commit 的寫入
+    sessions = []
+
+    def factory() -> Session:
+        sessions.append(Session(session.get_bind()))
+        return sessions[-1]
+
+    yield factory
+    for request_session in sessions:
+        request_session.close()
+
+
+def _setup(session: Session):
+    user = User(email="cached@example.com", display_name="Cached", email_verified=True)
+    session.add(user)
+    session.commit()
+    club = BookClub(name="Auth Cache Club", visibility="public", owner_id=user.id)
+    session.add(club)
+    session.commit()
+    session.add(BookClubMember(user_id=user.id, book_club_id=club.id, role=MemberRole.MEMBER))
+    session.commit()
+    return user, club
+
+
+def test_current_user_is_cached_and_invalidated_on_update(session: Session, request_session, query_counter):
+    user, _ = _setup(session)
+    credentials = _credentials(user)
+
+    get_current_user(db=request_session(), credentials=credentials)
+
+    db = request_session()
+    with query_counter() as counter:
+        cached = get_current_user(db=db, credentials=credentials)
+    assert counter.count == 0
+    assert cached.id == user.id
+    assert cached.display_name == "Cached"
+
+    # 快取重建的物件可正常修改並 commit，且只寫回修改的欄位
+    cached.display_name = "Renamed"
+    db.add(cached)
+    with query_counter() as counter:
+        db.commit()
+    updates = [s for s in counter.statements if s.startswith("UPDATE user")]
+    assert len(updates) == 1 and "display_name" in updates[0] and "email" not in updates[0].split("WHERE")[0]
+
+    with query_counter() as counter:
+        refreshed = get_current_user(db=request_session(), credentials=credentials)
+    assert counter.count == 1
+    assert refreshed.display_name == "Renamed"
+
+
+def test_cached_user_excludes_sensitive_fields(session: Session, request_session, query_counter):
+    user, _ = _setup(session)
+    user.password_hash = "secret-hash"
+    user.failed_login_attempts = 2
+    session.add(user)
+    session.commit()
+    credentials = _credentials(user)
+
+    get_current_user(db=request_session(), credentials=credentials)
+    cached_payload = auth_cache.get_backend().get(f"user:{user.email}")
+    assert "password_hash" not in cached_payload
+    assert "failed_login_attempts" not in cached_payload
+
+    # 未快取的欄位存取時才從資料庫載入，而不是建構時的預設值
+    with query_counter() as counter:
+        cached = get_current_user(db=request_session(), credentials=credentials)
+        assert counter.count == 0
+        assert cached.password_hash == "secret-hash"
+        assert cached.failed_login_attempts == 2
+    assert counter.count == 1
+
+
+def test_deactivation_invalidates_cached_user(session: Session, request_session):
+    user, _ = _setup(session)
+    credentials = _credentials(user)
+    get_current_user(db=request_session(), credentials=credentials)
+
+    user.is_active = False
+    session.add(user)
+    session.commit()
+
+    assert get_current_user(db=request_session(), credentials=credentials).is_active is False
+
+
+def test_club_membership_is_cached_and_invalidated(session: Session, request_session, query_counter):
+    user, club = _setup(session)
+
+    get_club_member(club.id, current_user=user, db=request_session())
+    with query_counter() as counter:
+        member = get_club_member(club.id, current_user=user, db=request_session())
+    assert counter.count == 0
+    assert member.role == MemberRole.MEMBER
+
+    membership = session.get(BookClubMember, (user.id, club.id))
+    membership.role = MemberRole.ADMIN
+    session.add(membership)
+    session.commit()
+    assert get_club_member(club.id, current_user=user, db=request_session()).role == MemberRole.ADMIN
+
+    session.delete(membership)
+    session.commit()
+    with pytest.raises(HTTPException) as exc_info:
+        get_club_member(club.id, current_user=user, db=request_session())
+    assert exc_info.value.status_code == 403
+
+
+def test_embedded_claims_principal_skips_user_lookup_and_honours_revocation(
+    session: Session, request_session, query_counter, monkeypatch
+):
+    monkeypatch.setattr(security, "JWT_EMBED_USER_CLAIMS", True)
+    user, _ = _setup(session)
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=create_user_access_token(user))
+
+    # 第一次只以主鍵查詢 token 版本，之後由快取提供
+    with query_counter() as counter:
+        principal = get_current_principal(db=request_session(), credentials=credentials)
+    assert counter.count == 1
+    assert (principal.id, principal.email, principal.display_name) == (user.id, user.email, "Cached")
+    with query_counter() as counter:
+        get_current_principal(db=request_session(), credentials=credentials)
+    assert counter.count == 0
+
+    UserService(session).deactivate_account(user)
+
+    for dependency in (get_current_principal, get_current_user):
+        with pytest.raises(HTTPException) as exc_info:
+            dependency(db=request_session(), credentials=credentials)
+        assert exc_info.value.status_code == 401
+
+
+def test_legacy_token_principal_falls_back_to_user_lookup(session: Session, request_session):
+    user, _ = _setup(session)
+    principal = get_current_principal(db=request_session(), credentials=_credentials(user))
+    assert principal.id == user.id
+
+
+def test_legacy_token_is_revoked_after_token_version_changes(session: Session, request_session):
+    user, _ = _setup(session)
+    credentials = _credentials(user)
+    get_current_principal(db=request_session(), credentials=credentials)
+
+    UserService(session).deactivate_account(user)
+    user.is_active = True
+    session.add(user)
+    session.commit()
+
+    for dependency in (get_current_principal, get_current_user):
+        with pytest.raises(HTTPException) as exc_info:
+            dependency(db=request_session(), credentials=credentials)
+        assert exc_info.value.status_code == 401
+    assert security.get_optional_current_user(db=request_session(), credentials=credentials) is None
@@ -7,6 +7,8 @@ from app.models.book_club import BookClub
 from app.models.club_tag import ClubTag, BookClubTagLink
 from app.models.book_club_member import BookClubMember, MemberRole
 from app.models.user import User
+from app.models.club_join_request import ClubJoinRequest, JoinRequestStatus
+from app.models.book_club_member import MembershipStatus
 from app.services.book_club_service import list_book_clubs, get_book_club_by_id
 from fastapi import HTTPException
 
@@ -125,6 +127,38 @@ def test_list_book_clubs_pagination(session: Session):
     assert pagination["has_previous"] is True
 
 
+def test_list_book_clubs_cursor_pagination(session: Session):
+    """測試游標分頁依 (created_at, id) 走訪所有讀書會且不重複"""
+    user = User(email="test@example.com", password_hash="hash", display_name="Test User")
+    session.add(user)
+    session.commit()
+    
+    # 建立時間相同的讀書會，驗證以 id 作為同值排序依據
+    created_at = datetime(2025, 1, 1, 12, 0, 0)
+    for i in range(7):
+        session.add(BookClub(name=f"Club {i}", visibility="public", owner_id=user.id, created_at=created_at))
+    session.commit()
+    
+    names = []
+    clubs, pagination = list_book_clubs(session, page_size=3, use_cursor=True, include_total=True)
+    assert pagination["total_items"] == 7
+    names.extend(c.name for c in clubs)
+    while pagination["has_next"]:
+        clubs, pagination = list_book_clubs(session, page_size=3, use_cursor=True, cursor=pagination["next_cursor"])
+        assert pagination["total_items"] is None
+        names.extend(c.name for c in clubs)
+    
+    assert names == [f"Club {i}" for i in reversed(range(7))]
+    assert pagination["next_cursor"] is None
+
+
+def test_list_book_clubs_invalid_cursor(session: Session):
+    """測試無效游標拋出 400 錯誤"""
+    with pytest.raises(HTTPException) as exc_info:
+        list_book_clubs(session, use_cursor=True, cursor="%%%")
+    
+    assert exc_info.value.status_code == 400
+
 def test_list_book_clubs_member_count(session: Session):
     """測試成員數計算"""
     user1 = User(email="user1@example.com", password_hash="hash", display_name="User 1")
@@ -147,6 +181,59 @@ def test_list_book_clubs_member_count(session: Session):
     assert clubs[0].member_count == 2
 
 
+def test_list_book_clubs_membership_status_batched(session: Session):
+    """測試批次載入時正確計算當前使用者的成員狀態"""
+    owner = User(email="owner@example.com", password_hash="hash", display_name="Owner")
+    viewer = User(email="viewer@example.com", password_hash="hash", display_name="Viewer")
+    session.add_all([owner, viewer])
+    session.commit()
+    
+    joined = BookClub(name="Joined", visibility="public", owner_id=owner.id)
+    pending = BookClub(name="Pending", visibility="private", owner_id=owner.id)
+    other = BookClub(name="Other", visibility="public", owner_id=owner.id)
+    session.add_all([joined, pending, other])
+    session.commit()
+    
+    session.add(BookClubMember(user_id=viewer.id, book_club_id=joined.id, role=MemberRole.ADMIN))
+    session.add(ClubJoinRequest(user_id=viewer.id, book_club_id=pending.id, status=JoinRequestStatus.PENDING))
+    session.commit()
+    
+    clubs, _ = list_book_clubs(session, current_user=viewer)
+    statuses = {club.name: club.membership_status for club in clubs}
+    
+    assert statuses["Joined"] == MembershipStatus.ADMIN
+    assert statuses["Pending"] == MembershipStatus.PENDING_REQUEST
+    assert statuses["Other"] is None
+    assert all(club.owner.id == owner.id for club in clubs)
+
+
+def test_list_book_clubs_query_count_is_constant(session: Session, query_counter):
+    """測試查詢次數不隨讀書會數量增加（避免 N+1）"""
+    owner = User(email="owner@example.com", password_hash="hash", display_name="Owner")
+    session.add(owner)
+    session.commit()
+    
+    tag = ClubTag(name="Python", is_predefined=True)
+    session.add(tag)
+    session.commit()
+    
+    for i in range(30):
+        club = BookClub(name=f"Club {i}", visibility="public", owner_id=owner.id)
+        session.add(club)
+        session.flush()
+        session.add(BookClubTagLink(book_club_id=club.id, tag_id=tag.id))
+        session.add(BookClubMember(user_id=owner.id, book_club_id=club.id, role=MemberRole.OWNER))
+    session.commit()
+    
+    with query_counter() as counter:
+        clubs, _ = list_book_clubs(session, page_size=30, current_user=owner)
+    
+    assert len(clubs) == 30
+    assert all(club.member_count == 1 and len(club.tags) == 1 for club in clubs)
+    # count + page + owners + tags + roles + pending requests
+    assert counter.count <= 6
+
+
 def test_get_book_club_by_id_success(session: Session):
     """測試成功獲取讀書會詳細資訊"""
     user = User(email="test@example.com", password_hash="hash", display_name="Test User")
@@ -201,3 +288,56 @@ def test_get_book_club_by_id_includes_tags(session: Session):
     
     assert len(result.tags) == 1
     assert result.tags[0].name == "Python"
+
+
+def test_get_book_club_by_id_membership_status(session: Session):
+    """測試詳細資訊的成員狀態（成員、申請中、非成員）"""
+    owner = User(email="owner@example.com", password_hash="hash", display_name="Owner")
+    applicant = User(email="applicant@example.com", password_hash="hash", display_name="Applicant")
+    stranger = User(email="stranger@example.com", password_hash="hash", display_name="Stranger")
+    session.add_all([owner, applicant, stranger])
+    session.commit()
+    
+    club = BookClub(name="Test Club", visibility="private", owner_id=owner.id)
+    session.add(club)
+    session.commit()
+    
+    session.add(BookClubMember(user_id=owner.id, book_club_id=club.id, role=MemberRole.OWNER))
+    session.add(ClubJoinRequest(user_id=applicant.id, book_club_id=club.id, status=JoinRequestStatus.PENDING))
+    session.commit()
+    
+    assert get_book_club_by_id(session, club.id, owner).membership_status == MembershipStatus.OWNER
+    assert get_book_club_by_id(session, club.id, applicant).membership_status == MembershipStatus.PENDING_REQUEST
+    assert get_book_club_by_id(session, club.id, stranger).membership_status == MembershipStatus.NOT_MEMBER
+    assert get_book_club_by_id(session, club.id).membership_status == MembershipStatus.NOT_MEMBER
+
+
+def test_get_book_club_by_id_query_count(session: Session, query_counter):
+    """測試詳細資訊只使用兩次查詢（主查詢 + 標籤）"""
+    owner = User(email="owner@example.com", password_hash="hash", display_name="Owner")
+    viewer = User(email="viewer@example.com", password_hash="hash", display_name="Viewer")
+    session.add_all([owner, viewer])
+    session.commit()
+    
+    tags = [ClubTag(name=f"Tag {i}", is_predefined=True) for i in range(3)]
+    session.add_all(tags)
+    club = BookClub(name="Test Club", visibility="public", owner_id=owner.id)
+    session.add(club)
+    session.commit()
+    
+    for tag in tags:
+        session.add(BookClubTagLink(book_club_id=club.id, tag_id=tag.id))
+    session.add(BookClubMember(user_id=owner.id, book_club_id=club.id, role=MemberRole.OWNER))
+    session.add(BookClubMember(user_id=viewer.id, book_club_id=club.id, role=MemberRole.MEMBER))
+    session.commit()
+    club_id = club.id
+    session.refresh(viewer)
+    
+    with query_counter() as counter:
+        result = get_book_club_by_id(session, club_id, viewer)
+    
+    assert counter.count == 2
+    assert result.owner.id == owner.id
+    assert result.member_count == 2
+    assert [tag.name for tag in result.tags] == ["Tag 0", "Tag 1", "Tag 2"]
+    assert result.membership_status == MembershipStatus.MEMBER
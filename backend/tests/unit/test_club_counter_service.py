@@ -0,0 +1,117 @@
+# backend/tests/unit/test_club_counter_service.py
+from datetime import datetime, timedelta
+
+from sqlmodel import Session, update
+
+from app.models.user import User
+from app.models.book_club import BookClub, BookClubVisibility
+from app.models.book_club_member import BookClubMember, MemberRole
+from app.models.club_join_request import ClubJoinRequest, JoinRequestStatus
+from app.models.event import Event, EventStatus
+from app.services import book_club_service
+from app.services.club_management_service import ClubManagementService
+from app.services.club_counter_service import reconcile_club_counters
+
+
+def _create_club(session: Session, owner: User, visibility=BookClubVisibility.PUBLIC) -> BookClub:
+    club = BookClub(name="Counter Club", visibility=visibility, owner_id=owner.id)
+    session.add(club)
+    session.commit()
+    session.add(BookClubMember(user_id=owner.id, book_club_id=club.id, role=MemberRole.OWNER))
+    session.commit()
+    return club
+
+
+def _create_event(session: Session, club: BookClub, organizer: User, status: EventStatus, days: int = 7) -> Event:
+    event = Event(
+        club_id=club.id,
+        title="Event",
+        description="Description",
+        event_datetime=datetime.utcnow() + timedelta(days=days),
+        meeting_url="https://meet.google.com/abc",
+        organizer_id=organizer.id,
+        status=status
+    )
+    session.add(event)
+    session.commit()
+    return event
+
+
+def test_member_count_follows_join_and_leave(session: Session, test_user: User, another_user: User):
+    """測試加入與退出讀書會時同步更新成員數"""
+    club = _create_club(session, test_user)
+    assert club.member_count == 1
+    
+    book_club_service.join_book_club(session, club.id, another_user.id)
+    session.refresh(club)
+    assert club.member_count == 2
+    
+    book_club_service.leave_book_club(session, club.id, another_user.id)
+    session.refresh(club)
+    assert club.member_count == 1
+
+
+def test_member_count_follows_approve_and_remove(session: Session, test_user: User, another_user: User):
+    """測試審核加入與移除成員時同步更新成員數"""
+    club = _create_club(session, test_user, visibility=BookClubVisibility.PRIVATE)
+    join_request = ClubJoinRequest(user_id=another_user.id, book_club_id=club.id, status=JoinRequestStatus.PENDING)
+    session.add(join_request)
+    session.commit()
+    
+    service = ClubManagementService(session)
+    service.approve_join_request(request_id=join_request.id, club_id=club.id)
+    session.refresh(club)
+    assert club.member_count == 2
+    
+    service.remove_member(club_id=club.id, target_user_id=another_user.id, acting_user=test_user)
+    session.refresh(club)
+    assert club.member_count == 1
+
+
+def test_event_counters_follow_status_changes(session: Session, test_user: User):
+    """測試活動新增、狀態變更與刪除時同步更新活動計數"""
+    club = _create_club(session, test_user)
+    draft = _create_event(session, club, test_user, EventStatus.DRAFT)
+    published = _create_event(session, club, test_user, EventStatus.PUBLISHED)
+    session.refresh(club)
+    assert (club.published_event_count, club.completed_event_count) == (1, 0)
+    
+    draft.status = EventStatus.PUBLISHED
+    session.add(draft)
+    session.commit()
+    session.refresh(club)
+    assert (club.published_event_count, club.completed_event_count) == (2, 0)
+    
+    published.status = EventStatus.COMPLETED
+    session.add(published)
+    session.commit()
+    session.refresh(club)
+    assert (club.published_event_count, club.completed_event_count) == (1, 1)
+    
+    session.delete(draft)
+    session.commit()
+    session.refresh(club)
+    assert (club.published_event_count, club.completed_event_count) == (0, 1)
+
+
+def test_reconcile_club_counters_fixes_drift(session: Session, test_user: User, another_user: User):
+    """測試校正指令修正偏差的計數欄位"""
+    club = _create_club(session, test_user)
+    healthy = _create_club(session, another_user)
+    session.add(BookClubMember(user_id=another_user.id, book_club_id=club.id, role=MemberRole.MEMBER))
+    _create_event(session, club, test_user, EventStatus.PUBLISHED)
+    _create_event(session, club, test_user, EventStatus.COMPLETED, days=-3)
+    
+    # 以批次 UPDATE 製造偏差（不會觸發計數 hook）
+    session.exec(update(BookClub).where(BookClub.id == club.id).values(
+        member_count=99, published_event_count=0, completed_event_count=5
+    ))
+    session.commit()
+    
+    drifted = reconcile_club_counters(session, batch_size=1)
+    
+    assert drifted == [club.id]
+    session.refresh(club)
+    session.refresh(healthy)
+    assert (club.member_count, club.published_event_count, club.completed_event_count) == (2, 1, 1)
+    assert healthy.member_count == 1
@@ -0,0 +1,115 @@
+# backend/tests/unit/test_club_search_service.py
+from sqlmodel import Session
+
+from app.core.search import NgramIndex
+from app.models.user import User
+from app.models.book_club import BookClub
+from app.services.book_club_service import list_book_clubs
+from app.services import club_search_service
+from app.services.club_search_service import get_club_index
+
+
+def _create_clubs(session: Session, owner: User, *clubs) -> list:
+    created = [BookClub(name=name, description=description, visibility="public", owner_id=owner.id) for name, description in clubs]
+    session.add_all(created)
+    session.commit()
+    return created
+
+
+def test_ngram_index_matches_cjk_substrings():
+    """測試 bigram 索引可搜尋中文子字串與單一字元"""
+    index = NgramIndex({"name": 2.0, "description": 1.0})
+    index.add(1, {"name": "村上春樹讀書會", "description": "一起讀小說"})
+    index.add(2, {"name": "推理小說俱樂部", "description": None})
+    index.add(3, {"name": "Python 讀書會", "description": "程式設計"})
+
+    assert index.search("春樹") == {1: 2.0}
+    assert index.search("小說") == {1: 1.0, 2: 2.0}
+    assert set(index.search("讀")) == {1, 3}
+    assert index.search("python") == {3: 2.0}
+    assert index.search("莎士比亞") == {}
+    assert index.search("") == {}
+
+    index.remove(2)
+    assert index.search("小說") == {1: 1.0}
+
+
+def test_list_book_clubs_keyword_search_cjk_ranked(session: Session, test_user: User):
+    """測試中文關鍵字搜尋，名稱命中排在僅描述命中之前"""
+    _create_clubs(
+        session, test_user,
+        ("推理小說俱樂部", "每月一本推理"),
+        ("週末讀書會", "輕鬆讀小說"),
+        ("科幻電影社", "只看電影"),
+    )
+
+    clubs, pagination = list_book_clubs(session, keyword="小說")
+
+    assert [c.name for c in clubs] == ["推理小說俱樂部", "週末讀書會"]
+    assert pagination["total_items"] == 2
+
+
+def test_list_book_clubs_keyword_search_is_case_insensitive(session: Session, test_user: User):
+    """測試英文關鍵字搜尋不分大小寫"""
+    _create_clubs(session, test_user, ("Python 讀書會", None), ("Rust Club", "systems"))
+
+    clubs, _ = list_book_clubs(session, keyword="python")
+
+    assert [c.name for c in clubs] == ["Python 讀書會"]
+
+
+def test_ngram_index_limits_candidates_to_top_scores():
+    index = NgramIndex({"name": 2.0, "description": 1.0})
+    index.add(1, {"name": "讀書會", "description": None})
+    index.add(2, {"name": "咖啡", "description": "讀詩"})
+    index.add(3, {"name": "讀小說", "description": "讀"})
+    index.add(4, {"name": "讀哲學", "description": None})
+
+    assert index.search("讀", limit=2) == {3: 3.0, 4: 2.0}
+    assert len(index.search("讀")) == 4
+
+
+def test_keyword_search_caps_candidate_ids(session: Session, test_user: User, monkeypatch, query_counter):
+    """測試過短的關鍵字只把分數最高的候選 id 帶入查詢"""
+    monkeypatch.setattr(club_search_service, "MAX_CANDIDATES", 2)
+    _create_clubs(session, test_user, *[(f"讀書會 {i}", None) for i in range(30)])
+
+    with query_counter() as counter:
+        clubs, _ = list_book_clubs(session, keyword="讀")
+    assert len(clubs) == 2
+    assert all(statement.count("?") < 20 for statement in counter.statements)
+
+
+def test_keyword_index_follows_club_changes(session: Session, test_user: User):
+    """測試索引建立後，讀書會新增、改名與刪除都會同步"""
+    club, = _create_clubs(session, test_user, ("哲學讀書會", "讀康德"))
+    assert len(list_book_clubs(session, keyword="哲學")[0]) == 1
+
+    _create_clubs(session, test_user, ("哲學咖啡館", None))
+    assert len(list_book_clubs(session, keyword="哲學")[0]) == 2
+
+    club.name = "歷史讀書會"
+    session.add(club)
+    session.commit()
+    assert [c.name for c in list_book_clubs(session, keyword="哲學")[0]] == ["哲學咖啡館"]
+    assert len(list_book_clubs(session, keyword="歷史")[0]) == 1
+
+    session.delete(club)
+    session.commit()
+    assert list_book_clubs(session, keyword="歷史")[0] == []
+
+
+def test_keyword_index_ignores_rolled_back_changes(session: Session, test_user: User):
+    """測試索引只套用已 commit 的變更，rollback 的新增與改名不會留在索引中"""
+    club, = _create_clubs(session, test_user, ("天文讀書會", None))
+    assert len(list_book_clubs(session, keyword="天文")[0]) == 1
+
+    session.add(BookClub(name="天文攝影社", visibility="public", owner_id=test_user.id))
+    club.name = "地質讀書會"
+    session.add(club)
+    session.flush()
+    session.rollback()
+
+    index = get_club_index(session)
+    assert set(index.search("天文")) == {club.id}
+    assert index.search("地質") == {}
@@ -0,0 +1,178 @@
+# backend/tests/unit/test_comment_stream.py
+import asyncio
+import json
+
+from sqlmodel import Session
+
+from app.core import pubsub
+from app.core.pubsub import InProcessBroker, PostgresBroker
+from app.models.user import User
+from app.models.book_club import BookClub
+from app.models.discussion import DiscussionTopic
+from app.schemas.discussion import DiscussionCommentCreate
+from app.services import comment_stream, discussion_service
+from app.services.comment_stream import ConnectionLimiter, comment_events
+
+
+def _setup(session: Session):
+    user = User(email="reader@test.com", password_hash="hash", display_name="Reader")
+    session.add(user)
+    session.commit()
+    club = BookClub(name="Live Club", visibility="public", owner_id=user.id)
+    session.add(club)
+    session.commit()
+    topic = DiscussionTopic(title="Live Topic", content="...", club_id=club.id, owner_id=user.id)
+    session.add(topic)
+    session.commit()
+    return user.id, topic.id
+
+
+def _reply(session: Session, topic_id: int, user_id: int, content: str):
+    return discussion_service.create_comment(
+        session=session, topic_id=topic_id, owner_id=user_id,
+        comment_in=DiscussionCommentCreate(content=content)
+    )
+
+
+def test_new_comment_is_pushed_without_querying(session: Session, query_counter):
+    """測試 create_comment 發布的回覆直接推送給訂閱者，不需再查詢資料庫"""
+    user_id, topic_id = _setup(session)
+    _reply(session, topic_id, user_id, "before")
+
+    async def scenario():
+        events = comment_events(session, topic_id, heartbeat_seconds=5)
+        pending = asyncio.ensure_future(events.__anext__())
+        await asyncio.sleep(0.05)
+        _reply(session, topic_id, user_id, "live")
+
+        with query_counter() as counter:
+            pushed = await asyncio.wait_for(pending, 5)
+        await events.aclose()
+        return pushed, counter.count
+
+    pushed, queries = asyncio.run(scenario())
+    assert pushed["type"] == "comment"
+    assert pushed["comment"]["content"] == "live"
+    assert pushed["comment"]["author"]["id"] == user_id
+    assert queries == 0
+
+
+class _PayloadLimitedBroker(InProcessBroker):
+    """模擬 payload 上限：一律改送 compact 訊息"""
+
+    def publish(self, channel, message, compact=None):
+        super().publish(channel, compact or message)
+
+
+def test_oversized_comment_is_fetched_from_database(session: Session, monkeypatch):
+    """測試 broker 改送只帶 ID 的訊息時，由訂閱者向資料庫補齊"""
+    broker = _PayloadLimitedBroker()
+    monkeypatch.setattr(pubsub, "_broker", broker)
+    user_id, topic_id = _setup(session)
+
+    async def scenario():
+        events = comment_events(session, topic_id, heartbeat_seconds=5)
+        pending = asyncio.ensure_future(events.__anext__())
+        await asyncio.sleep(0.05)
+        _reply(session, topic_id, user_id, "x" * 100)
+        pushed = await asyncio.wait_for(pending, 5)
+        await events.aclose()
+        return pushed
+
+    assert asyncio.run(scenario())["comment"]["content"] == "x" * 100
+
+
+def test_postgres_payload_falls_back_to_compact_message():
+    """測試以實際送出的 NOTIFY 字串（含外層包裝與 \\u 跳脫）判斷是否超過上限"""
+    broker = PostgresBroker("postgresql://unused")
+    compact = {"type": "comment", "id": 1}
+    short = {**compact, "comment": {"content": "短回覆"}}
+    assert json.loads(broker.encode("topic:1", short, compact))["message"] == short
+
+    # 1400 個中文字以 UTF-8 計算約 4200 bytes，但 JSON 跳脫後（\uXXXX）超過 8000 bytes
+    long = {**compact, "comment": {"content": "讀" * 1400}}
+    payload = broker.encode("topic:1", long, compact)
+    assert json.loads(payload) == {"channel": "topic:1", "message": compact}
+    assert broker.encode("topic:1", long) is None
+
+
+def test_catch_up_does_not_skip_replies_delivered_out_of_order(session: Session):
+    """測試即時訊息較大的 id 先送達、較小的被丟棄時，補齊仍會送出較小的回覆"""
+    user_id, topic_id = _setup(session)
+    broker = InProcessBroker()
+    channel = comment_stream.topic_channel(topic_id)
+
+    async def scenario():
+        events = comment_events(session, topic_id, broker=broker, heartbeat_seconds=0.05)
+        pending = asyncio.ensure_future(events.__anext__())
+        await asyncio.sleep(0.05)
+        # 回覆由全域 broker 發布，此處手動控制送達的訊息
+        _reply(session, topic_id, user_id, "earlier")
+        later = _reply(session, topic_id, user_id, "later")
+        broker.publish(channel, {"type": "comment", "id": later.id, "comment": comment_stream.comment_payload(later)})
+        first = await asyncio.wait_for(pending, 5)
+
+        # earlier 的訊息因佇列已滿被丟棄
+        subscription = next(iter(broker._subscriptions[channel]))
+        subscription.dropped = True
+        second = await asyncio.wait_for(events.__anext__(), 5)
+        third = await asyncio.wait_for(events.__anext__(), 5)
+        await events.aclose()
+        return first, second, third
+
+    first, second, third = asyncio.run(scenario())
+    assert first["comment"]["content"] == "later"
+    assert second["comment"]["content"] == "earlier"
+    # later 已送出過，補齊時不重複推送
+    assert third == {"type": "keep-alive"}
+
+
+def test_broker_resync_forces_catch_up(session: Session):
+    """測試 broker 重新連線（resync_subscribers）後向資料庫補齊，取得期間漏收的回覆"""
+    user_id, topic_id = _setup(session)
+    broker = InProcessBroker()
+
+    async def scenario():
+        events = comment_events(session, topic_id, broker=broker, heartbeat_seconds=5)
+        pending = asyncio.ensure_future(events.__anext__())
+        await asyncio.sleep(0.05)
+        # 回覆由全域 broker 發布，本地 broker 收不到，模擬斷線期間遺失的訊息
+        _reply(session, topic_id, user_id, "missed")
+        broker.resync_subscribers()
+        pushed = await asyncio.wait_for(pending, 5)
+        await events.aclose()
+        return pushed
+
+    assert asyncio.run(scenario())["comment"]["content"] == "missed"
+
+
+def test_stream_resumes_from_since_id(session: Session):
+    """測試 since_id 會補發之後的回覆，之後閒置時送出 keep-alive"""
+    user_id, topic_id = _setup(session)
+    first = _reply(session, topic_id, user_id, "first")
+    _reply(session, topic_id, user_id, "second")
+    first_id = first.id
+
+    async def scenario():
+        events = comment_events(session, topic_id, since_id=first_id, heartbeat_seconds=0.01)
+        backlog = await events.__anext__()
+        heartbeat = await events.__anext__()
+        await events.aclose()
+        return backlog, heartbeat
+
+    backlog, heartbeat = asyncio.run(scenario())
+    assert backlog["comment"]["content"] == "second"
+    assert heartbeat == {"type": "keep-alive"}
+
+
+def test_connection_limiter():
+    limiter = ConnectionLimiter(max_per_topic=2, max_total=3)
+    assert limiter.acquire(1) and limiter.acquire(1)
+    assert not limiter.acquire(1)
+    assert limiter.acquire(2)
+    assert not limiter.acquire(3)
+
+    limiter.release(1)
+    assert limiter.active(1) == 1
+    assert limiter.acquire(3)
+    assert limiter.active() == 3
@@ -0,0 +1,102 @@
+# backend/tests/unit/test_dashboard_cache.py
+import time
+
+from sqlmodel import Session
+
+from app.core.cache import InMemoryLRUCache, RedisCache
+from app.models.user import User
+from app.models.book_club import BookClub
+from app.models.book_club_member import BookClubMember, MemberRole
+from app.models.discussion import DiscussionTopic
+from app.schemas.discussion import DiscussionCommentCreate
+from app.services import book_club_service, discussion_service
+from app.services.dashboard_service import get_user_dashboard_cached
+
+
+def _create_club(session: Session, owner: User) -> BookClub:
+    club = BookClub(name="Cache Club", visibility="public", owner_id=owner.id)
+    session.add(club)
+    session.commit()
+    session.add(BookClubMember(user_id=owner.id, book_club_id=club.id, role=MemberRole.OWNER))
+    session.commit()
+    return club
+
+
+def test_lru_cache_ttl_and_eviction():
+    """測試 LRU 快取的過期與淘汰"""
+    cache = InMemoryLRUCache(max_entries=2)
+    cache.set("a", "1", ttl_seconds=60)
+    cache.set("b", "2", ttl_seconds=60)
+    assert cache.get("a") == "1"  # a 變為最近使用
+    cache.set("c", "3", ttl_seconds=60)
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+
+    cache.set("d", "4", ttl_seconds=0.01)
+    time.sleep(0.02)
+    assert cache.get("d") is None
+
+    cache.delete_many(["a", "c"])
+    assert len(cache) == 0
+
+
+def test_redis_cache_adapter():
+    """測試 Redis 後端使用 get / set(ex=) / delete 介面"""
+    class DictRedis:
+        def __init__(self):
+            self.data, self.expiry = {}, {}
+
+        def get(self, key):
+            return self.data.get(key)
+
+        def set(self, key, value, ex=None):
+            self.data[key] = value.encode("utf-8")
+            self.expiry[key] = ex
+
+        def delete(self, *keys):
+            for key in keys:
+                self.data.pop(key, None)
+
+    client = DictRedis()
+    cache = RedisCache(client, prefix="test:")
+    cache.set("dashboard:1", "{}", ttl_seconds=30)
+    assert client.expiry == {"test:dashboard:1": 30}
+    assert cache.get("dashboard:1") == "{}"
+    cache.delete("dashboard:1")
+    assert cache.get("dashboard:1") is None
+
+
+def test_dashboard_served_from_cache(session: Session, test_user: User, query_counter):
+    """測試第二次讀取儀表板不查詢資料庫"""
+    _create_club(session, test_user)
+    user_id = test_user.id
+    first = get_user_dashboard_cached(session, user_id)
+
+    with query_counter() as counter:
+        second = get_user_dashboard_cached(session, user_id)
+
+    assert counter.count == 0
+    assert second == first
+
+
+def test_dashboard_cache_invalidated_by_join_and_comment(session: Session, test_user: User, another_user: User):
+    """測試加入讀書會與留言會使相關用戶的儀表板快取失效"""
+    club = _create_club(session, test_user)
+    topic = DiscussionTopic(club_id=club.id, owner_id=test_user.id, title="Topic", content="Content")
+    session.add(topic)
+    session.commit()
+
+    assert get_user_dashboard_cached(session, test_user.id).clubs[0].member_count == 1
+    assert get_user_dashboard_cached(session, another_user.id).stats.clubs_count == 0
+
+    book_club_service.join_book_club(session, club.id, another_user.id)
+
+    assert get_user_dashboard_cached(session, test_user.id).clubs[0].member_count == 2
+    assert get_user_dashboard_cached(session, another_user.id).stats.clubs_count == 1
+
+    discussion_service.create_comment(
+        session=session, topic_id=topic.id, owner_id=another_user.id,
+        comment_in=DiscussionCommentCreate(content="Hello")
+    )
+
+    assert get_user_dashboard_cached(session, another_user.id).stats.discussions_count == 1
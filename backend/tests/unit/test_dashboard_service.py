@@ -1,5 +1,10 @@
 import pytest
+from datetime import datetime, timedelta
 from sqlmodel import Session
+from app.models.user import User
+from app.models.book_club import BookClub
+from app.models.book_club_member import BookClubMember, MemberRole
+from app.models.event import Event, EventStatus
 from app.services.dashboard_service import get_user_dashboard
 from app.schemas.dashboard import DashboardData, DashboardStats
 
@@ -70,3 +75,59 @@ def test_dashboard_stats_camelcase_alias():
     assert data['clubsCount'] == 5
     assert data['booksRead'] == 10
     assert data['discussionsCount'] == 20
+
+
+def _create_member_club(session: Session, user: User, name: str, event_days) -> BookClub:
+    club = BookClub(name=name, visibility="public", owner_id=user.id)
+    session.add(club)
+    session.commit()
+    session.add(BookClubMember(user_id=user.id, book_club_id=club.id, role=MemberRole.OWNER))
+    for event_status, days in event_days:
+        session.add(Event(
+            club_id=club.id,
+            title="Event",
+            description="Description",
+            event_datetime=datetime.utcnow() + timedelta(days=days),
+            meeting_url="https://meet.google.com/abc",
+            organizer_id=user.id,
+            status=event_status
+        ))
+    session.commit()
+    return club
+
+
+def test_get_user_dashboard_club_stats(session: Session, test_user: User):
+    """測試儀表板的讀書會活動統計（未處理的過期活動視為已完成）"""
+    _create_member_club(session, test_user, "Active Club", [
+        (EventStatus.PUBLISHED, 30),
+        (EventStatus.PUBLISHED, -30),
+        (EventStatus.COMPLETED, -60),
+        (EventStatus.DRAFT, 10),
+    ])
+    _create_member_club(session, test_user, "Empty Club", [])
+    
+    dashboard = get_user_dashboard(session, test_user.id)
+    
+    assert dashboard.stats.clubs_count == 2
+    clubs = {club.name: club for club in dashboard.clubs}
+    active = clubs["Active Club"]
+    assert active.member_count == 1
+    assert active.total_events == 3
+    assert active.completed_events == 2
+    assert active.upcoming_events == 1
+    assert active.status == "active"
+    assert clubs["Empty Club"].total_events == 0
+    assert clubs["Empty Club"].status == "planning"
+
+
+def test_get_user_dashboard_query_count_independent_of_clubs(session: Session, test_user: User, query_counter):
+    """測試儀表板查詢數不隨讀書會數量增加"""
+    for i in range(5):
+        _create_member_club(session, test_user, f"Club {i}", [(EventStatus.PUBLISHED, 7), (EventStatus.COMPLETED, -7)])
+    user_id = test_user.id
+    
+    with query_counter() as counter:
+        dashboard = get_user_dashboard(session, user_id)
+    
+    assert len(dashboard.clubs) == 5
+    assert counter.count == 3
@@ -0,0 +1,115 @@
+# backend/tests/unit/test_discussion_search_service.py
+from sqlmodel import Session
+
+from app.services import discussion_search_service
+
+from app.models.user import User
+from app.models.book_club import BookClub
+from app.models.discussion import DiscussionComment, DiscussionTopic
+from app.services.discussion_search_service import get_comment_index, make_snippet, search_discussions
+
+
+def _create_club(session: Session, owner: User, name: str) -> BookClub:
+    club = BookClub(name=name, visibility="public", owner_id=owner.id)
+    session.add(club)
+    session.commit()
+    return club
+
+
+def _create_topic(session: Session, club: BookClub, owner: User, title: str, content: str, *comments: str) -> DiscussionTopic:
+    topic = DiscussionTopic(title=title, content=content, club_id=club.id, owner_id=owner.id)
+    session.add(topic)
+    session.commit()
+    session.add_all([DiscussionComment(content=c, topic_id=topic.id, owner_id=owner.id) for c in comments])
+    session.commit()
+    return topic
+
+
+def test_search_ranks_topics_and_comments_within_club(session: Session, test_user: User):
+    """測試搜尋只回傳該讀書會的結果，標題命中排在內容與回覆之前"""
+    club = _create_club(session, test_user, "搜尋讀書會")
+    other = _create_club(session, test_user, "其他讀書會")
+    title_hit = _create_topic(session, club, test_user, "村上春樹的長篇", "聊聊挪威的森林")
+    content_hit = _create_topic(session, club, test_user, "本月書單", "投票選出村上春樹或東野圭吾", "我想讀 村上春樹 的短篇")
+    _create_topic(session, other, test_user, "村上春樹", "別的讀書會", "村上春樹")
+
+    items, pagination = search_discussions(session, club.id, "村上春樹")
+
+    assert [(item["type"], item["topic_id"]) for item in items] == [
+        ("topic", title_hit.id), ("topic", content_hit.id), ("comment", content_hit.id)
+    ]
+    assert items[0]["rank"] > items[1]["rank"]
+    assert items[2]["title"] == "本月書單"
+    assert items[2]["comment_id"] is not None
+    assert not pagination["has_next"] and not pagination["has_previous"]
+
+
+def test_search_paginates_and_is_case_insensitive(session: Session, test_user: User):
+    club = _create_club(session, test_user, "Python Club")
+    _create_topic(session, club, test_user, "Asyncio", "...", *[f"PYTHON tip {i}" for i in range(5)])
+
+    first, pagination = search_discussions(session, club.id, "python", page=1, page_size=2)
+    last, last_pagination = search_discussions(session, club.id, "python", page=3, page_size=2)
+
+    assert len(first) == 2 and len(last) == 1
+    assert pagination["has_next"] and not pagination["has_previous"]
+    assert not last_pagination["has_next"] and last_pagination["has_previous"]
+    assert "total_items" not in pagination
+    assert {item["comment_id"] for item in first}.isdisjoint({item["comment_id"] for item in last})
+
+
+def test_search_index_follows_topic_and_comment_changes(session: Session, test_user: User):
+    """測試索引建立後，主題與回覆的新增、修改與刪除都會同步"""
+    club = _create_club(session, test_user, "同步讀書會")
+    topic = _create_topic(session, club, test_user, "哲學入門", "讀康德")
+    assert len(search_discussions(session, club.id, "哲學")[0]) == 1
+
+    comment = DiscussionComment(content="推薦哲學史", topic_id=topic.id, owner_id=test_user.id)
+    session.add(comment)
+    session.commit()
+    assert len(search_discussions(session, club.id, "哲學")[0]) == 2
+
+    topic.title = "歷史入門"
+    session.add(topic)
+    session.commit()
+    assert [item["type"] for item in search_discussions(session, club.id, "哲學")[0]] == ["comment"]
+    assert len(search_discussions(session, club.id, "歷史")[0]) == 1
+
+    session.delete(comment)
+    session.commit()
+    assert search_discussions(session, club.id, "哲學")[0] == []
+
+
+def test_search_index_ignores_rolled_back_changes(session: Session, test_user: User):
+    """測試索引變更在 commit 後才套用，rollback 的回覆不會留在索引中"""
+    club = _create_club(session, test_user, "回滾讀書會")
+    topic = _create_topic(session, club, test_user, "天文", "觀星")
+    index = get_comment_index(session)
+
+    session.add(DiscussionComment(content="流星雨", topic_id=topic.id, owner_id=test_user.id))
+    session.flush()
+    assert index.search("流星雨") == {}
+    session.rollback()
+    assert index.search("流星雨") == {}
+
+
+def test_search_caps_candidate_ids(session: Session, test_user: User, monkeypatch, query_counter):
+    """測試常見的關鍵字只把分數最高的候選 id 帶入查詢（主題與回覆各自上限）"""
+    monkeypatch.setattr(discussion_search_service, "MAX_CANDIDATES", 2)
+    club = _create_club(session, test_user, "候選讀書會")
+    for i in range(15):
+        _create_topic(session, club, test_user, f"讀書心得 {i}", "...", f"讀完了 {i}")
+
+    with query_counter() as counter:
+        items, _ = search_discussions(session, club.id, "讀", page_size=50)
+    assert [item["type"] for item in items].count("topic") == 2
+    assert [item["type"] for item in items].count("comment") == 2
+    # 未設上限時主題與回覆各帶入 15 個 id（IN 與 CASE 共約 100 個參數）
+    assert all(statement.count("?") < 40 for statement in counter.statements)
+
+
+def test_make_snippet():
+    content = "開頭" + "甲" * 100 + "關鍵字" + "乙" * 100
+    snippet = make_snippet(content, "關鍵字", radius=5)
+    assert snippet == "…甲甲甲甲甲關鍵字乙乙乙乙乙…"
+    assert make_snippet("short", "missing") == "short"
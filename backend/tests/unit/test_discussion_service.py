@@ -1,10 +1,12 @@
 
 import pytest
 from sqlmodel import Session
-from app.services.discussion_service import create_topic, create_comment, get_topics_by_club
+from sqlalchemy import event
+from app.services.discussion_service import create_topic, create_comment, get_topics_by_club, reconcile_comment_counts
 from app.schemas.discussion import DiscussionTopicCreate, DiscussionCommentCreate
 from app.models.user import User
 from app.models.book_club import BookClub
+from app.models.discussion import DiscussionComment, DiscussionTopic
 
 def test_create_topic(session: Session, test_user: User):
     # Setup
@@ -62,3 +64,101 @@ def test_get_topics_by_club(session: Session, test_user: User):
     assert len(topics) == 2
     assert topics[0].title == "T1"
     assert topics[1].title == "T2"
+
+def test_create_reply_updates_last_activity(session: Session, test_user: User):
+    club = BookClub(name="Service Test Club 4", description="Desc", owner_id=test_user.id)
+    session.add(club)
+    session.commit()
+    session.refresh(club)
+
+    topic = create_topic(session=session, club_id=club.id, owner_id=test_user.id, topic_in=DiscussionTopicCreate(title="T", content="C"))
+    assert topic.last_comment_id is None
+
+    first = create_comment(session=session, topic_id=topic.id, owner_id=test_user.id, comment_in=DiscussionCommentCreate(content="R1"))
+    second = create_comment(session=session, topic_id=topic.id, owner_id=test_user.id, comment_in=DiscussionCommentCreate(content="R2"))
+
+    session.refresh(topic)
+    assert topic.last_comment_id == second.id
+    assert topic.last_activity_at == second.created_at
+    assert topic.comment_count == 2
+    assert first.id < second.id
+
+def test_create_reply_increments_count_in_database(session: Session, test_user: User, query_counter):
+    club = BookClub(name="Service Test Club 5", description="Desc", owner_id=test_user.id)
+    session.add(club)
+    session.commit()
+    topic = create_topic(session=session, club_id=club.id, owner_id=test_user.id, topic_in=DiscussionTopicCreate(title="T", content="C"))
+
+    session.exec(DiscussionTopic.__table__.update().values(comment_count=5))
+    session.commit()
+
+    with query_counter() as counter:
+        create_comment(session=session, topic_id=topic.id, owner_id=test_user.id, comment_in=DiscussionCommentCreate(content="R"))
+    # 計數在資料庫端累加，而不是寫回 Python 端讀到的值
+    updates = [s for s in counter.statements if s.startswith("UPDATE discussiontopic")]
+    assert len(updates) == 1 and "comment_count=(discussiontopic.comment_count + ?)" in updates[0]
+
+    session.refresh(topic)
+    assert topic.comment_count == 6
+
+def test_reconcile_comment_counts(session: Session, test_user: User):
+    club = BookClub(name="Service Test Club 6", description="Desc", owner_id=test_user.id)
+    session.add(club)
+    session.commit()
+    drifted_topic = DiscussionTopic(title="Drifted", content="C", club_id=club.id, owner_id=test_user.id, comment_count=7)
+    correct_topic = DiscussionTopic(title="Correct", content="C", club_id=club.id, owner_id=test_user.id, comment_count=1)
+    session.add(drifted_topic)
+    session.add(correct_topic)
+    session.commit()
+    session.add(DiscussionComment(content="a", topic_id=drifted_topic.id, owner_id=test_user.id))
+    session.add(DiscussionComment(content="b", topic_id=drifted_topic.id, owner_id=test_user.id))
+    session.add(DiscussionComment(content="c", topic_id=correct_topic.id, owner_id=test_user.id))
+    session.commit()
+
+    assert reconcile_comment_counts(session, batch_size=1) == [drifted_topic.id]
+
+    session.refresh(drifted_topic)
+    session.refresh(correct_topic)
+    assert (drifted_topic.comment_count, correct_topic.comment_count) == (2, 1)
+    assert reconcile_comment_counts(session) == []
+
+
+def test_reconcile_comment_counts_with_reply_committed_between_statements(session: Session, test_user: User):
+    """測試校正讀取主題後、計數前有回覆 commit（回覆與累加），不會重複計算"""
+    club = BookClub(name="Service Test Club 7", description="Desc", owner_id=test_user.id)
+    session.add(club)
+    session.commit()
+    topic = DiscussionTopic(title="Busy", content="C", club_id=club.id, owner_id=test_user.id, comment_count=7)
+    session.add(topic)
+    session.commit()
+    session.add(DiscussionComment(content="a", topic_id=topic.id, owner_id=test_user.id))
+    session.add(DiscussionComment(content="b", topic_id=topic.id, owner_id=test_user.id))
+    session.commit()
+    topic_id, owner_id = topic.id, test_user.id
+
+    engine = session.get_bind()
+    replied = []
+
+    def reply_after_topic_read(conn, cursor, statement, parameters, context, executemany):
+        if replied or not statement.startswith("SELECT") or "FROM discussiontopic" not in statement:
+            return
+        replied.append(True)
+        # 模擬並行的 create_comment：新增回覆並累加 comment_count
+        raw = conn.connection.cursor()
+        raw.execute(
+            "INSERT INTO discussioncomment (content, topic_id, owner_id, created_at) "
+            "VALUES ('c', ?, ?, CURRENT_TIMESTAMP)",
+            (topic_id, owner_id)
+        )
+        raw.execute("UPDATE discussiontopic SET comment_count = comment_count + 1 WHERE id = ?", (topic_id,))
+        raw.close()
+
+    event.listen(engine, "after_cursor_execute", reply_after_topic_read)
+    try:
+        assert reconcile_comment_counts(session) == [topic_id]
+    finally:
+        event.remove(engine, "after_cursor_execute", reply_after_topic_read)
+
+    assert replied
+    session.expire_all()
+    assert session.get(DiscussionTopic, topic_id).comment_count == 3
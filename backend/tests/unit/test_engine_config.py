@@ -0,0 +1,28 @@
+# tests/unit/test_engine_config.py
+from app.db.engine_config import EngineSettings, create_db_engine, engine_kwargs
+
+
+def test_defaults_disable_echo_and_enable_pre_ping(monkeypatch):
+    for name in ("DB_ECHO", "DB_POOL_SIZE", "DB_MAX_OVERFLOW", "DB_MAX_CONNECTIONS", "DB_POOL_PRE_PING"):
+        monkeypatch.delenv(name, raising=False)
+    settings = EngineSettings.from_env()
+    assert settings.echo is False
+    assert settings.pool_pre_ping is True
+
+    kwargs = engine_kwargs("postgresql://user:secret@db/bookclub", settings)
+    assert kwargs["pool_size"] == settings.pool_size
+    assert kwargs["connect_args"] == {"options": "-c statement_timeout=30000"}
+
+
+def test_connection_budget_is_split_across_workers(monkeypatch):
+    monkeypatch.setenv("DB_MAX_CONNECTIONS", "40")
+    monkeypatch.setenv("WEB_CONCURRENCY", "4")
+    settings = EngineSettings.from_env()
+    assert (settings.pool_size, settings.max_overflow) == (5, 5)
+
+
+def test_sqlite_ignores_pool_settings():
+    settings = EngineSettings(echo=True, statement_timeout_ms=1000)
+    assert engine_kwargs("sqlite://", settings) == {"echo": True}
+    engine = create_db_engine("sqlite://", settings)
+    assert engine.echo is True
@@ -0,0 +1,71 @@
+# tests/unit/test_logging_middleware.py
+from logging.handlers import QueueHandler
+
+import pytest
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.testclient import TestClient
+
+from app.core import logging_middleware
+from app.core.logging_config import api_logger
+from app.core.logging_middleware import LoggingMiddleware
+
+
+def _client(monkeypatch, **options):
+    records = []
+    monkeypatch.setattr(logging_middleware, "log_api_access", records.append)
+    app = FastAPI()
+
+    @app.get("/ok")
+    def ok(request: Request):
+        return {"request_id": request.state.request_id}
+
+    @app.get("/fail")
+    def fail():
+        raise HTTPException(status_code=503, detail="down")
+
+    app.add_middleware(LoggingMiddleware, **options)
+    return TestClient(app), records
+
+
+def test_one_json_record_per_request_with_request_id(monkeypatch):
+    client, records = _client(monkeypatch, sample_rate=1)
+
+    response = client.get("/ok")
+    generated = response.headers["x-request-id"]
+    assert response.json() == {"request_id": generated}
+
+    response = client.get("/ok", headers={"X-Request-ID": "abc123"})
+    assert response.headers["x-request-id"] == "abc123"
+
+    assert [(r["request_id"], r["method"], r["path"], r["status"]) for r in records] == [
+        (generated, "GET", "/ok", 200),
+        ("abc123", "GET", "/ok", 200),
+    ]
+    assert all(r["duration_ms"] >= 0 for r in records)
+
+
+def test_sampling_keeps_errors_and_rejected_origins(monkeypatch):
+    client, records = _client(
+        monkeypatch, sample_rate=0, origin_validator=lambda origin: origin == "https://good.example"
+    )
+
+    client.get("/ok")
+    client.get("/ok", headers={"Origin": "https://good.example"})
+    client.get("/fail")
+    client.get("/ok", headers={"Origin": "https://evil.example"})
+
+    assert [(r["path"], r["status"], r.get("origin_rejected")) for r in records] == [
+        ("/fail", 503, None),
+        ("/ok", 200, "https://evil.example"),
+    ]
+
+
+def test_slow_requests_are_always_logged(monkeypatch):
+    client, records = _client(monkeypatch, sample_rate=0, slow_request_ms=0)
+    client.get("/ok")
+    assert len(records) == 1
+
+
+def test_loggers_write_through_queue():
+    assert len(api_logger.handlers) == 1
+    assert isinstance(api_logger.handlers[0], QueueHandler)
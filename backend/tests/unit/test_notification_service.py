@@ -1,11 +1,14 @@
 import pytest
-from sqlmodel import Session
+from datetime import datetime
+from sqlalchemy import event as sa_event
+from sqlmodel import Session, select
 from app.services import notification_service
 from app.models.notification import Notification, NotificationType
 from app.models.book_club import BookClub
 from app.models.book_club_member import BookClubMember, MemberRole
 from app.models.club_join_request import ClubJoinRequest, JoinRequestStatus
 from app.models.user import User
+from app.models.event import Event, EventStatus
 
 
 def test_notify_new_join_request_creates_notifications_for_admins(session: Session):
@@ -61,3 +64,172 @@ def test_notify_new_join_request_creates_notifications_for_admins(session: Sessi
         assert notif.content['club_name'] == "Test Club"
         assert notif.content['request_id'] == request.id
         assert notif.is_read == False
+
+
+def test_notify_event_created_fans_out_in_single_insert(session: Session, query_counter):
+    """測試活動通知以單一 INSERT ... SELECT 發送給發起人以外的所有成員"""
+    users = [User(email=f"user{i}@test.com", password_hash="hash", display_name=f"User {i}") for i in range(6)]
+    session.add_all(users)
+    session.commit()
+    organizer = users[0]
+    
+    club = BookClub(name="Big Club", visibility="public", owner_id=organizer.id)
+    session.add(club)
+    session.commit()
+    session.add_all([BookClubMember(user_id=user.id, book_club_id=club.id) for user in users])
+    session.commit()
+    
+    event = Event(
+        club_id=club.id,
+        title="Monthly Meetup",
+        description="Description",
+        event_datetime=datetime(2030, 1, 1, 12, 0),
+        meeting_url="https://meet.google.com/abc",
+        organizer_id=organizer.id,
+        status=EventStatus.PUBLISHED
+    )
+    session.add(event)
+    session.commit()
+    session.refresh(event)
+    
+    with query_counter() as counter:
+        created = notification_service.notify_event_created(session, event)
+    
+    assert created == 5
+    assert len([s for s in counter.statements if s.lstrip().upper().startswith("INSERT")]) == 1
+    
+    notifications = session.exec(select(Notification)).all()
+    assert sorted(n.recipient_id for n in notifications) == sorted(user.id for user in users[1:])
+    for user in users:
+        session.refresh(user)
+    assert [user.unread_notification_count for user in users] == [0, 1, 1, 1, 1, 1]
+    assert all(n.type == NotificationType.EVENT_CREATED and not n.is_read for n in notifications)
+    assert notifications[0].content == {
+        "event_id": event.id,
+        "event_title": "Monthly Meetup",
+        "event_datetime": "2030-01-01T12:00:00",
+        "organizer_id": organizer.id,
+        "club_id": club.id
+    }
+
+
+def test_notify_event_created_counts_only_inserted_recipients(session: Session):
+    """測試 fan-out 與未讀數調整之間加入的成員不會多計未讀數"""
+    organizer = User(email="organizer@test.com", password_hash="hash", display_name="Organizer")
+    member = User(email="member@test.com", password_hash="hash", display_name="Member")
+    late = User(email="late@test.com", password_hash="hash", display_name="Late")
+    session.add_all([organizer, member, late])
+    session.commit()
+    club = BookClub(name="Race Club", visibility="public", owner_id=organizer.id)
+    session.add(club)
+    session.commit()
+    session.add_all([
+        BookClubMember(user_id=organizer.id, book_club_id=club.id, role=MemberRole.OWNER),
+        BookClubMember(user_id=member.id, book_club_id=club.id),
+    ])
+    event = Event(
+        club_id=club.id,
+        title="Race",
+        description="Description",
+        event_datetime=datetime(2030, 1, 1, 12, 0),
+        meeting_url="https://meet.google.com/abc",
+        organizer_id=organizer.id,
+        status=EventStatus.PUBLISHED
+    )
+    session.add(event)
+    session.commit()
+    session.refresh(event)
+    late_id, club_id = late.id, club.id
+
+    # 在 fan-out INSERT 之後、未讀數 UPDATE 之前加入新成員
+    def join_after_insert(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("INSERT INTO NOTIFICATION"):
+            # 使用另一個 cursor，保留 INSERT 的 RETURNING 結果
+            conn.connection.cursor().execute(
+                "INSERT INTO bookclubmember (user_id, book_club_id, role) VALUES (?, ?, 'MEMBER')",
+                (late_id, club_id)
+            )
+
+    engine = session.get_bind()
+    sa_event.listen(engine, "after_cursor_execute", join_after_insert)
+    try:
+        assert notification_service.notify_event_created(session, event) == 1
+    finally:
+        sa_event.remove(engine, "after_cursor_execute", join_after_insert)
+
+    for user in (organizer, member, late):
+        session.refresh(user)
+    assert [u.unread_notification_count for u in (organizer, member, late)] == [0, 1, 0]
+
+
+def test_mark_read_decrements_unread_count_once_and_clamps(session: Session):
+    """測試單筆與全部標記已讀只為實際變更的通知扣減，且計數不低於 0"""
+    user = User(email="reader@test.com", hashed_password="hash", display_name="Reader")
+    session.add(user)
+    session.commit()
+    first = Notification(recipient_id=user.id, type=NotificationType.NEW_POST, content={})
+    second = Notification(recipient_id=user.id, type=NotificationType.NEW_POST, content={})
+    session.add_all([first, second])
+    session.commit()
+    assert notification_service.get_unread_count(session, user.id) == 2
+
+    assert notification_service.mark_as_read(session, user.id, first.id) is True
+    # 已由其他請求標記過的通知不會再次扣減
+    assert notification_service.mark_as_read(session, user.id, first.id) is False
+    assert notification_service.mark_all_as_read(session, user.id) == 1
+    assert notification_service.get_unread_count(session, user.id) == 0
+
+    # 計數已偏低時不會變成負數
+    third = Notification(recipient_id=user.id, type=NotificationType.NEW_POST, content={})
+    session.add(third)
+    session.commit()
+    user.unread_notification_count = 0
+    session.add(user)
+    session.commit()
+    assert notification_service.mark_all_as_read(session, user.id) == 1
+    assert notification_service.get_unread_count(session, user.id) == 0
+
+
+def test_unread_count_matches_visible_list_after_leaving_or_demotion(session: Session):
+    """測試退出讀書會或被降級後，未讀數與可見的通知列表一致"""
+    from app.services import book_club_service
+    from app.services.club_management_service import ClubManagementService
+
+    owner = User(email="owner@test.com", password_hash="hash", display_name="Owner")
+    admin = User(email="admin@test.com", password_hash="hash", display_name="Admin")
+    session.add_all([owner, admin])
+    session.commit()
+    club = BookClub(name="Visible Club", visibility="public", owner_id=owner.id)
+    session.add(club)
+    session.commit()
+    session.add_all([
+        BookClubMember(user_id=owner.id, book_club_id=club.id, role=MemberRole.OWNER),
+        BookClubMember(user_id=admin.id, book_club_id=club.id, role=MemberRole.ADMIN),
+    ])
+    session.add_all([
+        Notification(recipient_id=admin.id, club_id=club.id, type=NotificationType.NEW_MEMBER, content={}),
+        Notification(recipient_id=admin.id, club_id=club.id, type=NotificationType.EVENT_CREATED, content={}),
+        Notification(recipient_id=admin.id, type=NotificationType.NEW_POST, content={}),
+    ])
+    session.commit()
+
+    def badge_and_list():
+        visible = notification_service.list_visible_notifications(session, admin.id, is_read=False)
+        return notification_service.get_unread_count(session, admin.id), len(visible)
+
+    assert badge_and_list() == (3, 3)
+
+    ClubManagementService(session).update_member_role(
+        club_id=club.id, target_user_id=admin.id, new_role=MemberRole.MEMBER, acting_user=owner
+    )
+    assert badge_and_list() == (2, 2)
+
+    book_club_service.leave_book_club(session, club.id, admin.id)
+    assert badge_and_list() == (1, 1)
+    # 看不到的通知不會被標記已讀，也不會扣減計數
+    assert notification_service.mark_all_as_read(session, admin.id) == 1
+    assert badge_and_list() == (0, 0)
+
+    # 重新加入後，先前的活動通知再次可見
+    book_club_service.join_book_club(session, club.id, admin.id)
+    assert badge_and_list() == (1, 1)
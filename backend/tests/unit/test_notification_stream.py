@@ -0,0 +1,234 @@
+# backend/tests/unit/test_notification_stream.py
+import asyncio
+import contextlib
+import json
+import os
+from datetime import datetime
+from unittest import mock
+
+import psycopg2
+from sqlmodel import Session
+
+from app.core.pubsub import RESYNC_MESSAGE, InProcessBroker, PostgresBroker, get_broker
+from app.models.user import User
+from app.models.book_club import BookClub
+from app.models.book_club_member import BookClubMember, MemberRole
+from app.models.event import Event, EventStatus
+from app.models.notification import Notification, NotificationType
+from app.services import notification_service
+from app.services.notification_stream import notification_events
+
+
+def _setup(session: Session):
+    organizer = User(email="organizer@test.com", password_hash="hash", display_name="Organizer")
+    member = User(email="member@test.com", password_hash="hash", display_name="Member")
+    session.add_all([organizer, member])
+    session.commit()
+    club = BookClub(name="Stream Club", visibility="public", owner_id=organizer.id)
+    session.add(club)
+    session.commit()
+    session.add_all([
+        BookClubMember(user_id=organizer.id, book_club_id=club.id, role=MemberRole.OWNER),
+        BookClubMember(user_id=member.id, book_club_id=club.id, role=MemberRole.MEMBER),
+    ])
+    old = Notification(recipient_id=member.id, type=NotificationType.NEW_POST, content={"topic_title": "Old"})
+    session.add(old)
+    session.commit()
+    return organizer, member, club, old
+
+
+def _create_published_event(session: Session, club_id: int, organizer_id: int) -> Event:
+    event = Event(
+        club_id=club_id,
+        title="Live Event",
+        description="Description",
+        event_datetime=datetime(2030, 1, 1, 12, 0),
+        meeting_url="https://meet.google.com/abc",
+        organizer_id=organizer_id,
+        status=EventStatus.PUBLISHED
+    )
+    session.add(event)
+    session.commit()
+    session.refresh(event)
+    return event
+
+
+def _data(event: str) -> dict:
+    lines = dict(line.split(": ", 1) for line in event.strip().splitlines())
+    return json.loads(lines["data"])
+
+
+def test_stream_pushes_new_notifications_after_publish(session: Session):
+    """測試連線後發布的通知會被推送，連線前的通知不重送"""
+    organizer, member, club, old = _setup(session)
+    organizer_id, member_id, club_id = organizer.id, member.id, club.id
+
+    async def scenario():
+        events = notification_events(session, member_id, heartbeat_seconds=5)
+        assert (await events.__anext__()).startswith("retry:")
+
+        pending = asyncio.ensure_future(events.__anext__())
+        await asyncio.sleep(0.05)
+        event = _create_published_event(session, club_id, organizer_id)
+        notification_service.notify_event_created(session, event)
+
+        pushed = await asyncio.wait_for(pending, 5)
+        await events.aclose()
+        return pushed
+
+    pushed = asyncio.run(scenario())
+    data = _data(pushed)
+    assert data["type"] == "EVENT_CREATED"
+    assert data["recipient_id"] == member_id
+    assert pushed.startswith(f"id: {data['id']}\n")
+
+
+def test_stream_resumes_from_since_id(session: Session):
+    """測試 since_id 會補發之後的可見通知"""
+    _, member, _, old = _setup(session)
+    member_id, old_id = member.id, old.id
+
+    async def scenario():
+        events = notification_events(session, member_id, since_id=0, heartbeat_seconds=0.01)
+        await events.__anext__()
+        backlog = await events.__anext__()
+        heartbeat = await events.__anext__()
+        await events.aclose()
+        return backlog, heartbeat
+
+    backlog, heartbeat = asyncio.run(scenario())
+    assert _data(backlog)["id"] == old_id
+    assert heartbeat == ": keep-alive\n\n"
+
+
+def test_stream_follows_membership_changes(session: Session):
+    """測試串流期間加入或退出讀書會時會重新訂閱讀書會頻道"""
+    organizer, member, _, _ = _setup(session)
+    new_club = BookClub(name="New Club", visibility="public", owner_id=organizer.id)
+    session.add(new_club)
+    session.commit()
+    organizer_id, member_id, new_club_id = organizer.id, member.id, new_club.id
+    channel = notification_service.club_channel(new_club_id)
+
+    async def scenario():
+        events = notification_events(session, member_id, heartbeat_seconds=5)
+        await events.__anext__()
+        pending = asyncio.ensure_future(events.__anext__())
+        await asyncio.sleep(0.05)
+
+        membership = BookClubMember(user_id=member_id, book_club_id=new_club_id, role=MemberRole.MEMBER)
+        session.add(membership)
+        session.commit()
+        await asyncio.sleep(0.1)
+        subscribed = get_broker().subscriber_count(channel)
+
+        event = _create_published_event(session, new_club_id, organizer_id)
+        notification_service.notify_event_created(session, event)
+        pushed = await asyncio.wait_for(pending, 5)
+
+        pending = asyncio.ensure_future(events.__anext__())
+        session.delete(session.get(BookClubMember, (member_id, new_club_id)))
+        session.commit()
+        await asyncio.sleep(0.1)
+        unsubscribed = get_broker().subscriber_count(channel)
+        pending.cancel()
+        await asyncio.gather(pending, return_exceptions=True)
+        await events.aclose()
+        return subscribed, pushed, unsubscribed
+
+    subscribed, pushed, unsubscribed = asyncio.run(scenario())
+    assert subscribed == 1
+    assert _data(pushed)["type"] == "EVENT_CREATED"
+    assert unsubscribed == 0
+
+
+def test_broker_unsubscribe():
+    """測試取消訂閱後不再保留頻道"""
+    broker = InProcessBroker()
+
+    async def scenario():
+        subscription = broker.subscribe(["a", "b"])
+        broker.publish("a", {"n": 1})
+        message = await subscription.get(timeout=1)
+        subscription.close()
+        return message
+
+    assert asyncio.run(scenario()) == {"n": 1}
+    assert broker.subscriber_count("a") == 0
+    broker.publish("a", {"n": 2})
+
+
+def test_stream_catches_up_after_broker_resync(session: Session):
+    """測試 broker 重新連線（resync_subscribers）後，串流向資料庫補齊期間漏送的通知"""
+    organizer, member, club, old = _setup(session)
+    member_id = member.id
+    broker = InProcessBroker()
+
+    async def scenario():
+        events = notification_events(session, member_id, broker=broker, heartbeat_seconds=5)
+        assert (await events.__anext__()).startswith("retry:")
+        pending = asyncio.ensure_future(events.__anext__())
+        await asyncio.sleep(0.05)
+
+        # 通知已寫入，但發布的訊息在 broker 斷線期間遺失
+        missed = Notification(recipient_id=member_id, type=NotificationType.NEW_POST, content={"topic_title": "Missed"})
+        session.add(missed)
+        session.commit()
+        broker.resync_subscribers()
+
+        pushed = await asyncio.wait_for(pending, 5)
+        await events.aclose()
+        return pushed
+
+    assert _data(asyncio.run(scenario()))["content"]["topic_title"] == "Missed"
+
+
+class _FakeConnection:
+    """模擬 psycopg2 連線：poll 時依 fail 拋出例外，模擬 LISTEN 連線中斷"""
+
+    def __init__(self, fail: bool):
+        self.fail = fail
+        self.notifies = []
+        self.closed = False
+        self._read_fd, self._write_fd = os.pipe()
+        if fail:
+            os.write(self._write_fd, b"x")
+
+    def fileno(self):
+        return self._read_fd
+
+    def cursor(self):
+        return contextlib.nullcontext(mock.Mock())
+
+    def poll(self):
+        raise psycopg2.OperationalError("server closed the connection unexpectedly")
+
+    def close(self):
+        self.closed = True
+
+
+def test_postgres_listener_reconnects_and_resyncs_subscribers():
+    """測試 LISTEN 連線中斷後重新連線，並標記所有訂閱者需向資料庫補齊"""
+    connections = []
+
+    class FlakyBroker(PostgresBroker):
+        RECONNECT_MIN_SECONDS = 0.01
+
+        def _connect(self):
+            # 第一條連線 poll 時中斷，第二條連線維持閒置
+            connection = _FakeConnection(fail=not connections)
+            connections.append(connection)
+            return connection
+
+    broker = FlakyBroker("postgresql://unused")
+
+    async def scenario():
+        subscription = broker.subscribe(["user:1"])
+        messages = [await subscription.get(timeout=5), await subscription.get(timeout=5)]
+        return subscription, messages
+
+    subscription, messages = asyncio.run(scenario())
+    assert messages == [RESYNC_MESSAGE, RESYNC_MESSAGE]
+    assert subscription.dropped
+    assert len(connections) == 2
+    assert connections[0].closed
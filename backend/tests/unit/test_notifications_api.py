@@ -1,8 +1,10 @@
 import pytest
+from fastapi import HTTPException
 from fastapi.testclient import TestClient
 from sqlmodel import Session, select
 from app.models.notification import Notification, NotificationType
 from app.models.user import User
+from app.core.security import create_stream_ticket, get_stream_principal
 
 
 def test_get_notifications_returns_user_notifications(client: TestClient, session: Session, test_user_for_auth: User, auth_headers: dict):
@@ -117,3 +119,106 @@ def test_mark_notification_as_read_wrong_user(client: TestClient, session: Sessi
     # 嘗試標記為已讀（使用 test_user_for_auth 的 token）
     response = client.post(f"/api/v1/notifications/{notif.id}/read", headers=auth_headers)
     assert response.status_code == 404
+
+
+def test_get_notifications_returns_limit_permitted_rows(client: TestClient, session: Session, test_user_for_auth: User, auth_headers: dict):
+    """測試權限過濾在 SQL 中完成，無權限的通知不會佔用 limit"""
+    from app.models.book_club import BookClub
+    from app.models.book_club_member import BookClubMember, MemberRole
+    
+    member_club = BookClub(name="Member Club", visibility="public", owner_id=test_user_for_auth.id)
+    admin_club = BookClub(name="Admin Club", visibility="public", owner_id=test_user_for_auth.id)
+    other_club = BookClub(name="Other Club", visibility="public", owner_id=test_user_for_auth.id)
+    session.add_all([member_club, admin_club, other_club])
+    session.commit()
+    session.add_all([
+        BookClubMember(user_id=test_user_for_auth.id, book_club_id=member_club.id, role=MemberRole.MEMBER),
+        BookClubMember(user_id=test_user_for_auth.id, book_club_id=admin_club.id, role=MemberRole.ADMIN),
+    ])
+    session.commit()
+    
+    def notify(notification_type, club_id):
+        return Notification(recipient_id=test_user_for_auth.id, type=notification_type, content={"club_id": club_id})
+    
+    visible = [
+        notify(NotificationType.EVENT_CREATED, member_club.id),
+        notify(NotificationType.NEW_MEMBER, admin_club.id),
+    ]
+    session.add_all(visible)
+    session.commit()
+    # 較新的通知全部無權限查看：非成員的活動、非管理員的加入請求
+    session.add_all(
+        [notify(NotificationType.EVENT_CREATED, other_club.id) for _ in range(5)]
+        + [notify(NotificationType.NEW_MEMBER, member_club.id) for _ in range(5)]
+    )
+    session.commit()
+    
+    response = client.get("/api/v1/notifications/?limit=2", headers=auth_headers)
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert [n["id"] for n in data] == [visible[1].id, visible[0].id]
+    assert session.get(Notification, visible[0].id).club_id == member_club.id
+
+
+def test_unread_count_and_mark_all_read(client: TestClient, session: Session, test_user_for_auth: User, auth_headers: dict):
+    """測試未讀數由計數欄位提供，並可一次標記全部已讀"""
+    notifications = [
+        Notification(recipient_id=test_user_for_auth.id, type=NotificationType.NEW_POST, content={"topic_title": f"Topic {i}"})
+        for i in range(3)
+    ]
+    notifications.append(Notification(
+        recipient_id=test_user_for_auth.id, type=NotificationType.NEW_POST, content={"topic_title": "Read"}, is_read=True
+    ))
+    session.add_all(notifications)
+    session.commit()
+    
+    response = client.get("/api/v1/notifications/unread-count", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json() == {"unread_count": 3}
+    
+    response = client.post(f"/api/v1/notifications/{notifications[0].id}/read", headers=auth_headers)
+    assert response.status_code == 204
+    assert client.get("/api/v1/notifications/unread-count", headers=auth_headers).json() == {"unread_count": 2}
+    
+    response = client.post("/api/v1/notifications/mark-all-read", headers=auth_headers)
+    assert response.status_code == 204
+    assert client.get("/api/v1/notifications/unread-count", headers=auth_headers).json() == {"unread_count": 0}
+    
+    response = client.get("/api/v1/notifications/?is_read=false", headers=auth_headers)
+    assert response.json() == []
+
+
+def test_stream_requires_short_lived_stream_ticket(client: TestClient, session: Session, test_user_for_auth: User, auth_headers: dict):
+    """測試通知串流以查詢參數帶入串流票證（EventSource 無法帶 header），票證不能當作 access token 使用"""
+    response = client.post("/api/v1/auth/stream-ticket", headers=auth_headers)
+    assert response.status_code == 200
+    ticket = response.json()["ticket"]
+    assert response.json()["expires_in"] <= 300
+
+    # 串流票證不能用於一般 API
+    response = client.get("/api/v1/notifications/", headers={"Authorization": f"Bearer {ticket}"})
+    assert response.status_code == 401
+
+    # access token 不能當作串流票證
+    access_token = auth_headers["Authorization"].split(" ", 1)[1]
+    response = client.get(f"/api/v1/notifications/stream?ticket={access_token}")
+    assert response.status_code == 401
+
+    # 未帶票證
+    assert client.get("/api/v1/notifications/stream", headers=auth_headers).status_code == 422
+
+
+def test_stream_ticket_is_revoked_with_token_version(session: Session, test_user_for_auth: User):
+    """測試登出所有裝置（token 版本遞增）後，尚未過期的串流票證也失效"""
+    ticket = create_stream_ticket(test_user_for_auth)
+    principal = get_stream_principal(session, ticket)
+    assert principal.id == test_user_for_auth.id
+    assert principal.display_name == "Auth User"
+
+    test_user_for_auth.token_version += 1
+    session.add(test_user_for_auth)
+    session.commit()
+    with pytest.raises(HTTPException) as exc_info:
+        get_stream_principal(session, ticket)
+    assert exc_info.value.status_code == 401
@@ -0,0 +1,90 @@
+# tests/unit/test_password_hasher.py
+import asyncio
+import threading
+from unittest import mock
+
+import pytest
+
+from app.core.password_hasher import PasswordHasher, PasswordHasherBusy
+from app.core.security import verify_password
+from app.services import scheduled_jobs
+
+
+def test_process_pool_hash_and_verify():
+    hasher = PasswordHasher(max_workers=1, max_pending=4)
+
+    async def scenario():
+        password_hash = await hasher.hash("password123")
+        return (
+            password_hash,
+            await hasher.verify("password123", password_hash),
+            await hasher.verify("wrong-password", password_hash),
+        )
+
+    try:
+        password_hash, ok, wrong = asyncio.run(scenario())
+    finally:
+        hasher.shutdown()
+
+    assert verify_password("password123", password_hash)
+    assert ok is True
+    assert wrong is False
+    metrics = hasher.metrics()
+    assert metrics["completed"] == 3
+    assert metrics["in_flight"] == 0
+    assert metrics["rejected"] == 0
+
+
+def test_rejects_when_pending_limit_reached():
+    hasher = PasswordHasher(max_workers=0, max_pending=1)
+    release = threading.Event()
+
+    async def scenario():
+        blocked = asyncio.ensure_future(hasher._submit(release.wait, 5))
+        await asyncio.sleep(0.05)
+        assert hasher.metrics()["in_flight"] == 1
+        with pytest.raises(PasswordHasherBusy):
+            await hasher.hash("password123")
+        release.set()
+        await blocked
+        # 佇列釋放後可再接受工作
+        return await hasher.verify("password123", await hasher.hash("password123"))
+
+    assert asyncio.run(scenario()) is True
+    metrics = hasher.metrics()
+    assert metrics["rejected"] == 1
+    assert metrics["completed"] == 3
+    assert metrics["in_flight"] == 0
+
+
+def test_worker_does_not_import_application_modules():
+    """測試 worker process 只載入 app.core.passwords，不載入資料庫、日誌等應用程式模組"""
+    hasher = PasswordHasher(max_workers=1, max_pending=4)
+
+    async def scenario():
+        await hasher.hash("password123")
+        return await hasher._submit(
+            eval, "sorted(name for name in __import__('sys').modules if name.startswith('app.'))"
+        )
+
+    try:
+        modules = asyncio.run(scenario())
+    finally:
+        hasher.shutdown()
+
+    assert modules == ["app.core", "app.core.passwords"]
+
+
+def test_metrics_are_logged_by_scheduled_job():
+    """測試排程工作定期把雜湊統計寫入日誌"""
+    hasher = PasswordHasher(max_workers=0, max_pending=4)
+    asyncio.run(hasher.hash("password123"))
+
+    with mock.patch.object(scheduled_jobs, "password_hasher", hasher), \
+            mock.patch.object(scheduled_jobs.app_logger, "info") as log_info:
+        metrics = scheduled_jobs.log_password_hasher_metrics_job()
+
+    assert metrics["completed"] == 1
+    log_info.assert_called_once()
+    assert "Password hasher metrics" in log_info.call_args[0][0]
+    assert "log_password_hasher_metrics" in scheduled_jobs.create_scheduler().jobs
@@ -0,0 +1,97 @@
+# tests/unit/test_replicas.py
+import math
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from app.core.security import Principal, get_current_principal
+from app.db import session as db_session
+from app.db.replicas import ReplicaRouter
+from app.main import app
+from app.models.book_club import BookClub
+from app.models.book_club_member import BookClubMember, MemberRole
+from app.models.user import User
+
+
+@pytest.fixture(name="replica_engines")
+def replica_engines_fixture(tmp_path):
+    """兩個 SQLite 檔案作為唯讀複本"""
+    engines = []
+    for name in ("replica-a", "replica-b"):
+        engine = create_engine(f"sqlite:///{tmp_path / name}.db", connect_args={"check_same_thread": False})
+        SQLModel.metadata.create_all(engine)
+        engines.append(engine)
+    yield engines
+    for engine in engines:
+        engine.dispose()
+
+
+def test_round_robin_across_replicas(replica_engines):
+    router = ReplicaRouter(replica_engines, lag_probe=lambda engine: 0.0)
+    assert [router.choose() for _ in range(4)] == replica_engines * 2
+
+
+def test_lagging_or_unreachable_replicas_are_skipped(replica_engines):
+    lags = {replica_engines[0]: 30.0, replica_engines[1]: 0.5}
+    router = ReplicaRouter(replica_engines, max_lag_seconds=5, lag_probe=lags.__getitem__)
+    assert {router.choose() for _ in range(4)} == {replica_engines[1]}
+
+    def unreachable(engine):
+        raise ConnectionError("replica down")
+
+    router = ReplicaRouter(replica_engines, lag_probe=unreachable)
+    assert router.choose() is None
+    assert router.lag(0) == math.inf
+
+
+def test_lag_is_cached_between_checks(replica_engines):
+    calls = []
+    router = ReplicaRouter(replica_engines[:1], check_interval_seconds=60, lag_probe=lambda engine: calls.append(engine) or 0.0)
+    for _ in range(3):
+        router.choose()
+    assert len(calls) == 1
+
+
+def test_read_endpoints_use_replica_and_writes_stay_on_primary(
+    client: TestClient, session: Session, replica_engines, monkeypatch
+):
+    monkeypatch.setattr(db_session, "replica_router", ReplicaRouter(replica_engines[:1], lag_probe=lambda engine: 0.0))
+    with Session(replica_engines[0]) as replica:
+        owner = User(email="replica-owner@example.com", display_name="Replica Owner")
+        replica.add(owner)
+        replica.commit()
+        replica.add(BookClub(name="Replica Club", visibility="public", owner_id=owner.id))
+        replica.commit()
+
+    response = client.get("/api/v1/clubs")
+    assert response.status_code == 200
+    assert [club["name"] for club in response.json()["items"]] == ["Replica Club"]
+
+    # 寫入用的 get_session 仍是主資料庫
+    assert session.exec(select(BookClub)).all() == []
+
+
+def test_dashboard_is_computed_on_primary_even_with_replicas(
+    client: TestClient, session: Session, replica_engines, monkeypatch
+):
+    # 儀表板結果會被快取：若從延遲的複本計算，剛失效的快取會被舊資料重新填入
+    monkeypatch.setattr(db_session, "replica_router", ReplicaRouter(replica_engines[:1], lag_probe=lambda engine: 0.0))
+    user = User(email="dashboard-primary@example.com", display_name="Primary Reader")
+    session.add(user)
+    session.commit()
+    club = BookClub(name="Primary Club", visibility="public", owner_id=user.id)
+    session.add(club)
+    session.commit()
+    session.add(BookClubMember(user_id=user.id, book_club_id=club.id, role=MemberRole.OWNER))
+    session.commit()
+    app.dependency_overrides[get_current_principal] = lambda: Principal.from_user(user)
+
+    response = client.get("/api/v1/users/me/dashboard")
+    assert response.status_code == 200
+    assert response.json()["stats"]["clubsCount"] == 1
+
+
+def test_without_replicas_reads_use_primary_session(session: Session):
+    dependency = db_session.get_read_only_session(session)
+    assert next(dependency) is session
@@ -0,0 +1,129 @@
+# backend/tests/unit/test_scheduled_jobs.py
+import asyncio
+from datetime import datetime, timedelta
+
+from sqlmodel import Session, select
+
+from app.core.scheduler import PeriodicJob
+from app.models.user import User
+from app.models.book_club import BookClub
+from app.models.book_club_member import BookClubMember, MemberRole
+from app.models.discussion import DiscussionComment, DiscussionTopic
+from app.models.event import Event, EventStatus
+from app.models.notification import Notification, NotificationArchive, NotificationType
+from app.services.dashboard_service import get_user_dashboard
+from app.services.notification_service import archive_read_notifications
+from app.services.scheduled_jobs import (
+    NOTIFICATION_RETENTION_DAYS,
+    archive_notifications_job,
+    complete_expired_events_job,
+    reconcile_comment_counts_job
+)
+
+
+def _create_club_with_events(session: Session, owner: User, statuses_and_days) -> BookClub:
+    club = BookClub(name="Sweep Club", visibility="public", owner_id=owner.id)
+    session.add(club)
+    session.commit()
+    session.add(BookClubMember(user_id=owner.id, book_club_id=club.id, role=MemberRole.OWNER))
+    for event_status, days in statuses_and_days:
+        session.add(Event(
+            club_id=club.id,
+            title="Event",
+            description="Description",
+            event_datetime=datetime.utcnow() + timedelta(days=days),
+            meeting_url="https://meet.google.com/abc",
+            organizer_id=owner.id,
+            status=event_status
+        ))
+    session.commit()
+    return club
+
+
+def test_complete_expired_events_bulk_updates_and_adjusts_counters(session: Session, test_user: User):
+    """測試批次將過期活動轉為 COMPLETED，並同步讀書會計數"""
+    club = _create_club_with_events(session, test_user, [
+        (EventStatus.PUBLISHED, -2),
+        (EventStatus.PUBLISHED, -1),
+        (EventStatus.PUBLISHED, 3),
+        (EventStatus.DRAFT, -1),
+    ])
+    assert club.published_event_count == 3
+
+    assert complete_expired_events_job(session) == 2
+
+    session.expire_all()
+    statuses = sorted(e.status.value for e in session.query(Event).all())
+    assert statuses == ["completed", "completed", "draft", "published"]
+    session.refresh(club)
+    assert club.published_event_count == 1
+    assert club.completed_event_count == 2
+
+    assert complete_expired_events_job(session) == 0
+
+
+def test_dashboard_is_read_only(session: Session, test_user: User):
+    """測試儀表板不再更新過期活動"""
+    _create_club_with_events(session, test_user, [(EventStatus.PUBLISHED, -1)])
+
+    get_user_dashboard(session, test_user.id)
+
+    session.expire_all()
+    assert session.query(Event).one().status == EventStatus.PUBLISHED
+
+
+def test_periodic_job_skips_overlapping_runs():
+    """測試同一工作執行中時，下一輪會被略過"""
+    calls = []
+    job = PeriodicJob(name="test", interval_seconds=60, func=lambda: calls.append(1))
+
+    async def scenario():
+        assert await job.run_once() is True
+        async with job.lock:
+            assert await job.run_once() is False
+
+    asyncio.run(scenario())
+    assert calls == [1]
+
+
+def test_archive_notifications_job_moves_old_read_notifications(session: Session, test_user: User):
+    """測試只封存超過保留期限的已讀通知，並分批搬移到封存表"""
+    old = datetime.utcnow() - timedelta(days=NOTIFICATION_RETENTION_DAYS + 1)
+    notifications = [
+        Notification(recipient_id=test_user.id, type=NotificationType.NEW_POST, content={"n": i}, is_read=True, created_at=old)
+        for i in range(3)
+    ]
+    notifications += [
+        Notification(recipient_id=test_user.id, type=NotificationType.NEW_POST, content={"n": "unread"}, created_at=old),
+        Notification(recipient_id=test_user.id, type=NotificationType.NEW_POST, content={"n": "recent"}, is_read=True),
+    ]
+    session.add_all(notifications)
+    session.commit()
+    archived_ids = [n.id for n in notifications[:3]]
+    kept_ids = [n.id for n in notifications[3:]]
+
+    assert archive_read_notifications(session, older_than_days=NOTIFICATION_RETENTION_DAYS, batch_size=2) == 3
+
+    assert sorted(n.id for n in session.exec(select(Notification)).all()) == kept_ids
+    archive = session.exec(select(NotificationArchive).order_by(NotificationArchive.id)).all()
+    assert [n.id for n in archive] == archived_ids
+    assert archive[0].content == {"n": 0}
+    assert archive[0].recipient_id == test_user.id
+
+    assert archive_notifications_job(session) == 0
+
+
+def test_reconcile_comment_counts_job_fixes_drift(session: Session, test_user: User):
+    club = BookClub(name="Reconcile Club", visibility="public", owner_id=test_user.id)
+    session.add(club)
+    session.commit()
+    topic = DiscussionTopic(title="Topic", content="...", club_id=club.id, owner_id=test_user.id, comment_count=3)
+    session.add(topic)
+    session.commit()
+    session.add(DiscussionComment(content="only reply", topic_id=topic.id, owner_id=test_user.id))
+    session.commit()
+
+    assert reconcile_comment_counts_job(session) == 1
+    session.refresh(topic)
+    assert topic.comment_count == 1
+    assert reconcile_comment_counts_job(session) == 0
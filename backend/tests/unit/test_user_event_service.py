@@ -157,3 +157,18 @@ def test_get_user_club_events_pagination(session: Session, setup_data):
     assert len(events_p2) == 1
     assert meta_p2.has_next is False
     assert events[0].id != events_p2[0].id
+
+def test_get_user_club_events_cursor_pagination(session: Session, setup_data):
+    """測試游標分頁"""
+    user = setup_data["user"]
+    events, meta = get_user_club_events(session, user_id=user.id, page_size=1, use_cursor=True)
+    assert [e.id for e in events] == [setup_data["event1"].id]
+    assert meta.has_next is True
+    assert meta.total_items is None
+
+    events_p2, meta_p2 = get_user_club_events(
+        session, user_id=user.id, page_size=1, use_cursor=True, cursor=meta.next_cursor
+    )
+    assert [e.id for e in events_p2] == [setup_data["event2"].id]
+    assert meta_p2.has_next is False
+    assert meta_p2.next_cursor is None